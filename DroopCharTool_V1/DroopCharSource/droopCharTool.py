@@ -1,20 +1,28 @@
 #!/usr/bin/env python3
 """ Retrieve and print words from a URL
 Usage:
-	python.exe droopCharTool.py rootDirectory deviceType
+	python.exe droopCharTool.py rootDirectory deviceType nvFileName [--jobs N]
 """
 
 import xml.etree.ElementTree as ET	# For XML Library
 import xlsxwriter					# For Excel Library
 import os							# for operating system file management
-from collections import defaultdict # supports auto-vivification for dictionaries
+from array import array				# compact typed columns for the sweep records
 import sys							# used for getting command-line arguments
+import pickle						# for caching the decoded NV index on disk
+import sqlite3						# for caching the extracted sweep records on disk
+import hashlib						# for detecting changed sweep files
+# the modules shared with Droop_ConvertXLS_to_HEX live at the repository root
+sys.path.append( os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..') )
+import droopNvCodec					# for decoding the NV byte streams
+import droopJobs					# for parsing the sweep files in parallel
 
 #---------- INPUT: Root Directory from which to process the data -----------#
 # with a batch script, these argument are updated via the command line
 rootDir    = 'C:/Users/mihughes/Desktop/Droop_CHAR/Sweep_Data'	# make sure not to have a trailing '\'
 type       = 'MTP' # string which forms part of each worksheet name
 nvFileName = 'testQCN.Xml'
+numJobs    = droopJobs.defaultJobs	# size of the sweep-parsing process pool (--jobs N)
 
 #---------- INPUT: XML Parsing Inputs ----------#
 testName	  = "Test"
@@ -25,6 +33,9 @@ chanTag		  = "Channel"
 rbTag         = "UL_Start_RB"
 maxPwrTag     = "MaxTxPwr"
 
+#---------- INPUT: Sweep Cache Inputs ---------#
+sweepCacheName = 'droopCharCache.sqlite'	# per-file record cache, kept in rootDir
+
 #---------- INPUT: Excel Naming Convention Inputs ---------#
 workbookName = 'DroopCharData'
 workbookType = 'xlsx'
@@ -54,6 +65,15 @@ bandSpec_real_bw20 = []
 bandSpec_imag_bw10 = []
 bandSpec_imag_bw20 = []
 
+#---------- INPUT: NV Index Inputs ---------#
+droopNvNameRoot = 'RFNV_LTE_C0_'
+droopNvNameTail = '_FBRX_DROOP_FIR_FILTER_COEFF_Z_I'
+staticNvID_bw10 = '27476'
+staticNvID_bw20 = '27478'
+nvIndexExt      = '.idx'	# the decoded NV index is cached as <nvFileName>.idx
+nvIndexVersion  = 2			# bump when the layout of the cached NV index changes
+nvIndex         = None		# NvIndex of the current NV file, loaded on first use
+
 #---------- INPUT: Measurement Equalizer Values - BW dependent ---------#
 #staticDroopNVID_BW_Dict = []
 #staticDroopNVID_BW_Dict['10'] = '27476'
@@ -92,11 +112,17 @@ def RemoveDupFromList(inputList):
 # END def RemoveDupFromList(inputList):
 
 def ComputeMeasFreqFromRb(inputRb, bw):
+	return ComputeMeasFreqsFromRbs([inputRb], bw)[0]
+# END def ComputeMeasFreqFromRb(inputRb, bw):
+
+def ComputeMeasFreqsFromRbs(rbList, bw):
+	# the measurement frequency of every RB of a row, in one pass per bandwidth
 	bwRB = maxRB_bw20
 	if (int(bw) == 10):
 		bwRB = maxRB_bw10
-	return ( (float(rb) - bwRB/2)*0.18 + 0.09 )
-# END def ComputeMeasFreqFromRb(inputRb, bw):
+	halfRB = bwRB/2
+	return [ (float(rb) - halfRB)*0.18 + 0.09 for rb in rbList ]
+# END def ComputeMeasFreqsFromRbs(rbList, bw):
 	
 def FillColumnB_VariableArguments(bw, realList, imagList):
 	colBArguments[0] = 0
@@ -112,27 +138,96 @@ def FillColumnB_VariableArguments(bw, realList, imagList):
 # END def FillColumnB_VariableArguments(bw):		
 
 def usage():
-	print("Usage: %s <rootDirectory> <deviceType> <nvFileName.", sys.argv[0])
+	print("Usage: %s <rootDirectory> <deviceType> <nvFileName> [--jobs N]" % sys.argv[0])
 	exit(1)
 # END def usage():
 	
+def Decode_Droop_Byte_Stream( nvString ):
+	# Decode a '*_FBRX_DROOP_FIR_FILTER_COEFF_Z_I' hex byte stream into
+	# { bw : [int32 coefficients] }
+	filterDict = {}
+	version, tableList = droopNvCodec.Decode_Droop_NV( nvString )
+	for curBW, groupDelay, numCoef, coefList in tableList:
+		filterDict.setdefault(curBW, []).extend(coefList)
+	return filterDict
+# END def Decode_Droop_Byte_Stream( nvString ):
+
+class NvIndex:
+	# Parse-once index of a QCN/NV XML file. NV item text is kept by 'id' and
+	# by 'name', so all later lookups are served from memory. A band's droop
+	# filter is decoded when it is first requested, so a malformed NV item only
+	# fails the lookups of its own band. The index is saved next to the NV file
+	# and reused for as long as the NV file's size and mtime match.
+	def __init__( self, nvFile ):
+		self.nvFile = nvFile
+		self.byId   = {}
+		self.byName = {}
+		self.droopFilters = {}	# band -> { bw : [coefficients] }, filled on first use
+		fileStat = os.stat(nvFile)
+		self.fileKey = (nvIndexVersion, fileStat.st_size, fileStat.st_mtime)
+		if not self.Load_Cache():
+			self.Parse_NV_File()
+			self.Save_Cache()
+
+	def Parse_NV_File( self ):
+		# single streaming pass over the NvItems
+		for event, elem in ET.iterparse( self.nvFile ):
+			if (elem.tag != 'NvItem'):
+				continue
+			curText = elem.text or ''
+			self.byId[elem.attrib.get('id', None)]     = curText
+			self.byName[elem.attrib.get('name', None)] = curText
+			elem.clear()
+
+	def Load_Cache( self ):
+		# a missing, stale or unreadable cache just means the NV file is parsed again
+		try:
+			with open(self.nvFile + nvIndexExt, 'rb') as cacheFile:
+				cache = pickle.load(cacheFile)
+			if (cache.get('fileKey') != self.fileKey):
+				return False
+			byId   = cache['byId']
+			byName = cache['byName']
+		except Exception:
+			return False
+		if not (isinstance(byId, dict) and isinstance(byName, dict)):
+			return False
+		self.byId   = byId
+		self.byName = byName
+		return True
+
+	def Save_Cache( self ):
+		cache = { 'fileKey' : self.fileKey,
+				  'byId'    : self.byId,
+				  'byName'  : self.byName }
+		try:
+			with open(self.nvFile + nvIndexExt, 'wb') as cacheFile:
+				pickle.dump(cache, cacheFile, pickle.HIGHEST_PROTOCOL)
+		except OSError:
+			print('Warning: could not save the NV index to', self.nvFile + nvIndexExt)
+
+	def Get_Droop_Filter( self, band, bw ):
+		# a band without a droop NV item, or with an empty one, has no calibrated filters
+		if (band not in self.droopFilters):
+			nvString = self.byName.get(droopNvNameRoot + band + droopNvNameTail, '')
+			if nvString.strip():
+				self.droopFilters[band] = Decode_Droop_Byte_Stream( nvString )
+			else:
+				self.droopFilters[band] = {}
+		return self.droopFilters[band].get(int(bw), [])
+# END class NvIndex
+
+def Get_NV_Index():
+	global nvIndex
+	if (nvIndex is None):
+		nvIndex = NvIndex( rootDir + '/' + nvFileName )
+	return nvIndex
+# END def Get_NV_Index():
+
 def Extract_Droop_Static_NV():
-	## Read in the NV file
-	nvFile = rootDir + '/' + nvFileName
-	nvTree = ET.parse( nvFile )		
-		
-	## Fill the static NVs
-	root = nvTree.getroot()
-	bw10_staticNV = []
-	bw20_staticNV = []
-	for child in root:
-		curNvID =  child.attrib.get('id', None)
-		if ( curNvID == '27476'):	
-			bw10_staticNV = child.text
-		elif ( curNvID == '27478'):
-			bw20_staticNV = child.text			
-		if (bw10_staticNV and bw20_staticNV):
-			break
+	## Fill the static NVs from the NV index
+	bw10_staticNV = Get_NV_Index().byId[staticNvID_bw10]
+	bw20_staticNV = Get_NV_Index().byId[staticNvID_bw20]
 
 	# split the string input based upon ','
 	bw10_static_List = bw10_staticNV.split(',')
@@ -159,70 +254,9 @@ def Extract_Droop_Static_NV():
 # END def Extract_Droop_Static_NV():		
 		
 def Extract_Calibrated_NV( bw, band ):
-	nameTag = 'RFNV_LTE_C0_' + band + '_FBRX_DROOP_FIR_FILTER_COEFF_Z_I'
-	
-	# hex values of interest in the QCN
-	dataType = '007b'
-	bw10 = '000a'
-	bw20 = '0014'
-	
-	## Read in the NV file
-	nvFile = rootDir + '/' + nvFileName
-	nvTree = ET.parse( nvFile )		
-		
-	## Fill the calibrated NVs
-	root = nvTree.getroot()
-	nvString = ''  # this will include all bandwidths, so BW10 and BW20 must be extracted
-	
-	for child in root:
-		curNvName =  child.attrib.get('name', None)
-		if (curNvName == nameTag):
-			nvString = child.text
-			break
-	
-	# remove all spaces
-	nvList  = nvString.split(' ')
-	nvList2 = []
-	#print(nvList)
-	
-	numElem = len(nvList)
-	# convert to hex
-	i = 0
-	while (i < numElem-1):
-		nvList2.append( nvList[i+1] + nvList[i] )
-		i += 2
-		
-	bw10Filter = []
-	bw20Filter = []
-	
-	# combine the 4 byte values
-	nvList3 = []
-	numElem = len(nvList2)
-	i = 0
-	while (i < numElem-1):
-		if ( nvList2[i] == dataType ):
-			i += 1
-			curBW = nvList2[i]
-			if (curBW == bw10 or curBW == bw20):
-				i += 1
-				subStr = nvList2[i]
-				numCoef = int(subStr[:2],16)
-				i += 1
-				max = i + 2*numCoef - 1
-				while (i < max):
-					hexVal = nvList2[i+1] + nvList2[i]
-					hexVal = int(hexVal,16)
-					if (0x80000000 & hexVal):
-						hexVal = ((0xFFFFFFFF ^ hexVal) + 1) * -1
-					i += 2
-					if (curBW == bw10):
-						bw10Filter.append( hexVal )
-					else:
-						bw20Filter.append( hexVal )
-			else:
-				i += 1
-		else:
-			i += 1	
+	## Look up the decoded calibrated NV filters of this band
+	bw10Filter = Get_NV_Index().Get_Droop_Filter( band, 10 )
+	bw20Filter = Get_NV_Index().Get_Droop_Filter( band, 20 )
 	
 	global bandSpec_real_bw10
 	global bandSpec_real_bw20
@@ -254,12 +288,224 @@ def Extract_Calibrated_NV( bw, band ):
 			return 1		
 # END def Extract_Calibrated_NV( bw, band ):		
 
+def Extract_MaxPower_From_Sweep( sweepFile ):
+	# Stream the QDART sweep XML once, yielding (channel, startRB, maxPower)
+	# for every LTE_MaxPower test. Finished elements are detached from their
+	# parent as soon as they are processed, so memory stays flat with file size.
+	elemStack = []
+	for event, elem in ET.iterparse( sweepFile, events=('start', 'end') ):
+		if (event == 'start'):
+			elemStack.append(elem)
+			continue
+		elemStack.pop()
+		if (elem.tag != testName):
+			continue
+		#------ check if the attribute matches what we want
+		if (elem.attrib.get(testAttribTag, None) == testIDTag):
+			# make sure the XML file is formatted as expected
+			if (elem.findtext('Name') != testIDName):
+				print("Error: XML not formatted properly.")
+			#------ Find the desired sections of the DataSetCollection
+			dataSet = elem.find('DataSetCollection/DataSet')
+			curChannel  = None
+			curStartRB  = None
+			curMaxPower = None
+			#------ Get the Inputs: Channel and UL_Start_RB
+			for DI in dataSet.iterfind('Inputs/DI'):
+				curDI = DI.findtext('N')
+				if (curDI == chanTag):
+					curChannel = DI.findtext('V')
+				elif (curDI == rbTag):
+					curStartRB = DI.findtext('V')
+			#------ Get the Output: Max Power
+			for results in dataSet.find('Outputs').iter('Result'):
+				DI = results.find('DI')
+				if (DI.findtext('N') == maxPwrTag):
+					curMaxPower = DI.findtext('V')
+					break	# data is found, so break out of the loop
+			yield curChannel, int(curStartRB), float(curMaxPower)
+		# release the finished test node
+		elem.clear()
+		if elemStack:
+			elemStack[-1].remove(elem)
+# END def Extract_MaxPower_From_Sweep( sweepFile ):
+
+class HashingFile:
+	# Read-only file wrapper which hashes and counts the bytes as they are
+	# read, so a sweep file is parsed and fingerprinted from a single read.
+	def __init__( self, curFile ):
+		self.curFile  = curFile
+		self.fileHash = hashlib.sha1()
+		self.size     = 0
+
+	def read( self, size=-1 ):
+		chunk = self.curFile.read(size)
+		self.fileHash.update(chunk)
+		self.size += len(chunk)
+		return chunk
+
+	def Drain( self ):
+		# hash whatever the reader has not consumed
+		for chunk in iter(lambda: self.read(1 << 20), b''):
+			pass
+		return self.size, self.fileHash.hexdigest()
+# END class HashingFile
+
+def Parse_Sweep_File( sweepJob ):
+	# Pool worker: parse one sweep file given its absolute path, returning the
+	# (band, bw, unit) keys with a compact list of (channel, rb, maxPower) records
+	# and the (size, mtime, hash) of the exact bytes which were parsed
+	curBand, curBW, curDir, sweepFile = sweepJob
+	# the mtime is taken before the read, so a file changed while it is being
+	# parsed looks modified on the next run and is checked against its hash
+	fileMtime = os.stat( sweepFile ).st_mtime
+	with open(sweepFile, 'rb') as curFile:
+		hashedFile = HashingFile(curFile)
+		records = list( Extract_MaxPower_From_Sweep(hashedFile) )
+		fileSize, fileHash = hashedFile.Drain()
+	return curBand, curBW, curDir, records, (fileSize, fileMtime, fileHash)
+# END def Parse_Sweep_File( sweepJob ):
+
+def Hash_Sweep_File( sweepFile ):
+	with open(sweepFile, 'rb') as curFile:
+		return HashingFile(curFile).Drain()[1]
+# END def Hash_Sweep_File( sweepFile ):
+
+class SweepCache:
+	# On-disk cache of the records extracted from every sweep file, so that
+	# a run only parses the files which are new or have changed. A file is
+	# reused when its size and mtime match; otherwise its content hash is
+	# compared, so touched-but-identical files are not parsed again either.
+	def __init__( self, cacheFile, sweepRoot ):
+		self.sweepRoot = sweepRoot
+		self.db = sqlite3.connect( cacheFile )
+		self.db.execute( 'CREATE TABLE IF NOT EXISTS files (path TEXT PRIMARY KEY, size INTEGER, mtime REAL, hash TEXT, band TEXT, bw TEXT, unit TEXT)' )
+		self.db.execute( 'CREATE TABLE IF NOT EXISTS records (path TEXT, channel TEXT, rb INTEGER, maxPower REAL)' )
+		self.db.execute( 'CREATE INDEX IF NOT EXISTS records_path ON records (path)' )
+		self.seenPaths = set()
+
+	def Cache_Key( self, sweepFile ):
+		# paths are stored relative to rootDir, so the whole tree can be moved
+		return os.path.relpath( sweepFile, self.sweepRoot ).replace(os.sep, '/')
+
+	def Lookup( self, sweepJob ):
+		# returns the cached records of the job's file, or None if it must be parsed
+		curBand, curBW, curDir, sweepFile = sweepJob
+		cacheKey = self.Cache_Key( sweepFile )
+		self.seenPaths.add( cacheKey )
+		row = self.db.execute( 'SELECT size, mtime, hash FROM files WHERE path = ?', (cacheKey,) ).fetchone()
+		if row is None:
+			return None
+		fileStat = os.stat( sweepFile )
+		if (row[0] != fileStat.st_size or row[1] != fileStat.st_mtime):
+			if (row[0] != fileStat.st_size or row[2] != Hash_Sweep_File(sweepFile)):
+				return None
+			self.db.execute( 'UPDATE files SET mtime = ? WHERE path = ?', (fileStat.st_mtime, cacheKey) )
+		return self.db.execute( 'SELECT channel, rb, maxPower FROM records WHERE path = ? ORDER BY rowid', (cacheKey,) ).fetchall()
+
+	def Store( self, sweepJob, records, fileInfo ):
+		# fileInfo is the (size, mtime, hash) of the bytes the records were parsed from
+		curBand, curBW, curDir, sweepFile = sweepJob
+		cacheKey = self.Cache_Key( sweepFile )
+		fileSize, fileMtime, fileHash = fileInfo
+		self.db.execute( 'DELETE FROM records WHERE path = ?', (cacheKey,) )
+		self.db.execute( 'INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?, ?)',
+						 (cacheKey, fileSize, fileMtime, fileHash, curBand, curBW, curDir) )
+		self.db.executemany( 'INSERT INTO records VALUES (?, ?, ?, ?)',
+							 [ (cacheKey, curChannel, curStartRB, curMaxPower) for curChannel, curStartRB, curMaxPower in records ] )
+
+	def Close( self ):
+		# forget the files which are no longer in the sweep tree, then save
+		for (cacheKey,) in self.db.execute( 'SELECT path FROM files' ).fetchall():
+			if cacheKey not in self.seenPaths:
+				self.db.execute( 'DELETE FROM files WHERE path = ?', (cacheKey,) )
+				self.db.execute( 'DELETE FROM records WHERE path = ?', (cacheKey,) )
+		self.db.commit()
+		self.db.close()
+# END class SweepCache
+
+class SweepStore:
+	# Columnar store of the extracted sweep records: one typed array per field,
+	# with the band/bw/channel/unit strings interned to integer codes, so the
+	# memory used grows with the number of records rather than with nested dicts.
+	def __init__( self ):
+		self.names   = []		# code -> string
+		self.codes   = {}		# string -> code
+		self.band    = array('I')
+		self.bw      = array('I')
+		self.channel = array('I')
+		self.unit    = array('I')
+		self.rb      = array('H')
+		self.power   = array('d')
+
+	def __len__( self ):
+		return len(self.power)
+
+	def Code( self, name ):
+		code = self.codes.get(name)
+		if code is None:
+			code = self.codes[name] = len(self.names)
+			self.names.append(name)
+		return code
+
+	def Add_Records( self, band, bw, unit, records ):
+		# records: [ (channel, rb, maxPower), ... ] of one sweep file
+		bandCode, bwCode, unitCode = self.Code(band), self.Code(bw), self.Code(unit)
+		for curChannel, curStartRB, curMaxPower in records:
+			self.band.append(bandCode)
+			self.bw.append(bwCode)
+			self.channel.append(self.Code(curChannel))
+			self.unit.append(unitCode)
+			self.rb.append(curStartRB)
+			self.power.append(curMaxPower)
+
+	def Group_Sheets( self, bandOrder ):
+		# Yield (band, bw, rowList) per worksheet, with rowList holding one
+		# (channel, unit, rbList, powerList) per channel/unit, RBs sorted.
+		# Bands follow bandOrder; BWs, channels and units keep the order in
+		# which they were first added, and a repeated RB keeps its last value.
+		bandRank = dict( (self.codes[band], rank) for rank, band in enumerate(bandOrder) if band in self.codes )
+		firstSeen = {}
+		sortKeys = []
+		for idx in range(len(self)):
+			bandCode, bwCode, chanCode, unitCode = self.band[idx], self.bw[idx], self.channel[idx], self.unit[idx]
+			sortKeys.append( ( bandRank[bandCode],
+							   firstSeen.setdefault((bandCode, bwCode), len(firstSeen)),
+							   firstSeen.setdefault((bandCode, bwCode, chanCode), len(firstSeen)),
+							   firstSeen.setdefault((bandCode, bwCode, chanCode, unitCode), len(firstSeen)),
+							   self.rb[idx], idx ) )
+		sortedIdx = sorted( range(len(self)), key=sortKeys.__getitem__ )
+		del sortKeys
+
+		curSheet = None
+		curRow   = None
+		rowList  = []
+		for idx in sortedIdx:
+			sheetKey = (self.band[idx], self.bw[idx])
+			rowKey   = (self.channel[idx], self.unit[idx])
+			if (sheetKey != curSheet):
+				if rowList:
+					yield self.names[curSheet[0]], self.names[curSheet[1]], rowList
+				curSheet, curRow, rowList = sheetKey, None, []
+			if (rowKey != curRow):
+				curRow = rowKey
+				rbList, powerList = array('H'), array('d')
+				rowList.append( (self.names[rowKey[0]], self.names[rowKey[1]], rbList, powerList) )
+			if (rbList and rbList[-1] == self.rb[idx]):
+				powerList[-1] = self.power[idx]
+			else:
+				rbList.append(self.rb[idx])
+				powerList.append(self.power[idx])
+		if rowList:
+			yield self.names[curSheet[0]], self.names[curSheet[1]], rowList
+# END class SweepStore
+
 	
 ################# MAIN EXECUTION ################# 
 if __name__ == '__main__':
-
 	#argList = str(sys.argv)
 	#print('argList',argList)
+	numJobs     = droopJobs.Init_Jobs(sys.argv, usage)
 	rootDir     = sys.argv[1]
 	type        = sys.argv[2]
 	nvFileName  = sys.argv[3]
@@ -269,6 +515,7 @@ if __name__ == '__main__':
 	print('#------ From Directory:', rootDir)
 	print('#------ For Type:      ', type)
 	print('#------ For NV File:   ', nvFileName)
+	print('#------ Parallel Jobs: ', numJobs)
 	print('\n')
 	
 	print('----- Read', len(sys.argv), 'input arguments.' )
@@ -280,9 +527,9 @@ if __name__ == '__main__':
 		sys.exit( "\nException: Too few arguments were entered! Please be sure to have the 'rootDirectory' and 'deviceType' included")
 		
 	#---------- Output: Data Structures ---------#
-	Master_Dict   = lambda: defaultdict(Master_Dict)	# make an anonymous function for auto-vivification
-	outputDict    = Master_Dict()						# auto-vivify the outputDict
+	sweepStore    = SweepStore()	# every extracted (band, bw, channel, unit, rb, MaxTxPwr) record
 	bandList      = []
+	sweepJobList  = []	# (band, bw, unit, path) of every sweep file to be parsed
 
 	#--------- Step 0: Iterate over the sub-directories ---------#
 	subDirList = os.listdir(rootDir)
@@ -296,7 +543,6 @@ if __name__ == '__main__':
 		# skip if the path is a file
 		if ( os.path.isfile(subDir1) ):
 			continue
-		os.chdir(subDir1)
 		
 		#--------- Step 1: Iterate over the available bands and BWs --------#
 		subDirList1 = os.listdir(subDir1)
@@ -308,7 +554,6 @@ if __name__ == '__main__':
 			end   = curSubDir.find('_')
 			curBand = curSubDir[start:end]
 			subDir2 = subDir1 + '/' + curSubDir
-			os.chdir(subDir2)		
 			
 			bandList.append(curBand)
 			
@@ -333,60 +578,40 @@ if __name__ == '__main__':
 				print('-- Processing File:  ', curFile)
 				print('\n')					
 
-				#--------- Step 3: Process the Current File --------#
-				tree = ET.parse(curFile)
-				# set the root of the XML file
-				root = tree.getroot()
-				
-				#iterate over the children
-				# START childNode Loop
-				for child in root:
-					#-------- find the 'Test' nodes
-					# START testNode Loop
-					for test in root.iter(testName):
-						#------ check if the attribute matches what we want
-						if (test.attrib.get(testAttribTag, None) == testIDTag):
-							# begin extracting the desired information
-							name = test.find('Name')
-							# make sure the XML file is formatted as expected
-							if (name.text != testIDName):
-								print("Error: XML not formatted properly.")
-							#------ Find the desired sections of the DataSetCollection
-							DSC     = test.find('DataSetCollection')
-							dataSet = DSC.find('DataSet')
-							#------ Get the Inputs: Channel and UL_Start_RB
-							inputs  = dataSet.find('Inputs')
-							for DI in inputs.findall('DI'):
-								curDI = DI.find('N')
-								if (curDI.text == chanTag):
-									chanNum = DI.find('V')
-									curChannel = chanNum.text	#output dictionary key
-								elif (curDI.text == rbTag):
-									rbNum = DI.find('V')
-									curStartRB = rbNum.text		#output dictionary key
-							#------ Get the Output: Max Power
-							outputs = dataSet.find('Outputs')
-							for results in outputs.iter('Result'):
-								DI    = results.find('DI')
-								curDI = DI.find('N')
-								if (curDI.text == maxPwrTag):
-									mxPwr = DI.find('V')
-									curMaxPower = mxPwr.text
-									break;	# data is found, so break out of the loop
-									
-							#------ Add data to the dictionary						
-							outputDict[curBand][curBW][curChannel][curDir][int(curStartRB)] = float(curMaxPower)
-				
-					# END testNode Loop (CHANNELs and DATA)						
-				# END childNode Loop (CHANNELs and DATA)					
+				sweepJobList.append( (curBand, curBW, curDir, subDir2 + '/' + curFile) )
 			# End curSubDir Loop
 	# END curDir Loop			
+
+	#--------- Step 3: Process the Sweep Files --------#
+	# only the files which are new or changed since the last run are parsed
+	sweepCache   = SweepCache( rootDir + '/' + sweepCacheName, rootDir )
+	jobRecords   = [ sweepCache.Lookup(sweepJob) for sweepJob in sweepJobList ]
+	staleJobList = [ sweepJob for sweepJob, records in zip(sweepJobList, jobRecords) if records is None ]
+	print('----- Cached Files:  ', len(sweepJobList) - len(staleJobList))
+	print('----- Parsing Files: ', len(staleJobList))
+	print('\n')
+
+	# each file is parsed independently, so spread them across the process pool
+	sweepResults = droopJobs.Map_Jobs( Parse_Sweep_File, staleJobList, numJobs )
+	staleRecords = {}
+	for sweepJob, (curBand, curBW, curDir, records, fileInfo) in zip(staleJobList, sweepResults):
+		sweepCache.Store( sweepJob, records, fileInfo )
+		staleRecords[sweepJob] = records
+	sweepCache.Close()
+
+	# merge in job order, which keeps the workbook layout deterministic
+	for sweepJob, records in zip(sweepJobList, jobRecords):
+		curBand, curBW, curDir, sweepFile = sweepJob
+		if records is None:
+			records = staleRecords[sweepJob]
+		#------ Add data to the store
+		sweepStore.Add_Records( curBand, curBW, curDir, records )
 	
 	#----------- Step 4: re-process the result iterators ---------#
 	uniqueBands = RemoveDupFromList(bandList)
 			
 	#----------- Step 5: now, write the data from this current file to Excel ---------#
-	# Output Data Container --> dictionary[Band][BW][Channel][channel_iter][RB][MaxPower]
+	# Output Data Container --> sweepStore, grouped per [Band][BW] sheet and [Channel][channel_iter] row
 	fullWorkbookName = rootDir + '/' + workbookName + '_' + type + '.' + workbookType
 	workbook = xlsxwriter.Workbook( fullWorkbookName )	
 	print('\n')
@@ -396,83 +621,53 @@ if __name__ == '__main__':
 	# the BW10 and BW20 static NVs are filled by this function
 	Extract_Droop_Static_NV()
 	
-	## Iterate over Band
-	for band in uniqueBands:
-		## Iterate over BW
-		for bw in outputDict[band]:
+	## Iterate over Band and BW
+	for band, bw, rowList in sweepStore.Group_Sheets(uniqueBands):
 		
-			## Find the appropriate droop coefficient NV to use for this band/BW combination.
-			#--------- Step 3: Process the Current File --------#
-			# set the root of the XML file
-			#root = nvTree.getroot()
-			#iterate over the children
-			#for child in root:	
-			b_foundCalNV = Extract_Calibrated_NV( bw, band )			
-			# Determine which droop-filter coefficient list to use
-			if (b_foundCalNV):
-				if (int(bw) == 10):
-					coefListReal = bandSpec_real_bw10
-					coefListImag = bandSpec_imag_bw10
-				else:
-					coefListReal = bandSpec_real_bw20
-					coefListImag = bandSpec_imag_bw20
+		## Find the appropriate droop coefficient NV to use for this band/BW combination.
+		b_foundCalNV = Extract_Calibrated_NV( bw, band )			
+		# Determine which droop-filter coefficient list to use
+		if (b_foundCalNV):
+			if (int(bw) == 10):
+				coefListReal = bandSpec_real_bw10
+				coefListImag = bandSpec_imag_bw10
 			else:
-				if (int(bw) == 10):
-					coefListReal = real_bw10
-					coefListImag = imag_bw10
-				else:
-					coefListReal = real_bw20
-					coefListImag = imag_bw20		
-
-			worksheetName = type + '_' + band + '_' + bw
-			worksheet     = workbook.add_worksheet(worksheetName)	
-			worksheet.set_column('A:A',30)		
-			FillColumnB_VariableArguments( int(bw), coefListReal, coefListImag )					
-	
-			rowIdx = 0
-			colIdx = 0
-			# fill column A				
-			for heading in fixedHeadingList:
-				worksheet.write_string(rowIdx,colIdx,heading)
-				rowIdx += 1
-			# fill column B
-			rowIdx = 0
-			colIdx = 1
-			# update the equalizer length - no, needs to be hardcoded to 10
-			#colBArguments[4] = len(coefListReal)
-			for curVal in colBArguments:
-				worksheet.write_number( rowIdx,colIdx,float(curVal) )
-				rowIdx += 1
-			# fill the equalizer coefficients - real
-			rowIdx = 1
-			colIdx = 2
-			for curVal in coefListReal[1:]:
-				worksheet.write_number( rowIdx,colIdx,float(curVal) )
-				worksheet.write_number( rowIdx+1,colIdx,float(coefListImag[colIdx-2]) )
-				colIdx += 1	
-								
-			# Fill in the max power results
-			rowIdx     = 9	# the start of data writing
-			rowIdxFreq = 8
-			alreadyFilledFreq = 0;
-			for chan in outputDict[band][bw]:
-				for chanIter in outputDict[band][bw][chan]:	
-					print('- ',end="")
-					colIdx = 0
-					worksheet.write_string(rowIdx,colIdx, 'Data_' + chan + '_' + chanIter )
-					colIdx = 1
-					#obtain the current rb list for the current band and bw and chan and chanIter
-					curRbList = []
-					for tempRB in outputDict[band][bw][chan][chanIter]:
-						curRbList.append(tempRB)
-					curRbList.sort()
-					for rb in curRbList:						
-						worksheet.write_number( rowIdx,colIdx, float(outputDict[band][bw][chan][chanIter][rb]) )
-						if (alreadyFilledFreq == 0):
-							worksheet.write_number( rowIdxFreq,colIdx, float(ComputeMeasFreqFromRb(rb, bw)) )
-						colIdx += 1
-					rowIdx += 1
-					alreadyFilledFreq = 1;
+				coefListReal = bandSpec_real_bw20
+				coefListImag = bandSpec_imag_bw20
+		else:
+			if (int(bw) == 10):
+				coefListReal = real_bw10
+				coefListImag = imag_bw10
+			else:
+				coefListReal = real_bw20
+				coefListImag = imag_bw20		
+
+		worksheetName = type + '_' + band + '_' + bw
+		worksheet     = workbook.add_worksheet(worksheetName)	
+		worksheet.set_column('A:A',30)		
+		FillColumnB_VariableArguments( int(bw), coefListReal, coefListImag )					
+
+		# fill column A				
+		worksheet.write_column( 0, 0, fixedHeadingList )
+		# fill column B
+		# update the equalizer length - no, needs to be hardcoded to 10
+		#colBArguments[4] = len(coefListReal)
+		worksheet.write_column( 0, 1, [float(curVal) for curVal in colBArguments] )
+		# fill the equalizer coefficients - real, then imag
+		numCoef = len(coefListReal) - 1
+		worksheet.write_row( 1, 2, [float(curVal) for curVal in coefListReal[1:]] )
+		worksheet.write_row( 2, 2, [float(curVal) for curVal in coefListImag[:numCoef]] )
+							
+		# Fill in the max power results, one row per channel and channel iteration
+		rowIdx     = 9	# the start of data writing
+		rowIdxFreq = 8
+		for chan, chanIter, rbList, powerList in rowList:
+			print('- ',end="")
+			worksheet.write_string( rowIdx, 0, 'Data_' + chan + '_' + chanIter )
+			worksheet.write_row( rowIdx, 1, powerList )
+			rowIdx += 1
+		# the measurement frequencies are those of the first row's RBs
+		worksheet.write_row( rowIdxFreq, 1, ComputeMeasFreqsFromRbs(rowList[0][2], bw) )
 
 	# close the workbook, once all bands have been iterated over	
 	workbook.close()
@@ -1,6 +1,6 @@
 # -*- mode: python -*-
 a = Analysis(['C:\\Dropbox\\CUSTOMER_ENGINEERING\\DroopCharTool_V1\\DroopCharSource\\droopCharTool.py'],
-             pathex=['C:\\Dropbox\\CUSTOMER_ENGINEERING\\DroopCharTool_V1\\DroopCharSource'],
+             pathex=['C:\\Dropbox\\CUSTOMER_ENGINEERING\\DroopCharTool_V1\\DroopCharSource', 'C:\\Dropbox\\CUSTOMER_ENGINEERING'],
              hiddenimports=[],
              hookspath=None,
              runtime_hooks=None)
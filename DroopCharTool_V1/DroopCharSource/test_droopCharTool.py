@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+""" Tests for the NV index of droopCharTool.py
+Usage:
+	python -m unittest test_droopCharTool	(from DroopCharSource, with xlsxwriter installed)
+"""
+
+import os							# for the sample NV file path
+import shutil						# for removing the temp directory
+import tempfile						# for the test NV files
+import unittest						# for the test cases
+import xml.etree.ElementTree as ET	# for building the test NV files
+import droopCharTool				# the tool under test
+
+#---------- INPUT: Test NV Files ---------#
+sampleNvFile = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Sweep_Data', 'testQCN.Xml')
+goodBand     = 'B2'
+corruptBand  = 'B66'
+emptyBand    = 'B7'
+
+
+############## Helper FUNCTIONS ################
+def Droop_NV_Name( band ):
+	return droopCharTool.droopNvNameRoot + band + droopCharTool.droopNvNameTail
+# END def Droop_NV_Name( band ):
+
+def Write_NV_File( nvFile, nvItems ):
+	# write an NvSource file with the given (name, text) NV items
+	root = ET.Element('NvSource')
+	for idx, (name, text) in enumerate(nvItems):
+		ET.SubElement(root, 'NvItem', id=str(idx), name=name).text = text
+	ET.ElementTree(root).write(nvFile)
+# END def Write_NV_File( nvFile, nvItems ):
+
+
+############## Test CLASSES ################
+class TestNvIndex(unittest.TestCase):
+	# a malformed droop NV item only fails the lookups of its own band
+
+	def setUp( self ):
+		self.tmpDir = tempfile.mkdtemp()
+		self.nvFile = os.path.join(self.tmpDir, 'testQCN.Xml')
+		for event, elem in ET.iterparse( sampleNvFile ):
+			if (elem.tag == 'NvItem' and elem.attrib.get('name') == Droop_NV_Name(goodBand)):
+				self.goodText = elem.text
+				break
+		Write_NV_File( self.nvFile, [ (Droop_NV_Name(goodBand),    self.goodText),
+									  (Droop_NV_Name(corruptBand), 'zz 00 7b'),
+									  (Droop_NV_Name(emptyBand),   '') ] )
+
+	def tearDown( self ):
+		shutil.rmtree(self.tmpDir)
+
+	def test_corrupt_unused_band( self ):
+		expFilters = droopCharTool.Decode_Droop_Byte_Stream( self.goodText )
+		self.assertTrue(expFilters)
+		# once from the NV file, and once from the saved index
+		for attempt in range(2):
+			nvIndex = droopCharTool.NvIndex( self.nvFile )
+			self.assertEqual(nvIndex.Get_Droop_Filter(goodBand, 10), expFilters.get(10, []))
+			self.assertEqual(nvIndex.Get_Droop_Filter(goodBand, 20), expFilters.get(20, []))
+			self.assertEqual(nvIndex.Get_Droop_Filter(emptyBand, 10), [])
+			self.assertEqual(nvIndex.Get_Droop_Filter('B99', 10), [])
+			self.assertRaises(ValueError, nvIndex.Get_Droop_Filter, corruptBand, 10)
+		self.assertTrue(os.path.exists(self.nvFile + droopCharTool.nvIndexExt))
+# END class TestNvIndex
+
+if __name__ == '__main__':
+	unittest.main()
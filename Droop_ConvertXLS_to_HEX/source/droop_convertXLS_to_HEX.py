@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 """ Retrieve and print words from a URL
 Usage:
-	python.exe droopCharTool.py rootDirectory deviceType
+	python.exe droop_convertXLS_to_HEX.py rootDirectory fileName [fileName2 | directory ...] [--jobs N]
 """
 
 import xlrd  # for reading in Excel files
@@ -11,23 +11,28 @@ import xml.etree.ElementTree as ET	# For XML Library
 import os							# for operating system file management
 from collections import defaultdict # supports auto-vivification for dictionaries
 import sys							# used for getting command-line arguments
+# the modules shared with DroopCharTool_V1 live at the repository root
+sys.path.append( os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..') )
+import droopNvCodec					# for encoding the NV byte streams
+import droopJobs					# for converting several workbooks in parallel
 
 #---------- INPUT: Root Directory from which to process the data -----------#
 # with a batch script, these argument are updated via the command line
 rootDir    = 'C:/Dropbox/CUSTOMER_ENGINEERING/Droop_ConvertXLS_to_HEX'	# make sure not to have a trailing '\'
 fileName = 'FBRxEqualizers.xlsx'
+numJobs  = droopJobs.defaultJobs	# size of the workbook process pool (--jobs N)
 
 #---------- INPUT: Excel Naming Convention Inputs ---------#
 outputFileName = '_DroopNVs'
 outputType     = '.xml'
 # some global variables
 nvSearchTerm  = 'NV'
-dataType      = '7b 00'	 # The FBRX_LTE_bw_Droop_cal_Type ID (123 in Hex Little Endian format)
-version       = '00 00'  # the version number, which is the 1st value in the NV
+version       = 0        # the version number, which is the 1st value in the NV
 groupDelayIdx = 2
 numFiltTapIdx = 3
 dataStartIdx  = numFiltTapIdx + 1
 dataEndIdx    = dataStartIdx + 1 # will be updated later
+workbookTypes = ('.xlsx', '.xls')  # the files picked up when a directory is given
 
 #---------- INPUT: Dictionary of Band to NV ID ---------#
 bandToNvIdDict = {  'B1'    : '"28493"',
@@ -110,95 +115,79 @@ def AddUnderscoreToSplitBand( band ):
 	
 	return outputBand
 
-
-def ConvertUint16_to_Hex( uint16Val ):
-	intVal = int(uint16Val)
-	
-	byte0 = intVal & 0x00FF
-	byte0 = format(byte0,'02x')
-	byte1 = intVal & 0xFF00
-	byte1 = format(byte1,'02x')	
-	
-	#combine the bytes into Little Endian format
-	outputString = byte0[:2] + ' ' + byte1[:2] + ' '
-
-	return outputString
-
-def MakeSureByteIsCorrect( inputByte ):
-	
-	byte = inputByte
-
-	if (len(inputByte) == 1):
-		byte = '0' + inputByte
-	elif (len(inputByte) == 0):
-		byte = '00'	
-		
-	return byte
-
-def CreateHexFormattedDataTable( inputList, groupDelay, numFiltTaps, bw  ):
-	# the output result
-	outputString    = ''
-	filtCoeffString = ''
-
-	numBytes      = 4 * numFiltTaps # each element is an int32
-	numBytesToPad = 128 - numBytes
-		
-	for val in inputList:
-		intVal = int(val)
-		# 2's compliment processing
-		if (intVal < 0):
-			intVal = ((0xFFFFFFFF ^ intVal) + 1) * -1
-		# change the hexadecimal value to Little Endian format			
-		byte0 = (intVal & 0x000000FF)
-		byte0 = format(byte0,'02x')
-		byte0 = MakeSureByteIsCorrect( byte0 )
-		byte1 = (intVal & 0x0000FF00)
-		byte1 = format(byte1,'02x')
-		byte1 = byte1[:-2]
-		byte1 = MakeSureByteIsCorrect( byte1 )
-		byte2 = (intVal & 0x00FF0000)
-		byte2 = format(byte2,'02x')
-		byte2 = byte2[:-4]
-		byte2 = MakeSureByteIsCorrect( byte2 )
-		byte3 = (intVal & 0xFF000000)
-		byte3 = format(byte3,'02x')
-		byte3 = byte3[:-6]
-		byte3 = MakeSureByteIsCorrect( byte3 )
-		# combine the bytes into the Little Endian format
-		littleEnd = byte0[:2] + ' ' + byte1[:2] + ' ' + byte2[:2] + ' ' + byte3[:2] + ' '
-		
-		filtCoeffString += littleEnd
-		
-	# pad zero's onto the end, if necessary, since each data table is 128 bytes longs
-	byteIdx = 0
-	while (byteIdx < numBytesToPad):
-		filtCoeffString += '00 '
-		byteIdx += 1
-	
-	hexGroupDelay = format(int(groupDelay),'02x')
-	hexNumFiltTap = format(int(numFiltTaps), '02x')
-	hexBW         = format(int(bw), '02x')
-	outputString  = dataType + ' ' + hexBW + ' 00 ' + hexGroupDelay + ' ' + hexNumFiltTap + ' ' + filtCoeffString
-	
-	# return the string containing the properly formatted results
-	return outputString
+def usage():
+	print("Usage: %s <rootDirectory> <fileName> [<fileName2> | <directory> ...] [--jobs N]" % sys.argv[0])
+	exit(1)
+
+def Find_Equalizer_Workbooks( inputDir, inputNameList ):
+	# each input is a workbook or a directory of workbooks, relative to inputDir
+	filePathList = []
+	for inputName in inputNameList:
+		inputPath = os.path.join( inputDir, inputName )
+		if os.path.isdir( inputPath ):
+			for curFile in sorted( os.listdir(inputPath) ):
+				# skip the lock files Excel leaves next to open workbooks
+				if (curFile.lower().endswith(workbookTypes) and not curFile.startswith('~$')):
+					filePathList.append( os.path.join(inputPath, curFile) )
+		else:
+			filePathList.append( inputPath )
+	return filePathList
+
+def Extract_Equalizer_Workbook( filePath ):
+	# Pool worker: read the NV rows of every 'B*' sheet of one workbook, returning a
+	# list of (type, tech, band, bw, groupDelay, numFiltTaps, filtList) records.
+	# Sheets are loaded on demand and read as plain values, never as Cell objects.
+	records  = []
+	workbook = xlrd.open_workbook( filePath, on_demand=True )
+	for curWrksht in workbook.sheet_names():
+		# check if the worksheet is one that we want
+		if (curWrksht[0] != 'B'):
+			continue
+		# add an underscore to the band if necessary
+		curBand = AddUnderscoreToSplitBand( curWrksht )
+		print('Processing band: ', curBand, '(' + os.path.basename(filePath) + ')')
+		worksheet = workbook.sheet_by_name(curWrksht)
+		# read the 1st column, and find the location of "NV"
+		entireCol = worksheet.col_values(0)
+		if nvSearchTerm in entireCol:
+			for rowIdx in range( entireCol.index(nvSearchTerm) + 1, len(entireCol) ):
+				tech_BW_Type = entireCol[rowIdx].split()
+				# skip to the next row if this row contains no band information
+				if (tech_BW_Type == []):
+					continue
+				tech_BW = tech_BW_Type[0].split('-')
+				# identify the current technology and BW
+				curTech = tech_BW[0]
+				curBW   = tech_BW[1]
+				# identify the device type
+				curType = tech_BW_Type[1]
+				curType = re.sub('[( )]', '', curType)
+				# Extract the Group Delay, Number of Filter Coefficients and Filter Coefficients
+				entireRow   = worksheet.row_values(rowIdx)
+				groupDelay  = entireRow[groupDelayIdx]
+				numFiltTaps = entireRow[numFiltTapIdx]
+				filtList    = entireRow[dataStartIdx:dataStartIdx + int(numFiltTaps)]
+				records.append( (curType, curTech, curBand, curBW, groupDelay, numFiltTaps, filtList) )
+		workbook.unload_sheet(curWrksht)
+	workbook.release_resources()
+	return records
 
 	
 ################# MAIN EXECUTION ################# 
 if __name__ == '__main__':
-
+	numJobs     = droopJobs.Init_Jobs(sys.argv, usage)
+	if ( len(sys.argv) < 3 ):
+		usage()
 	rootDir     = sys.argv[1]
-	fileName    = sys.argv[2]
-
-	filePath = rootDir + '/' + fileName
+	filePathList = Find_Equalizer_Workbooks( rootDir, sys.argv[2:] )
 		
 	print('\n')
 	print('#-------------- Start FBRxEqualizers conversion --------------#')
-	print('#------ Input File: ', filePath)
+	for filePath in filePathList:
+		print('#------ Input File: ', filePath)
 	print('#------ Output Path:', rootDir)
+	print('#------ Parallel Jobs:', numJobs)
 	print('\n')
-
-	workbook = xlrd.open_workbook( filePath )
 	
 	Master_Dict    = lambda: defaultdict(Master_Dict)	# make an anonymous function for auto-vivification
 	# dictionaries of Type -> Tech -> Band -> BW -> Data
@@ -207,94 +196,40 @@ if __name__ == '__main__':
 	numFiltTapDict = Master_Dict()
 	
 	##### Extract all of the data out of the worksheets, and place them in Containers #####
-	for curWrksht in workbook.sheet_names():
-		# check if the worksheet is one that we want
-		if (curWrksht[0] == 'B'):
-			tempBand = curWrksht
-			# add an underscore to the band if necessary
-			curBand = AddUnderscoreToSplitBand( tempBand )			
-			print('Processing band: ', curBand)
-			worksheet = workbook.sheet_by_name(curWrksht)
-			# read the 1st column
-			entireCol = worksheet.col(0)
-			colSize = len(entireCol)
-			# Find the location of the NV values
-			nvRowIdx = 0;			
-			for cellVal in entireCol:	# cellVal is a cell object
-				# Find the location of "NV"
-				if (cellVal.value == nvSearchTerm):
-					desiredRowIdx = nvRowIdx	# initialize
-					while (1):
-						desiredRowIdx = nvRowIdx + 1
-						# break out if the data size of the XLS column is exceeded
-						if (desiredRowIdx >= colSize):
-							break
-						entireRow     = worksheet.row(desiredRowIdx)							
-						tech_BW_Type  = entireRow[0].value.split()
-						# skip to the next row if this row contains no band information
-						if (tech_BW_Type == []):
-							nvRowIdx += 1
-							continue
-						tech_BW       = tech_BW_Type[0].split('-')
-						# identify the current technology and BW
-						curTech = tech_BW[0]
-						curBW   = tech_BW[1]
-						# identify the device type
-						curType = tech_BW_Type[1]
-						curType = re.sub('[( )]', '', curType)
-						# Extract the Group Delay and Number of Filter Coefficients parameters
-						groupDelayDict[curType][curTech][curBand][curBW] = entireRow[groupDelayIdx].value
-						numFiltTapDict[curType][curTech][curBand][curBW] = entireRow[numFiltTapIdx].value
-						# Extract the Filter Coefficients
-						vecIdx = 0
-						filtList = []
-						while vecIdx < numFiltTapDict[curType][curTech][curBand][curBW]:
-							filtCoef = entireRow[dataStartIdx + vecIdx].value
-							filtList.append( filtCoef )
-							vecIdx += 1
-						vectorDict[curType][curTech][curBand][curBW] = filtList
-						
-						# increment the row index
-						nvRowIdx += 1
-					
-				# increase the NV row index	
-				nvRowIdx += 1
+	# each workbook is independent, so spread them across the process pool;
+	# results come back in input order, which keeps the NV files deterministic
+	workbookResults = droopJobs.Map_Jobs( Extract_Equalizer_Workbook, filePathList, numJobs )
+	for records in workbookResults:
+		for curType, curTech, curBand, curBW, groupDelay, numFiltTaps, filtList in records:
+			groupDelayDict[curType][curTech][curBand][curBW] = groupDelay
+			numFiltTapDict[curType][curTech][curBand][curBW] = numFiltTaps
+			vectorDict[curType][curTech][curBand][curBW]     = filtList
 	
 	##### Convert all of the Filter Coefficient Data to a Hex-String And Write the Complete NV to an XMl File #####
 	# All of the output result dictionaries contain the same keys	
-	outputNvDataStringDict = Master_Dict()
-	
 	for type in groupDelayDict:
 		#print('Type: ', type)
 		curFileName = rootDir + '/' + type + outputFileName + outputType
 		print('---- Writing File:', curFileName)
-		FILE = open(curFileName, 'w')
-		# write the opening XML tag
-		FILE.write('<NvSource>' + '\n')
-		for tech in groupDelayDict[type]:
-			for band in groupDelayDict[type][tech]:
-				numNvElements = len(groupDelayDict[type][tech][band])
-				numElemHex    = ConvertUint16_to_Hex( numNvElements )
-				# Begin creating the Hex Little Endian NV String
-				outputNvDataStringDict[type][tech][band] = version + ' ' + numElemHex
-				
-				for bw in groupDelayDict[type][tech][band]:
-					curNumFilterTaps = numFiltTapDict[type][tech][band][bw]
-					curGroupDelay    = groupDelayDict[type][tech][band][bw]
-					nvDataTableStr   = CreateHexFormattedDataTable( vectorDict[type][tech][band][bw], curGroupDelay, curNumFilterTaps, bw )
-					# Add on the NV Data Tables
-					outputNvDataStringDict[type][tech][band] = outputNvDataStringDict[type][tech][band] + nvDataTableStr
-				
-				#print(outputNvDataStringDict[type][tech][band])
-				# produce the final XML output
-				fullNvString = CreateXMLNvOutput( band, outputNvDataStringDict[type][tech][band] )
-				# write the NV to the XML output file
-				FILE.write(fullNvString + '\n')
-		
-		# close out the opening XML Tag
-		FILE.write('</NvSource>')
-		# Close the file
-		FILE.closed
+		# the file is written in a single streaming pass, and closed on exit of the block
+		with open(curFileName, 'w') as FILE:
+			# write the opening XML tag
+			FILE.write('<NvSource>' + '\n')
+			for tech in groupDelayDict[type]:
+				for band in groupDelayDict[type][tech]:
+					# Collect the NV Data Tables, then encode the whole Hex Little Endian NV String at once
+					tableList = []
+					for bw in groupDelayDict[type][tech][band]:
+						curNumFilterTaps = numFiltTapDict[type][tech][band][bw]
+						curGroupDelay    = groupDelayDict[type][tech][band][bw]
+						tableList.append( (bw, curGroupDelay, curNumFilterTaps, vectorDict[type][tech][band][bw]) )
+					nvDataString = droopNvCodec.Encode_Droop_NV( tableList, version )
+					
+					# produce the final XML output, and write the NV to the XML output file
+					FILE.write( CreateXMLNvOutput(band, nvDataString) + '\n' )
+			
+			# close out the opening XML Tag
+			FILE.write('</NvSource>')
 					
 	
 	
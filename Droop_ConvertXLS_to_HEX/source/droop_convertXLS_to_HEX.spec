@@ -1,6 +1,6 @@
 # -*- mode: python -*-
 a = Analysis(['C:\\Dropbox\\CUSTOMER_ENGINEERING\\Droop_ConvertXLS_to_HEX\\source\\droop_convertXLS_to_HEX.py'],
-             pathex=['C:\\Dropbox\\CUSTOMER_ENGINEERING\\Droop_ConvertXLS_to_HEX\\source'],
+             pathex=['C:\\Dropbox\\CUSTOMER_ENGINEERING\\Droop_ConvertXLS_to_HEX\\source', 'C:\\Dropbox\\CUSTOMER_ENGINEERING'],
              hiddenimports=[],
              hookspath=None,
              runtime_hooks=None)
@@ -0,0 +1,70 @@
+##############################################################################
+#
+# Simple Python program to test the effect of the compression options on the
+# speed of the XlsxWriter module and the size of the output file.
+#
+# python perf_compression.py [num_rows] [optimization_mode]
+#
+# Copyright 2013-2015, John McNamara, jmcnamara@cpan.org
+
+import os
+import sys
+import xlsxwriter
+from timeit import default_timer as clock
+
+# Default to 1000 rows and non-optimised.
+if len(sys.argv) > 1:
+    row_max = int(sys.argv[1]) // 2
+else:
+    row_max = 1000
+
+if len(sys.argv) > 2 and int(sys.argv[2]) == 1:
+    optimise = 1
+else:
+    optimise = 0
+
+col_max = 50
+filename = 'py_compression.xlsx'
+
+# The compression options to compare: ZIP_STORED and the deflate levels.
+compression_options = [{'compression': 'store'}]
+compression_options += [{'compression_level': level} for level in range(10)]
+
+
+def write_workbook(options):
+    """ Write the perf_pyx.py workload with the given workbook options. """
+    workbook_options = {'constant_memory': optimise}
+    workbook_options.update(options)
+
+    workbook = xlsxwriter.Workbook(filename, workbook_options)
+    worksheet = workbook.add_worksheet()
+
+    worksheet.set_column(0, col_max, 18)
+
+    for row in range(0, row_max):
+        for col in range(0, col_max):
+            worksheet.write_string(row * 2, col,
+                                   "Row: %d Col: %d" % (row, col))
+        for col in range(0, col_max + 1):
+            worksheet.write_number(row * 2 + 1, col, row + col)
+
+    # Only time the assembly and compression of the file.
+    start_time = clock()
+    workbook.close()
+
+    return clock() - start_time
+
+
+# Print a simple CSV output for reporting.
+print("Compression, Level, Rows, Columns, Close time, Size")
+
+for options in compression_options:
+    elapsed = write_workbook(options)
+    size = os.path.getsize(filename)
+
+    print("%11s, %5s, %6d, %3d, %10.2f, %d"
+          % (options.get('compression', 'deflate'),
+             options.get('compression_level', '-'),
+             row_max * 2, col_max, elapsed, size))
+
+os.remove(filename)
@@ -0,0 +1,62 @@
+##############################################################################
+#
+# Simple Python program to test the speed of writing the sharedStrings.xml
+# file of the XlsxWriter module with a large number of distinct strings.
+#
+# python perf_sharedstrings.py [num_strings]
+#
+# Copyright 2013-2015, John McNamara, jmcnamara@cpan.org
+
+import os
+import sys
+import tempfile
+from timeit import default_timer as clock
+
+from xlsxwriter.sharedstrings import SharedStrings
+from xlsxwriter.sharedstrings import SharedStringTable
+
+# Default to 1 million strings.
+if len(sys.argv) > 1:
+    string_max = int(sys.argv[1])
+else:
+    string_max = 1000000
+
+# A mixture of plain strings and strings that need escaping.
+templates = [
+    'Row: %d Col: %d',
+    'Band %d & channel %d',
+    ' Leading space %d %d',
+    'Trailing space %d %d ',
+    'Tab\t%d\tand control\x01 %d',
+    'Literal _x0000_ escape %d %d',
+    '<tag> %d %d </tag>',
+    'Plain text string number %d of %d',
+]
+
+string_table = SharedStringTable()
+
+for i in range(string_max):
+    string = templates[i % len(templates)] % (i, string_max)
+    string_table._get_shared_string_index(string)
+
+string_table._sort_string_data()
+
+(fd, filename) = tempfile.mkstemp()
+os.close(fd)
+
+# Only time the assembly of the XML file.
+start_time = clock()
+
+sharedstrings = SharedStrings()
+sharedstrings.string_table = string_table
+sharedstrings._set_xml_writer(filename)
+sharedstrings._assemble_xml_file()
+
+elapsed = clock() - start_time
+
+size = os.path.getsize(filename)
+os.remove(filename)
+
+# Print a simple CSV output for reporting.
+print("Strings, Time, Size")
+print("%7d, %6.2f, %d" % (string_max, elapsed, size))
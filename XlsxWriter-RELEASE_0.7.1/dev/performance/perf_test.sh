@@ -51,6 +51,15 @@ sleep 1; python perf_pyx.py 3200  1 1
 sleep 1; python perf_pyx.py 6400  1 1
 sleep 1; python perf_pyx.py 12800 1 1
 
+echo ""
+echo "Python and XlsxWriter. Compression options."
+sleep 1; python perf_compression.py 3200  0
+sleep 1; python perf_compression.py 12800 0
+
+echo ""
+echo "Python and XlsxWriter. Shared strings."
+sleep 1; python perf_sharedstrings.py 1000000
+
 echo ""
 echo "Perl and Excel::Writer::XSLX"
 echo "Rows, Columns, Time, Memory"
@@ -0,0 +1,359 @@
+###############################################################################
+#
+# CellTable - A compact store for the cell data of a worksheet.
+#
+# Copyright 2013-2015, John McNamara, jmcnamara@cpan.org
+#
+
+# Standard packages.
+from array import array
+from bisect import bisect_left
+
+# Standard packages in Python 2/3 compatibility mode.
+from .compatibility import namedtuple
+from .compatibility import str_types
+
+
+###############################################################################
+#
+# Named tuples used for cell types.
+#
+###############################################################################
+cell_string_tuple = namedtuple('String', 'string, format')
+cell_number_tuple = namedtuple('Number', 'number, format')
+cell_blank_tuple = namedtuple('Blank', 'format')
+cell_boolean_tuple = namedtuple('Boolean', 'boolean, format')
+cell_formula_tuple = namedtuple('Formula', 'formula, format, value')
+cell_arformula_tuple = namedtuple('ArrayFormula',
+                                  'formula, format, value, range')
+
+# The cell types, indexed by the number used for them in pickled rows.
+cell_tuple_types = (cell_string_tuple, cell_number_tuple, cell_blank_tuple,
+                    cell_boolean_tuple, cell_formula_tuple,
+                    cell_arformula_tuple)
+
+# Cell type codes used in the compact row arrays.
+CELL_NUMBER = 0
+CELL_STRING = 1
+CELL_BLANK = 2
+CELL_BOOLEAN = 3
+CELL_OTHER = 4
+
+
+class CellTable(dict):
+    """
+    A dict of CellRow objects keyed by row number. Like a defaultdict a
+    row is created the first time that it is accessed.
+
+    The Format objects used in the table are stored once and referred to
+    from the rows by a small integer id.
+
+    """
+
+    def __init__(self):
+        """
+        Constructor.
+
+        """
+
+        super(CellTable, self).__init__()
+
+        # Format id 0 is used for cells without a format.
+        self.formats = [None]
+        self.format_ids = {}
+
+    def __missing__(self, row):
+        cell_row = CellRow(self)
+        self[row] = cell_row
+        return cell_row
+
+    def __reduce__(self):
+        # Pickle the rows as a few flat arrays instead of an object per
+        # row, for example to pass a worksheet to a worker process.
+        rows = array('I')
+        lengths = array('I')
+        cols = array('H')
+        types = array('B')
+        values = array('d')
+        formats = array('I')
+        others = {}
+
+        for row, cell_row in self.items():
+            rows.append(row)
+            lengths.append(len(cell_row.cols))
+            cols.extend(cell_row.cols)
+            types.extend(cell_row.types)
+            values.extend(cell_row.values)
+            formats.extend(cell_row.formats)
+
+            # The named tuple classes can't be pickled by name so the
+            # cells are stored as plain tuples with a type number.
+            if cell_row.others:
+                others[row] = [(col, cell_tuple_types.index(type(cell)),
+                                tuple(cell))
+                               for col, cell in cell_row.others.items()]
+
+        return (_rebuild_cell_table,
+                (self.formats, rows, lengths, cols, types, values, formats,
+                 others))
+
+    def _get_format_id(self, cell_format):
+        # Get the id of a Format object, adding it to the table if required.
+        # Formats are keyed by identity since distinct Format objects may
+        # compare equal.
+        if cell_format is None:
+            return 0
+
+        format_id = self.format_ids.get(id(cell_format))
+
+        if format_id is None:
+            format_id = len(self.formats)
+            self.formats.append(cell_format)
+            self.format_ids[id(cell_format)] = format_id
+
+        return format_id
+
+    def _get_filled_row(self, row, blanks):
+        # Get a copy of a row with blank cells added in the columns that
+        # don't already have a cell. The blanks are a dict of column numbers
+        # and format ids. The row in the table isn't changed.
+        cell_row = self.get(row)
+
+        if cell_row is None:
+            cell_row = CellRow(self)
+
+        cells = [(col, CELL_BLANK, 0, format_id)
+                 for col, format_id in blanks.items()
+                 if col not in cell_row]
+
+        cells.extend(zip(cell_row.cols, cell_row.types,
+                         cell_row.values, cell_row.formats))
+        cells.sort()
+
+        filled_row = CellRow(self)
+        filled_row.others = cell_row.others
+
+        for col, type_code, value, format_id in cells:
+            filled_row.cols.append(col)
+            filled_row.types.append(type_code)
+            filled_row.values.append(value)
+            filled_row.formats.append(format_id)
+
+        return filled_row
+
+
+def _rebuild_cell_table(cell_formats, rows, lengths, cols, types, values,
+                        formats, others):
+    # Rebuild a pickled CellTable from the arrays of CellTable.__reduce__().
+    table = CellTable()
+    table.formats = cell_formats
+    table.format_ids = dict((id(cell_format), format_id)
+                            for format_id, cell_format
+                            in enumerate(cell_formats)
+                            if cell_format is not None)
+    start = 0
+
+    for row, length in zip(rows, lengths):
+        end = start + length
+        cell_row = CellRow.__new__(CellRow)
+        cell_row.table = table
+        cell_row.cols = cols[start:end]
+        cell_row.types = types[start:end]
+        cell_row.values = values[start:end]
+        cell_row.formats = formats[start:end]
+        cell_row.others = None
+        dict.__setitem__(table, row, cell_row)
+
+        if row in others:
+            cell_row.others = dict((col, cell_tuple_types[type_index](*cell))
+                                   for col, type_index, cell in others[row])
+        start = end
+
+    return table
+
+
+class CellRow(object):
+    """
+    The cells of a worksheet row stored in parallel typed arrays, sorted by
+    column: the column numbers, a type code, a float value and a format id.
+    Numbers, shared string indices, booleans and blanks are held in the
+    arrays. Formulas and other rare cell types are kept in a side dict.
+
+    The row behaves like a dict of cell named tuples keyed by column.
+
+    """
+
+    __slots__ = ('table', 'cols', 'types', 'values', 'formats', 'others')
+
+    def __init__(self, table):
+        """
+        Constructor.
+
+        """
+
+        self.table = table
+        self.cols = array('H')
+        self.types = array('B')
+        self.values = array('d')
+        self.formats = array('I')
+        self.others = None
+
+    def __len__(self):
+        return len(self.cols)
+
+    def __bool__(self):
+        return len(self.cols) > 0
+
+    # For Python 2.
+    __nonzero__ = __bool__
+
+    def __iter__(self):
+        return iter(self.cols)
+
+    def __contains__(self, col):
+        cols = self.cols
+        index = bisect_left(cols, col)
+        return index < len(cols) and cols[index] == col
+
+    def __getitem__(self, col):
+        cols = self.cols
+        index = bisect_left(cols, col)
+
+        if index == len(cols) or cols[index] != col:
+            raise KeyError(col)
+
+        return self._get_cell(index)
+
+    def __setitem__(self, col, cell):
+        cell_type = type(cell)
+        value = 0
+
+        if cell_type is cell_number_tuple:
+            try:
+                value = float(cell.number)
+                type_code = CELL_NUMBER
+            except (TypeError, ValueError, OverflowError):
+                type_code = CELL_OTHER
+
+        elif cell_type is cell_string_tuple:
+            # Shared string indices are stored in the array. In-line strings
+            # used in optimization mode are stored as is.
+            if isinstance(cell.string, str_types):
+                type_code = CELL_OTHER
+            else:
+                value = cell.string
+                type_code = CELL_STRING
+
+        elif cell_type is cell_blank_tuple:
+            type_code = CELL_BLANK
+
+        elif cell_type is cell_boolean_tuple:
+            value = cell.boolean
+            type_code = CELL_BOOLEAN
+
+        else:
+            type_code = CELL_OTHER
+
+        if type_code == CELL_OTHER:
+            format_id = 0
+        else:
+            format_id = self.table._get_format_id(cell.format)
+
+        self._set_value(col, type_code, value, format_id)
+
+        if type_code == CELL_OTHER:
+            if self.others is None:
+                self.others = {}
+            self.others[col] = cell
+
+    def get(self, col, default=None):
+        """
+        Get the cell at a column or the default if the cell doesn't exist.
+
+        Args:
+            col:     The cell column (zero indexed).
+            default: Value to return for an empty cell.
+
+        Returns:
+            A cell named tuple or the default value.
+
+        """
+        cols = self.cols
+        index = bisect_left(cols, col)
+
+        if index == len(cols) or cols[index] != col:
+            return default
+
+        return self._get_cell(index)
+
+    def keys(self):
+        """
+        Get the column numbers of the cells in the row, in column order.
+
+        Returns:
+            A list of column numbers.
+
+        """
+        return self.cols.tolist()
+
+    def items(self):
+        """
+        Get the cells in the row, in column order.
+
+        Returns:
+            A generator of (column, cell named tuple) pairs.
+
+        """
+        get_cell = self._get_cell
+
+        for index, col in enumerate(self.cols):
+            yield col, get_cell(index)
+
+    ###########################################################################
+    #
+    # Private API.
+    #
+    ###########################################################################
+
+    def _set_value(self, col, type_code, value, format_id):
+        # Store the compact form of a cell. Cells are usually written in
+        # column order so appending is the common case.
+        cols = self.cols
+
+        if not cols or col > cols[-1]:
+            cols.append(col)
+            self.types.append(type_code)
+            self.values.append(value)
+            self.formats.append(format_id)
+            return
+
+        index = bisect_left(cols, col)
+
+        if cols[index] == col:
+            # Overwrite an existing cell.
+            if self.types[index] == CELL_OTHER:
+                del self.others[col]
+            self.types[index] = type_code
+            self.values[index] = value
+            self.formats[index] = format_id
+        else:
+            cols.insert(index, col)
+            self.types.insert(index, type_code)
+            self.values.insert(index, value)
+            self.formats.insert(index, format_id)
+
+    def _get_cell(self, index):
+        # Rebuild the cell named tuple stored at an array index.
+        type_code = self.types[index]
+        cell_format = self.table.formats[self.formats[index]]
+
+        if type_code == CELL_NUMBER:
+            return cell_number_tuple(self.values[index], cell_format)
+        elif type_code == CELL_STRING:
+            return cell_string_tuple(int(self.values[index]), cell_format)
+        elif type_code == CELL_BLANK:
+            return cell_blank_tuple(cell_format)
+        elif type_code == CELL_BOOLEAN:
+            return cell_boolean_tuple(int(self.values[index]), cell_format)
+        else:
+            return self.others[self.cols[index]]
@@ -16,6 +16,21 @@ class Format(xmlwriter.XMLwriter):
 
     """
 
+    # The properties that define how a Format is displayed. Changing one of
+    # these clears the cached property keys and, if the properties are shared
+    # with other Formats, gives the Format its own copy of them first.
+    format_properties = frozenset([
+        'num_format', 'bold', 'underline', 'italic', 'font_name', 'font_size',
+        'font_color', 'font_strikeout', 'font_outline', 'font_shadow',
+        'font_script', 'font_family', 'font_charset', 'font_scheme',
+        'font_condense', 'font_extend', 'theme', 'hyperlink', 'hidden',
+        'locked', 'text_h_align', 'text_wrap', 'text_v_align',
+        'text_justlast', 'rotation', 'center_across', 'fg_color', 'bg_color',
+        'pattern', 'bottom', 'bottom_color', 'diag_border', 'diag_color',
+        'diag_type', 'left', 'left_color', 'right', 'right_color', 'top',
+        'top_color', 'indent', 'shrink', 'merge_range', 'reading_order',
+        'just_distrib', 'color_indexed', 'font_only'])
+
     ###########################################################################
     #
     # Public API.
@@ -30,6 +45,13 @@ class Format(xmlwriter.XMLwriter):
 
         super(Format, self).__init__()
 
+        # The number of Formats, including this one, that share the
+        # properties. See _get_shared_format().
+        self.share_count = 1
+
+        # Cache of the property keys. Cleared when a property changes.
+        self.property_keys = {}
+
         self.xf_format_indices = xf_indices
         self.dxf_format_indices = dxf_indices
         self.xf_index = None
@@ -106,6 +128,20 @@ class Format(xmlwriter.XMLwriter):
         for key, value in properties.items():
             getattr(self, 'set_' + key)(value)
 
+    def __setattr__(self, name, value):
+        # Copy shared properties on write and clear the cached keys when one
+        # of the format properties changes. The indices of a copy are reset
+        # since they belong to the original properties.
+        if name in self.format_properties:
+            if self.share_count > 1:
+                self._unshare_properties()
+                self.xf_index = None
+                self.dxf_index = None
+            elif self.property_keys:
+                self.property_keys = {}
+
+        super(Format, self).__setattr__(name, value)
+
     ###########################################################################
     #
     # Format properties.
@@ -844,74 +880,116 @@ class Format(xmlwriter.XMLwriter):
 
         return attribs
 
+    def _get_shared_format(self):
+        # Return a new Format that shares the properties, including the
+        # cached keys and indices, of this Format until one of them changes
+        # a format property. Used by Workbook.add_format().
+        xf_format = Format.__new__(Format)
+        xf_format.__dict__ = self.__dict__
+        self.share_count += 1
+
+        return xf_format
+
+    def _unshare_properties(self):
+        # Give the Format its own copy of properties that are shared with
+        # other Formats.
+        if self.share_count > 1:
+            self.share_count -= 1
+            self.__dict__ = dict(self.__dict__, share_count=1,
+                                 property_keys={})
+
     def _get_format_key(self):
         # Returns a unique hash key for a font. Used by Workbook.
-        key = ':'.join(self._to_string(x) for x in (
-            self._get_font_key(),
-            self._get_border_key(),
-            self._get_fill_key(),
-            self._get_alignment_key(),
-            self.num_format,
-            self.locked,
-            self.hidden))
+        key = self.property_keys.get('format')
+
+        if key is None:
+            key = ':'.join(self._to_string(x) for x in (
+                self._get_font_key(),
+                self._get_border_key(),
+                self._get_fill_key(),
+                self._get_alignment_key(),
+                self.num_format,
+                self.locked,
+                self.hidden))
+
+            self.property_keys['format'] = key
 
         return key
 
     def _get_font_key(self):
         # Returns a unique hash key for a font. Used by Workbook.
-        key = ':'.join(self._to_string(x) for x in (
-            self.bold,
-            self.font_color,
-            self.font_charset,
-            self.font_family,
-            self.font_outline,
-            self.font_script,
-            self.font_shadow,
-            self.font_strikeout,
-            self.font_name,
-            self.italic,
-            self.font_size,
-            self.underline))
+        key = self.property_keys.get('font')
+
+        if key is None:
+            key = ':'.join(self._to_string(x) for x in (
+                self.bold,
+                self.font_color,
+                self.font_charset,
+                self.font_family,
+                self.font_outline,
+                self.font_script,
+                self.font_shadow,
+                self.font_strikeout,
+                self.font_name,
+                self.italic,
+                self.font_size,
+                self.underline))
+
+            self.property_keys['font'] = key
 
         return key
 
     def _get_border_key(self):
         # Returns a unique hash key for a border style. Used by Workbook.
-        key = ':'.join(self._to_string(x) for x in (
-            self.bottom,
-            self.bottom_color,
-            self.diag_border,
-            self.diag_color,
-            self.diag_type,
-            self.left,
-            self.left_color,
-            self.right,
-            self.right_color,
-            self.top,
-            self.top_color))
+        key = self.property_keys.get('border')
+
+        if key is None:
+            key = ':'.join(self._to_string(x) for x in (
+                self.bottom,
+                self.bottom_color,
+                self.diag_border,
+                self.diag_color,
+                self.diag_type,
+                self.left,
+                self.left_color,
+                self.right,
+                self.right_color,
+                self.top,
+                self.top_color))
+
+            self.property_keys['border'] = key
 
         return key
 
     def _get_fill_key(self):
         # Returns a unique hash key for a fill style. Used by Workbook.
-        key = ':'.join(self._to_string(x) for x in (
-            self.pattern,
-            self.bg_color,
-            self.fg_color))
+        key = self.property_keys.get('fill')
+
+        if key is None:
+            key = ':'.join(self._to_string(x) for x in (
+                self.pattern,
+                self.bg_color,
+                self.fg_color))
+
+            self.property_keys['fill'] = key
 
         return key
 
     def _get_alignment_key(self):
         # Returns a unique hash key for alignment formats.
-
-        key = ':'.join(self._to_string(x) for x in (
-            self.text_h_align,
-            self.text_v_align,
-            self.indent,
-            self.rotation,
-            self.text_wrap,
-            self.shrink,
-            self.reading_order))
+        key = self.property_keys.get('alignment')
+
+        if key is None:
+            key = ':'.join(self._to_string(x) for x in (
+                self.text_h_align,
+                self.text_v_align,
+                self.indent,
+                self.rotation,
+                self.text_wrap,
+                self.shrink,
+                self.reading_order))
+
+            self.property_keys['alignment'] = key
 
         return key
 
@@ -6,10 +6,16 @@
 #
 
 # Standard packages.
+import io
 import os
-import sys
+import copy as copy_module
+import time
 import tempfile
+import threading
+import multiprocessing
 from shutil import copy
+from warnings import warn
+from zipfile import ZipInfo, ZIP_STORED
 
 from .compatibility import StringIO
 from .compatibility import BytesIO
@@ -96,6 +102,11 @@ class Packager(object):
         self.num_comment_files = 0
         self.named_ranges = []
         self.filenames = []
+        self.zip_file = None
+        self.zip_part = None
+        self.allow_zip64 = False
+        self.workers = 0
+        self.store_images = False
 
     ###########################################################################
     #
@@ -111,6 +122,27 @@ class Packager(object):
         # Set the optional 'in_memory' mode.
         self.in_memory = in_memory
 
+    def _set_zip_file(self, zip_file, allow_zip64=False):
+        # Set a ZipFile to stream the package parts into. Each part is
+        # written and compressed directly into the zip container instead
+        # of to a temp file or StringIO. Requires Python 3.6+.
+        self.zip_file = zip_file
+        self.allow_zip64 = allow_zip64
+
+    def _close_zip_part(self):
+        # Close the part being streamed into the zip file, if any, so that
+        # the zip file can be closed after an error.
+        if self.zip_part and not self.zip_part.closed:
+            self.zip_part.close()
+
+    def _set_workers(self, workers):
+        # Set the number of processes used to write the worksheet files.
+        self.workers = workers
+
+    def _set_store_images(self, store_images):
+        # Set the option to store images in the zip file without compression.
+        self.store_images = store_images
+
     def _add_workbook(self, workbook):
         # Add the Excel::Writer::XLSX::Workbook object to the package.
         self.workbook = workbook
@@ -155,7 +187,14 @@ class Packager(object):
 
     def _filename(self, xml_filename):
         # Create a temp filename to write the XML data to and store the Excel
-        # filename to use as the name in the Zip container.
+        # filename to use as the name in the Zip container. In streaming mode
+        # return a text stream for the part in the zip container instead.
+        if self.zip_file and not self._is_large_part(xml_filename):
+            zip_part = self.zip_file.open(self._zip_info(xml_filename), 'w')
+            self.zip_part = io.TextIOWrapper(zip_part, encoding='utf-8',
+                                             newline='')
+            return self.zip_part
+
         if self.in_memory:
             os_filename = StringIO()
         else:
@@ -175,6 +214,10 @@ class Packager(object):
 
     def _write_worksheet_files(self):
         # Write the worksheet files.
+        if self._use_workers():
+            self._write_worksheet_files_parallel()
+            return
+
         index = 1
         for worksheet in self.workbook.worksheets():
             if worksheet.is_chartsheet:
@@ -189,6 +232,100 @@ class Packager(object):
             worksheet._assemble_xml_file()
             index += 1
 
+    def _use_workers(self):
+        # Check if the worksheet files can be written by a pool of worker
+        # processes.
+        if self.workers < 2 or self.worksheet_count < 2:
+            return False
+
+        if not hasattr(multiprocessing, 'get_context'):
+            warn("The 'workers' option requires Python 3.4+. "
+                 "Writing the worksheets serially.")
+            return False
+
+        # The data of constant_memory worksheets is in temp files that are
+        # written sequentially.
+        for worksheet in self.workbook.worksheets():
+            if worksheet.optimization:
+                warn("The 'workers' option isn't supported in "
+                     "'constant_memory' mode. "
+                     "Writing the worksheets serially.")
+                return False
+
+        return True
+
+    def _write_worksheet_files_parallel(self):
+        # Write the worksheet files in a pool of worker processes. Each
+        # worker is passed a copy of a worksheet and returns its XML, which
+        # is added to the package in worksheet order.
+        worksheets = [worksheet for worksheet in self.workbook.worksheets()
+                      if not worksheet.is_chartsheet]
+
+        # The format XF indices are assigned as they are first used so
+        # they are set up front, in worksheet order, to match the order
+        # from serial writing.
+        jobs = []
+        for worksheet in worksheets:
+            worksheet._prepare_xf_indices()
+
+            # The strings are already in the workbook string table so it
+            # isn't needed to write the worksheet.
+            job = copy_module.copy(worksheet)
+            job.str_table = None
+            jobs.append(job)
+
+        context = self._get_worker_context()
+        pool = context.Pool(min(self.workers, len(jobs)))
+
+        try:
+            parts = pool.imap(_assemble_worksheet, jobs)
+
+            for index, part in enumerate(parts):
+                worksheet = worksheets[index]
+                data, state = part
+
+                # Copy back the worksheet data set during assembly that is
+                # used by the rels files.
+                for name, value in state.items():
+                    setattr(worksheet, name, value)
+
+                self._add_part_data('xl/worksheets/sheet'
+                                    + str(index + 1) + '.xml', data)
+            pool.close()
+        finally:
+            pool.terminate()
+            pool.join()
+
+    def _get_worker_context(self):
+        # Get the multiprocessing context used to start the workers. Forking
+        # is only safe if the calling process has no other threads running.
+        # Otherwise the workers are started in new processes which, as on
+        # Windows, import the main module of the program.
+        start_methods = multiprocessing.get_all_start_methods()
+
+        if 'fork' in start_methods and threading.active_count() == 1:
+            return multiprocessing.get_context('fork')
+        elif 'forkserver' in start_methods:
+            return multiprocessing.get_context('forkserver')
+        else:
+            return multiprocessing.get_context('spawn')
+
+    def _add_part_data(self, xml_filename, data):
+        # Add a part from its UTF-8 encoded XML data.
+        if self.zip_file:
+            self.zip_file.writestr(self._zip_info(xml_filename), data)
+
+        elif self.in_memory:
+            self.filenames.append((BytesIO(data), xml_filename, True))
+
+        else:
+            (fd, os_filename) = tempfile.mkstemp(dir=self.tmpdir)
+            os_file = os.fdopen(fd, 'wb')
+            os_file.write(data)
+            os_file.close()
+
+            self.filenames.append((os_filename, xml_filename, True))
+
     def _write_chartsheet_files(self):
         # Write the chartsheet files.
         index = 1
@@ -567,7 +704,17 @@ class Packager(object):
 
             xml_image_name = 'xl/media/image' + str(index) + ext
 
-            if not self.in_memory:
+            if self.zip_file:
+                # In streaming mode the image is added to the zip directly.
+                if not image_data:
+                    image_file = open(filename, mode='rb')
+                    image_data = BytesIO(image_file.read())
+                    image_file.close()
+
+                self.zip_file.writestr(self._zip_info(xml_image_name),
+                                       image_data.getvalue())
+
+            elif not self.in_memory:
                 # In file mode we just write or copy the image file.
                 os_filename = self._filename(xml_image_name)
 
@@ -604,7 +751,18 @@ class Packager(object):
 
         xml_vba_name = 'xl/vbaProject.bin'
 
-        if not self.in_memory:
+        if self.zip_file:
+            # In streaming mode the VBA file is added to the zip directly.
+            if vba_is_stream:
+                vba_data = vba_project.getvalue()
+            else:
+                vba_file = open(vba_project, mode='rb')
+                vba_data = vba_file.read()
+                vba_file.close()
+
+            self.zip_file.writestr(self._zip_info(xml_vba_name), vba_data)
+
+        elif not self.in_memory:
             # In file mode we just write or copy the VBA file.
             os_filename = self._filename(xml_vba_name)
 
@@ -628,3 +786,61 @@ class Packager(object):
                 vba_file.close()
 
             self.filenames.append((os_filename, xml_vba_name, True))
+
+    def _is_large_part(self, xml_filename):
+        # Check if a part can exceed the ZIP64 size limit when ZIP64 is
+        # allowed. The size of a streamed part isn't known when its header
+        # is written so these parts are added from a temp file, or
+        # StringIO, and only use the ZIP64 extensions if they need them.
+        if not self.allow_zip64:
+            return False
+
+        return (xml_filename.startswith('xl/worksheets/sheet')
+                or xml_filename == 'xl/sharedStrings.xml')
+
+    def _get_compress_type(self, xml_filename):
+        # Get the compression method for a part if it differs from that of
+        # the zip file. PNG and JPEG images are already compressed so they
+        # can optionally be stored as is.
+        if self.store_images and xml_filename.startswith('xl/media/'):
+            if xml_filename.endswith(('.png', '.jpeg')):
+                return ZIP_STORED
+
+        return None
+
+    def _zip_info(self, xml_filename):
+        # Create the zip entry for a part written in streaming mode. The
+        # date and permissions match those of the parts added from temp
+        # files.
+        zip_info = ZipInfo(xml_filename, time.localtime(time.time())[:6])
+        zip_info.compress_type = self.zip_file.compression
+        zip_info.external_attr = 0o100600 << 16
+
+        # The compression level of the zip file, for Python 3.7+. The
+        # ZipInfo attribute for it is only public from Python 3.13.
+        level = getattr(self.zip_file, 'compresslevel', None)
+        if level is not None:
+            if hasattr(zip_info, 'compress_level'):
+                zip_info.compress_level = level
+            elif hasattr(zip_info, '_compresslevel'):
+                zip_info._compresslevel = level
+
+        compress_type = self._get_compress_type(xml_filename)
+        if compress_type is not None:
+            zip_info.compress_type = compress_type
+
+        return zip_info
+
+
+def _assemble_worksheet(worksheet):
+    # Assemble the XML of a worksheet in a worker process. Returns the
+    # UTF-8 encoded XML and the worksheet attributes set during assembly.
+    worksheet._set_filehandle(StringIO())
+    worksheet._assemble_xml_file()
+
+    data = worksheet.fh.getvalue().encode('utf-8')
+
+    state = {'rel_count': worksheet.rel_count,
+             'external_hyper_links': worksheet.external_hyper_links}
+
+    return data, state
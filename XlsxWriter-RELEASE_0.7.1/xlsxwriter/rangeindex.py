@@ -0,0 +1,113 @@
+###############################################################################
+#
+# RangeIndex - An index of the cell ranges of worksheet rules.
+#
+# Copyright 2013-2015, John McNamara, jmcnamara@cpan.org
+#
+
+# Number of rows, as a power of 2, in each block of the index.
+ROW_BLOCK_BITS = 6
+
+# Ranges that span more blocks than this are stored in a single list.
+MAX_RANGE_BLOCKS = 16
+
+
+class RangeIndex(object):
+    """
+    An index of cell ranges, such as the ranges of conditional formats and
+    data validations, for finding the ranges that intersect a cell range.
+    Each range has an order number, such as a rule priority.
+
+    The ranges are stored by order number in blocks of rows so only the
+    ranges near a cell range need to be checked. A range that extends the
+    last range with the same order number and columns in a block is joined
+    to it so ranges that are added row by row are stored as a single range.
+
+    """
+
+    def __init__(self):
+        """
+        Constructor.
+
+        """
+
+        self.blocks = {}
+        self.large_ranges = {}
+
+    ###########################################################################
+    #
+    # Private API.
+    #
+    ###########################################################################
+
+    def _add(self, cell_range, order):
+        # Add a (first_row, first_col, last_row, last_col) cell range to the
+        # index with an order number.
+        first_row = cell_range[0]
+        last_row = cell_range[2]
+
+        first_block = first_row >> ROW_BLOCK_BITS
+        last_block = last_row >> ROW_BLOCK_BITS
+
+        if last_block - first_block >= MAX_RANGE_BLOCKS:
+            self._add_to_block(self.large_ranges, cell_range, order)
+            return
+
+        for block in range(first_block, last_block + 1):
+            if block in self.blocks:
+                block_ranges = self.blocks[block]
+            else:
+                block_ranges = {}
+                self.blocks[block] = block_ranges
+
+            self._add_to_block(block_ranges, cell_range, order)
+
+    def _add_to_block(self, block_ranges, cell_range, order):
+        # Add a cell range to the ranges, keyed by order number, of a block.
+        first_row, first_col, last_row, last_col = cell_range
+
+        if order not in block_ranges:
+            block_ranges[order] = [[first_row, first_col, last_row, last_col]]
+            return
+
+        ranges = block_ranges[order]
+        last_range = ranges[-1]
+
+        if (last_range[1] == first_col and last_range[3] == last_col
+                and first_row <= last_range[2] + 1
+                and last_row >= last_range[0] - 1):
+            # Join the range to the last range in the same columns.
+            last_range[0] = min(last_range[0], first_row)
+            last_range[2] = max(last_range[2], last_row)
+        else:
+            ranges.append([first_row, first_col, last_row, last_col])
+
+    def _intersects(self, cell_range, order):
+        # Check if a cell range intersects any range in the index with a
+        # higher order number.
+        first_row, first_col, last_row, last_col = cell_range
+
+        first_block = first_row >> ROW_BLOCK_BITS
+        last_block = last_row >> ROW_BLOCK_BITS
+
+        if last_block - first_block >= MAX_RANGE_BLOCKS:
+            # Check all of the blocks for a large cell range.
+            blocks = list(self.blocks.values())
+        else:
+            blocks = [self.blocks[block]
+                      for block in range(first_block, last_block + 1)
+                      if block in self.blocks]
+
+        blocks.append(self.large_ranges)
+
+        for block_ranges in blocks:
+            for range_order, ranges in block_ranges.items():
+                if range_order <= order:
+                    continue
+
+                for row_min, col_min, row_max, col_max in ranges:
+                    if (first_row <= row_max and last_row >= row_min
+                            and first_col <= col_max and last_col >= col_min):
+                        return True
+
+        return False
@@ -6,7 +6,10 @@
 #
 
 # Standard packages.
-import re
+import os
+import sqlite3
+import tempfile
+from collections import OrderedDict
 
 # Package imports.
 from . import xmlwriter
@@ -77,37 +80,41 @@ class SharedStrings(xmlwriter.XMLwriter):
         self._xml_start_tag('sst', attributes)
 
     def _write_sst_strings(self):
-        # Write the sst string elements.
+        # Write the sst string elements in blocks.
+        get_si_element = self._get_si_element
+        fragments = []
 
         for string in (self.string_table._get_strings()):
-            self._write_si(string)
+            fragments.append(get_si_element(string))
+
+            if len(fragments) == 1000:
+                self.fh.write(''.join(fragments))
+                fragments = []
+
+        if fragments:
+            self.fh.write(''.join(fragments))
 
     def _write_si(self, string):
         # Write the <si> element.
-        attributes = []
+        self.fh.write(self._get_si_element(string))
+
+    def _get_si_element(self, string):
+        # Get the XML of the <si> element for a string.
 
         # Excel escapes control characters with _xHHHH_ and also escapes any
         # literal strings of that type by encoding the leading underscore.
-        # So "\0" -> _x0000_ and "_x0000_" -> _x005F_x0000_.
-        # The following substitutions deal with those cases.
-
-        # Escape the escape.
-        string = re.sub('(_x[0-9a-fA-F]{4}_)', r'_x005F\1', string)
-
-        # Convert control character to the _xHHHH_ escape.
-        string = re.sub(r'([\x00-\x08\x0B-\x1F])',
-                        lambda match: "_x%04X_" %
-                        ord(match.group(1)), string)
-
-        # Add attribute to preserve leading or trailing whitespace.
-        if re.search('^\s', string) or re.search('\s$', string):
-            attributes.append(('xml:space', 'preserve'))
-
-        # Write any rich strings without further tags.
-        if re.search('^<r>', string) and re.search('</r>$', string):
-            self._xml_rich_si_element(string)
+        # So "\0" -> _x0000_ and "_x0000_" -> _x005F_x0000_. The string is
+        # also checked for rich strings, which are written without further
+        # tags, and for leading or trailing whitespace that must be
+        # preserved. See _escape_string().
+        string, is_rich, preserve = self._escape_string(string)
+
+        if is_rich:
+            return '<si>%s</si>' % string
+        elif preserve:
+            return '<si><t xml:space="preserve">%s</t></si>' % string
         else:
-            self._xml_si_element(string, attributes)
+            return '<si><t>%s</t></si>' % string
 
 
 # A metadata class to store Excel strings between worksheets.
@@ -151,3 +158,101 @@ class SharedStringTable(object):
     def _get_strings(self):
         """" Return the sorted string list. """
         return self.string_array
+
+    def _close(self):
+        """" Release any resources used by the table. """
+        pass
+
+
+class DiskSharedStringTable(SharedStringTable):
+    """
+    A SharedStringTable for constant_memory mode. The strings and their
+    indices are stored in an SQLite index in a temp file and only the most
+    recently used strings are kept in memory.
+
+    """
+
+    def __init__(self, tmpdir=None, cache_size=10000):
+        super(DiskSharedStringTable, self).__init__()
+
+        self.tmpdir = tmpdir
+        self.cache_size = cache_size
+        self.cache = OrderedDict()
+        self.filename = None
+        self.db = None
+
+    def _open(self):
+        # Create the temp file for the string index when it is first used.
+        (fd, self.filename) = tempfile.mkstemp(dir=self.tmpdir)
+        os.close(fd)
+
+        self.db = sqlite3.connect(self.filename)
+
+        # The data is temporary so there is no need for a journal or syncs.
+        self.db.execute('PRAGMA journal_mode = OFF')
+        self.db.execute('PRAGMA synchronous = OFF')
+        self.db.execute('CREATE TABLE strings '
+                        '(id INTEGER PRIMARY KEY, string TEXT UNIQUE)')
+
+    def _get_shared_string_index(self, string):
+        """" Get the index of the string in the Shared String table. """
+        cache = self.cache
+        self.count += 1
+
+        index = cache.get(string)
+
+        if index is not None:
+            # Mark the string as recently used.
+            del cache[string]
+            cache[string] = index
+            return index
+
+        if self.db is None:
+            self._open()
+
+        row = self.db.execute('SELECT id FROM strings WHERE string = ?',
+                              (string,)).fetchone()
+
+        if row is None:
+            # String isn't already stored in the table so add it.
+            index = self.unique_count
+            self.db.execute('INSERT INTO strings VALUES (?, ?)',
+                            (index, string))
+            self.unique_count += 1
+        else:
+            index = row[0]
+
+        cache[string] = index
+
+        if len(cache) > self.cache_size:
+            cache.popitem(last=False)
+
+        return index
+
+    def _get_shared_string(self, index):
+        """" Get a shared string from the index. """
+        row = self.db.execute('SELECT string FROM strings WHERE id = ?',
+                              (index,)).fetchone()
+        return row[0]
+
+    def _sort_string_data(self):
+        """" Commit the string data. The strings are already in order. """
+        self.cache = OrderedDict()
+
+        if self.db is not None:
+            self.db.commit()
+
+    def _get_strings(self):
+        """" Return an iterator of the strings in index order. """
+        if self.db is None:
+            return iter(())
+
+        cursor = self.db.execute('SELECT string FROM strings ORDER BY id')
+        return (row[0] for row in cursor)
+
+    def _close(self):
+        """" Remove the temp file used for the string index. """
+        if self.db is not None:
+            self.db.close()
+            self.db = None
+            os.remove(self.filename)
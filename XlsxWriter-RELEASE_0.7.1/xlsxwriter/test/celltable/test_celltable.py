@@ -0,0 +1,115 @@
+###############################################################################
+#
+# Tests for XlsxWriter.
+#
+# Copyright (c), 2013-2015, John McNamara, jmcnamara@cpan.org
+#
+
+import pickle
+import unittest
+from ...celltable import CellTable
+from ...celltable import cell_number_tuple
+from ...celltable import cell_string_tuple
+from ...celltable import cell_blank_tuple
+from ...celltable import cell_boolean_tuple
+from ...celltable import cell_formula_tuple
+from ...format import Format
+
+
+class TestCellTable(unittest.TestCase):
+    """
+    Test the CellTable and CellRow classes.
+
+    """
+
+    def setUp(self):
+        self.table = CellTable()
+
+    def test_cell_types(self):
+        """Test storing and reading back each cell type."""
+
+        bold = Format({'bold': 1})
+        row = self.table[3]
+
+        row[0] = cell_number_tuple(1.5, None)
+        row[1] = cell_string_tuple(7, bold)
+        row[2] = cell_blank_tuple(bold)
+        row[3] = cell_boolean_tuple(1, None)
+        row[4] = cell_formula_tuple('A1+1', bold, 0)
+
+        self.assertEqual(row[0], cell_number_tuple(1.5, None))
+        self.assertEqual(row[1], cell_string_tuple(7, bold))
+        self.assertEqual(row[2], cell_blank_tuple(bold))
+        self.assertEqual(row[3], cell_boolean_tuple(1, None))
+        self.assertEqual(row[4], cell_formula_tuple('A1+1', bold, 0))
+
+        self.assertEqual(type(row[1]).__name__, 'String')
+        self.assertEqual(self.table.formats, [None, bold])
+
+    def test_inline_string(self):
+        """Test storing an in-line string as used in optimization mode."""
+
+        row = self.table[0]
+        row[0] = cell_string_tuple('Foo', None)
+
+        self.assertEqual(row[0].string, 'Foo')
+
+    def test_column_order(self):
+        """Test that cells are kept in column order."""
+
+        row = self.table[0]
+
+        row[5] = cell_number_tuple(5, None)
+        row[1] = cell_number_tuple(1, None)
+        row[3] = cell_formula_tuple('=1', None, 0)
+        row[3] = cell_number_tuple(3, None)
+
+        self.assertEqual(row.keys(), [1, 3, 5])
+        self.assertEqual([cell.number for col, cell in row.items()],
+                         [1, 3, 5])
+        self.assertEqual(row.others, {})
+
+    def test_dict_interface(self):
+        """Test the dict like interface used by the worksheet."""
+
+        self.assertNotIn(2, self.table)
+        self.assertFalse(self.table[2])
+        self.assertIn(2, self.table)
+
+        row = self.table[2]
+        row[10] = cell_number_tuple(1, None)
+
+        self.assertTrue(row)
+        self.assertEqual(len(row), 1)
+        self.assertIn(10, row)
+        self.assertNotIn(9, row)
+        self.assertEqual(row.get(9), None)
+        self.assertRaises(KeyError, row.__getitem__, 11)
+
+        self.table.clear()
+        self.assertFalse(self.table)
+
+    def test_pickle(self):
+        """Test pickling the table, as done for the 'workers' option."""
+
+        bold = Format({'bold': 1})
+
+        self.table[0][2] = cell_string_tuple(7, bold)
+        self.table[0][0] = cell_formula_tuple('A1+1', bold, 0)
+        self.table[1]
+        self.table[5][1] = cell_boolean_tuple(1, None)
+
+        table = pickle.loads(pickle.dumps((self.table, bold)))[0]
+        bold = table.formats[1]
+
+        self.assertEqual(sorted(table.keys()), [0, 1, 5])
+        self.assertEqual(list(table[0].items()),
+                         [(0, cell_formula_tuple('A1+1', bold, 0)),
+                          (2, cell_string_tuple(7, bold))])
+        self.assertEqual(type(table[0][0]).__name__, 'Formula')
+        self.assertEqual(len(table[1]), 0)
+        self.assertEqual(table[5][1], cell_boolean_tuple(1, None))
+
+        # New cells use the format ids of the unpickled formats.
+        table[5][2] = cell_blank_tuple(bold)
+        self.assertEqual(table.formats, [None, bold])
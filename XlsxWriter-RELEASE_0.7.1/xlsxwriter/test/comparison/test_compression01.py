@@ -0,0 +1,117 @@
+###############################################################################
+#
+# Tests for XlsxWriter.
+#
+# Copyright (c), 2013-2015, John McNamara, jmcnamara@cpan.org
+#
+
+import sys
+import unittest
+import warnings
+from zipfile import ZipFile, ZIP_DEFLATED, ZIP_STORED
+from ..excel_comparsion_test import ExcelComparisonTest
+from ...workbook import Workbook
+
+
+class TestCompareXLSXFiles(ExcelComparisonTest):
+    """
+    Test file created by XlsxWriter against a file created by Excel.
+
+    """
+
+    def setUp(self):
+        self.maxDiff = None
+
+        filename = 'image01.xlsx'
+
+        test_dir = 'xlsxwriter/test/comparison/'
+        self.image_dir = test_dir + 'images/'
+        self.got_filename = test_dir + '_test_compression_' + filename
+        self.exp_filename = test_dir + 'xlsx_files/' + filename
+
+        self.ignore_files = []
+        self.ignore_elements = {}
+
+    def get_compress_types(self):
+        # Get the compression method of each part of the output file.
+        xlsx_file = ZipFile(self.got_filename)
+        compress_types = dict((info.filename, info.compress_type)
+                              for info in xlsx_file.infolist())
+        xlsx_file.close()
+
+        return compress_types
+
+    def test_create_file_stored(self):
+        """Test the creation of a file without compression."""
+
+        workbook = Workbook(self.got_filename, {'compression': 'store'})
+
+        worksheet = workbook.add_worksheet()
+
+        worksheet.insert_image('E9', self.image_dir + 'red.png')
+
+        workbook.close()
+
+        self.assertExcelEqual()
+
+        compress_types = self.get_compress_types()
+        self.assertEqual(set(compress_types.values()), set([ZIP_STORED]))
+
+    def test_create_file_store_images(self):
+        """Test the creation of a file with the images stored as is."""
+
+        workbook = Workbook(self.got_filename, {'compression_level': 1,
+                                                'store_images': True})
+
+        worksheet = workbook.add_worksheet()
+
+        worksheet.insert_image('E9', self.image_dir + 'red.png')
+
+        workbook.close()
+
+        self.assertExcelEqual()
+
+        compress_types = self.get_compress_types()
+        self.assertEqual(compress_types.pop('xl/media/image1.png'), ZIP_STORED)
+        self.assertEqual(set(compress_types.values()), set([ZIP_DEFLATED]))
+
+    @unittest.skipIf(sys.version_info < (3, 7),
+                     'The compression level requires Python 3.7+')
+    def test_create_file_compression_level(self):
+        """Test that the compression level is used for every part."""
+
+        workbook = Workbook(self.got_filename, {'compression_level': 0})
+
+        worksheet = workbook.add_worksheet()
+
+        worksheet.insert_image('E9', self.image_dir + 'red.png')
+
+        workbook.close()
+
+        self.assertExcelEqual()
+
+        # Deflate level 0 doesn't reduce the size of any part.
+        xlsx_file = ZipFile(self.got_filename)
+        for info in xlsx_file.infolist():
+            self.assertTrue(info.compress_size >= info.file_size,
+                            info.filename)
+        xlsx_file.close()
+
+    def test_create_file_invalid_level(self):
+        """Test that an invalid compression level is ignored."""
+
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always')
+
+            workbook = Workbook(self.got_filename, {'compression_level': 1.0})
+
+            worksheet = workbook.add_worksheet()
+
+            worksheet.insert_image('E9', self.image_dir + 'red.png')
+
+            workbook.close()
+
+        self.assertEqual(len(caught), 1)
+        self.assertIn('Compression level', str(caught[0].message))
+
+        self.assertExcelEqual()
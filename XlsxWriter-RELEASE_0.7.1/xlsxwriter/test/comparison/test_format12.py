@@ -57,3 +57,31 @@ class TestCompareXLSXFiles(ExcelComparisonTest):
         workbook.close()
 
         self.assertExcelEqual()
+
+    def test_create_file_shared_format(self):
+        """Test changing Formats that were created with the same properties."""
+
+        workbook = Workbook(self.got_filename)
+
+        worksheet = workbook.add_worksheet()
+
+        top_left_bottom = workbook.add_format({'top': 1})
+        top_left_bottom.set_left(1)
+        top_left_bottom.set_bottom(1)
+
+        worksheet.write('B2', 'test', top_left_bottom)
+
+        top_left = workbook.add_format({'top': 1})
+        top_bottom = workbook.add_format({'top': 1})
+
+        top_left.set_left(1)
+
+        worksheet.write('D2', 'test', top_left)
+
+        top_bottom.set_bottom(1)
+
+        worksheet.write('F2', 'test', top_bottom)
+
+        workbook.close()
+
+        self.assertExcelEqual()
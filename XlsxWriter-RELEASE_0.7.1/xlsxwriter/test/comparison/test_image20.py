@@ -25,7 +25,11 @@ class TestCompareXLSXFiles(ExcelComparisonTest):
         self.got_filename = test_dir + '_test_' + filename
         self.exp_filename = test_dir + 'xlsx_files/' + filename
 
-        self.ignore_files = []
+        # The repeated image is only stored once by XlsxWriter. See the
+        # test_image_dedup01 test for the shared image relationships.
+        self.ignore_files = ['xl/media/image2.jpeg',
+                             'xl/media/image3.jpeg',
+                             'xl/drawings/_rels/drawing1.xml.rels']
         self.ignore_elements = {}
 
     def test_create_file(self):
@@ -0,0 +1,52 @@
+###############################################################################
+#
+# Tests for XlsxWriter.
+#
+# Copyright (c), 2013-2015, John McNamara, jmcnamara@cpan.org
+#
+
+from ..excel_comparsion_test import ExcelComparisonTest
+from ...workbook import Workbook
+
+
+class TestCompareXLSXFiles(ExcelComparisonTest):
+    """
+    Test file created by XlsxWriter against a file created by Excel.
+
+    """
+
+    def setUp(self):
+        self.maxDiff = None
+
+        filename = 'shared_strings01.xlsx'
+
+        test_dir = 'xlsxwriter/test/comparison/'
+        self.got_filename = test_dir + '_test_optimize12_' + filename
+        self.exp_filename = test_dir + 'xlsx_files/' + filename
+
+        self.ignore_files = []
+
+        # Rows don't have spans in constant_memory mode.
+        self.ignore_elements = {'xl/worksheets/sheet1.xml': ['<row']}
+
+    def test_create_file(self):
+        """Test constant_memory mode with shared strings."""
+
+        workbook = Workbook(self.got_filename, {'constant_memory': True,
+                                                'shared_strings': True,
+                                                'in_memory': False})
+
+        worksheet = workbook.add_worksheet()
+
+        # Test that control characters and any other single byte characters are
+        # handled correctly by the sharedstrings module. We skip chr 34 = " in
+        # this test since it isn't encoded by Excel as &quot;.
+        chars = list(range(127))
+        del chars[34]
+
+        for char in chars:
+            worksheet.write_string(char, 0, chr(char))
+
+        workbook.close()
+
+        self.assertExcelEqual()
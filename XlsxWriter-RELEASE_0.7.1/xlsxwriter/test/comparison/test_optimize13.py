@@ -0,0 +1,46 @@
+###############################################################################
+#
+# Tests for XlsxWriter.
+#
+# Copyright (c), 2013-2015, John McNamara, jmcnamara@cpan.org
+#
+
+from ..excel_comparsion_test import ExcelComparisonTest
+from ...workbook import Workbook
+
+
+class TestCompareXLSXFiles(ExcelComparisonTest):
+    """
+    Test file created by XlsxWriter against a file created by Excel.
+
+    """
+
+    def setUp(self):
+        self.maxDiff = None
+
+        filename = 'simple01.xlsx'
+
+        test_dir = 'xlsxwriter/test/comparison/'
+        self.got_filename = test_dir + '_test_optimize13_' + filename
+        self.exp_filename = test_dir + 'xlsx_files/' + filename
+
+        self.ignore_files = []
+
+        # Rows don't have spans in constant_memory mode.
+        self.ignore_elements = {'xl/worksheets/sheet1.xml': ['<row']}
+
+    def test_create_file(self):
+        """Test constant_memory mode with rows written out of order."""
+
+        workbook = Workbook(self.got_filename, {'constant_memory': True,
+                                                'shared_strings': True,
+                                                'unordered_rows': True,
+                                                'in_memory': False})
+        worksheet = workbook.add_worksheet()
+
+        worksheet.write_number(1, 0, 123)
+        worksheet.write_string(0, 0, 'Hello')
+
+        workbook.close()
+
+        self.assertExcelEqual()
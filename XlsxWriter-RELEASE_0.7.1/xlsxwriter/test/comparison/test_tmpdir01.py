@@ -0,0 +1,96 @@
+###############################################################################
+#
+# Tests for XlsxWriter.
+#
+# Copyright (c), 2013-2015, John McNamara, jmcnamara@cpan.org
+#
+
+import os
+import sys
+import shutil
+import struct
+import unittest
+from zipfile import ZipFile
+from ..excel_comparsion_test import ExcelComparisonTest
+from ...workbook import Workbook
+
+
+class TestCompareXLSXFiles(ExcelComparisonTest):
+    """
+    Test file created by XlsxWriter against a file created by Excel.
+
+    """
+
+    def setUp(self):
+        self.maxDiff = None
+
+        filename = 'image01.xlsx'
+
+        test_dir = 'xlsxwriter/test/comparison/'
+        self.image_dir = test_dir + 'images/'
+        self.got_filename = test_dir + '_test_tmpdir_' + filename
+        self.exp_filename = test_dir + 'xlsx_files/' + filename
+
+        self.ignore_files = []
+        self.ignore_elements = {}
+
+    @unittest.skipIf(sys.version_info < (3, 6),
+                     'Streaming zip parts requires Python 3.6+')
+    def test_create_file(self):
+        """Test that the parts are streamed into the file without temp files."""
+
+        # Any attempt to create a temp file in this directory would fail.
+        workbook = Workbook(self.got_filename,
+                            {'tmpdir': 'xlsxwriter/test/comparison/_no_dir_'})
+
+        worksheet = workbook.add_worksheet()
+
+        worksheet.insert_image('E9', self.image_dir + 'red.png')
+
+        workbook.close()
+
+        self.assertExcelEqual()
+
+    @unittest.skipIf(sys.version_info < (3, 6),
+                     'Streaming zip parts requires Python 3.6+')
+    def test_create_file_zip64(self):
+        """Test that ZIP64 is only used by the parts that need it."""
+
+        workbook = Workbook(self.got_filename)
+        workbook.use_zip64()
+
+        worksheet = workbook.add_worksheet()
+
+        worksheet.insert_image('E9', self.image_dir + 'red.png')
+
+        workbook.close()
+
+        self.assertExcelEqual()
+
+        # None of the local file headers have a ZIP64 extra field.
+        xlsx_file = open(self.got_filename, 'rb')
+
+        for info in ZipFile(xlsx_file).infolist():
+            xlsx_file.seek(info.header_offset + 28)
+            extra_length = struct.unpack('<H', xlsx_file.read(2))[0]
+            self.assertEqual(extra_length, 0, info.filename)
+
+        xlsx_file.close()
+
+    def test_create_file_error(self):
+        """Test that a partly written file is removed after an error."""
+
+        vba_filename = self.got_filename + '.bin'
+        shutil.copy('xlsxwriter/test/comparison/xlsx_files/vbaProject01.bin',
+                    vba_filename)
+
+        workbook = Workbook(self.got_filename)
+
+        workbook.add_worksheet()
+        workbook.add_vba_project(vba_filename)
+
+        # The VBA file is read as the workbook is packaged.
+        os.remove(vba_filename)
+
+        self.assertRaises(IOError, workbook.close)
+        self.assertFalse(os.path.exists(self.got_filename))
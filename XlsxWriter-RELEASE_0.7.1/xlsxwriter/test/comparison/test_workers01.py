@@ -0,0 +1,77 @@
+###############################################################################
+#
+# Tests for XlsxWriter.
+#
+# Copyright (c), 2013-2015, John McNamara, jmcnamara@cpan.org
+#
+
+import sys
+import unittest
+import warnings
+from ..excel_comparsion_test import ExcelComparisonTest
+from ...workbook import Workbook
+
+
+class TestCompareXLSXFiles(ExcelComparisonTest):
+    """
+    Test file created by XlsxWriter against a file created by Excel.
+
+    """
+
+    def setUp(self):
+        self.maxDiff = None
+
+        filename = 'format01.xlsx'
+
+        test_dir = 'xlsxwriter/test/comparison/'
+        self.got_filename = test_dir + '_test_workers_' + filename
+        self.exp_filename = test_dir + 'xlsx_files/' + filename
+
+        self.ignore_files = []
+        self.ignore_elements = {}
+
+    @unittest.skipIf(sys.version_info < (3, 4),
+                     'Parallel worksheet writing requires Python 3.4+')
+    def test_create_file(self):
+        """Test the creation of a file with formats using worker processes."""
+
+        workbook = Workbook(self.got_filename, {'workers': 2})
+
+        worksheet1 = workbook.add_worksheet()
+        worksheet2 = workbook.add_worksheet('Data Sheet')
+        worksheet3 = workbook.add_worksheet()
+
+        unused1 = workbook.add_format({'bold': 1})
+        bold = workbook.add_format({'bold': 1})
+        unused2 = workbook.add_format({'bold': 1})
+        unused3 = workbook.add_format({'italic': 1})
+
+        worksheet1.write('A1', 'Foo')
+        worksheet1.write('A2', 123)
+
+        worksheet3.write('B2', 'Foo')
+        worksheet3.write('B3', 'Bar', bold)
+        worksheet3.write('C4', 234)
+
+        workbook.close()
+
+        self.assertExcelEqual()
+
+    def test_create_file_constant_memory(self):
+        """Test that the workers aren't used in constant_memory mode."""
+
+        workbook = Workbook(self.got_filename, {'workers': 2,
+                                                'constant_memory': True})
+
+        worksheet1 = workbook.add_worksheet()
+        worksheet2 = workbook.add_worksheet()
+
+        worksheet1.write('A1', 'Foo')
+        worksheet2.write('A1', 123)
+
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always')
+            workbook.close()
+
+        self.assertEqual(len(caught), 1)
+        self.assertIn("'workers' option", str(caught[0].message))
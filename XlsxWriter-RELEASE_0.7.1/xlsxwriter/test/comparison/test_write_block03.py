@@ -0,0 +1,61 @@
+###############################################################################
+#
+# Tests for XlsxWriter.
+#
+# Copyright (c), 2013-2015, John McNamara, jmcnamara@cpan.org
+#
+
+from array import array
+from ..excel_comparsion_test import ExcelComparisonTest
+from ...workbook import Workbook
+
+
+class TestCompareXLSXFiles(ExcelComparisonTest):
+    """
+    Test file created by XlsxWriter against a file created by Excel.
+
+    """
+
+    def setUp(self):
+        self.maxDiff = None
+
+        filename = 'chart_font08.xlsx'
+
+        test_dir = 'xlsxwriter/test/comparison/'
+        self.got_filename = test_dir + '_test_' + filename
+        self.exp_filename = test_dir + 'xlsx_files/' + filename
+
+        self.ignore_files = []
+        self.ignore_elements = {}
+
+    def test_create_file(self):
+        """Test write_block() with array.array rows."""
+
+        workbook = Workbook(self.got_filename)
+
+        worksheet = workbook.add_worksheet()
+        chart = workbook.add_chart({'type': 'line'})
+
+        chart.axis_ids = [69199744, 69214976]
+
+        data = [
+            array('i', [1, 2, 3]),
+            array('i', [2, 4, 6]),
+            array('i', [3, 6, 9]),
+            array('i', [4, 8, 12]),
+            array('i', [5, 10, 15]),
+        ]
+
+        worksheet.write_block('A1', data)
+
+        chart.add_series({'values': '=Sheet1!$A$1:$A$5'})
+        chart.add_series({'values': '=Sheet1!$B$1:$B$5'})
+        chart.add_series({'values': '=Sheet1!$C$1:$C$5'})
+
+        chart.set_legend({'font': {'bold': 1, 'italic': 1, 'baseline': -1}})
+
+        worksheet.insert_chart('E9', chart)
+
+        workbook.close()
+
+        self.assertExcelEqual()
@@ -0,0 +1,85 @@
+###############################################################################
+#
+# Tests for XlsxWriter.
+#
+# Copyright (c), 2013-2015, John McNamara, jmcnamara@cpan.org
+#
+
+import unittest
+from ...format import Format
+from ...workbook import Workbook
+
+
+class TestFormatKeys(unittest.TestCase):
+    """
+    Test the cached Format keys and the sharing of Formats by add_format().
+
+    """
+
+    def test_cached_keys(self):
+        """Test that the Format keys are updated when a property changes."""
+
+        cell_format = Format({'bold': 1})
+
+        font_key = cell_format._get_font_key()
+        format_key = cell_format._get_format_key()
+
+        self.assertIs(cell_format._get_font_key(), font_key)
+        self.assertIs(cell_format._get_format_key(), format_key)
+
+        cell_format.set_italic()
+
+        self.assertNotEqual(cell_format._get_font_key(), font_key)
+        self.assertNotEqual(cell_format._get_format_key(), format_key)
+
+        exp = Format({'bold': 1, 'italic': 1})
+
+        self.assertEqual(cell_format._get_font_key(), exp._get_font_key())
+        self.assertEqual(cell_format._get_format_key(), exp._get_format_key())
+
+    def test_add_format_shared(self):
+        """Test that add_format() shares the properties of equal Formats."""
+
+        workbook = Workbook()
+
+        format1 = workbook.add_format({'bold': 1, 'num_format': '0.00'})
+        format2 = workbook.add_format({'num_format': '0.00', 'bold': 1})
+        format3 = workbook.add_format({'bold': 1})
+
+        self.assertIsNot(format1, format2)
+        self.assertIs(format1.__dict__, format2.__dict__)
+        self.assertIsNot(format1.__dict__, format3.__dict__)
+
+        # Internal formats aren't shared with the user.
+        format4 = workbook.add_format({'color': 'blue', 'underline': 1})
+
+        self.assertIsNot(format4.__dict__,
+                         workbook.default_url_format.__dict__)
+
+        workbook.fileclosed = 1
+
+    def test_add_format_changed(self):
+        """Test that changing a Format doesn't change Formats sharing it."""
+
+        workbook = Workbook()
+
+        format1 = workbook.add_format({'bold': 1})
+        format1._get_xf_index()
+
+        format2 = workbook.add_format({'bold': 1})
+        format2.set_bg_color('red')
+
+        format3 = workbook.add_format({'bold': 1})
+
+        self.assertEqual(format1.bg_color, 0)
+        self.assertIs(format1.__dict__, format3.__dict__)
+        self.assertIsNot(format1.__dict__, format2.__dict__)
+        self.assertNotEqual(format1._get_format_key(),
+                            format2._get_format_key())
+
+        # The changed Format needs its own index.
+        self.assertEqual(format3.xf_index, format1.xf_index)
+        self.assertIsNone(format2.xf_index)
+        self.assertNotEqual(format2._get_xf_index(), format1.xf_index)
+
+        workbook.fileclosed = 1
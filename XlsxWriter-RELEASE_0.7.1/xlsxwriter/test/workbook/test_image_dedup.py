@@ -0,0 +1,66 @@
+###############################################################################
+#
+# Tests for XlsxWriter.
+#
+# Copyright (c), 2013-2015, John McNamara, jmcnamara@cpan.org
+#
+
+import re
+import unittest
+from io import BytesIO
+from zipfile import ZipFile
+from ...workbook import Workbook
+
+
+class TestImageDedup(unittest.TestCase):
+    """
+    Test that an image inserted more than once is only stored once.
+
+    """
+
+    def setUp(self):
+        self.image_dir = 'xlsxwriter/test/comparison/images/'
+        self.output = BytesIO()
+
+    def test_image_dedup(self):
+        """Test the media files and relationships of repeated images."""
+
+        workbook = Workbook(self.output, {'in_memory': True})
+
+        worksheet1 = workbook.add_worksheet()
+        worksheet2 = workbook.add_worksheet()
+
+        logo = self.image_dir + 'red.png'
+
+        image_file = open(logo, 'rb')
+        image_data = BytesIO(image_file.read())
+        image_file.close()
+
+        worksheet1.insert_image('B2', logo)
+        worksheet1.insert_image('B12', logo, {'url': 'https://www.github.com'})
+        worksheet1.insert_image('B22', self.image_dir + 'blue.png')
+        worksheet2.insert_image('B2', 'copy.png', {'image_data': image_data})
+        worksheet2.set_header('&L&G', {'image_left': logo})
+
+        workbook.close()
+
+        got_zip = ZipFile(self.output, 'r')
+
+        media = sorted(name for name in got_zip.namelist()
+                       if name.startswith('xl/media/'))
+
+        self.assertEqual(media, ['xl/media/image1.png',
+                                 'xl/media/image2.png'])
+
+        targets = []
+        for rels in ('xl/drawings/_rels/drawing1.xml.rels',
+                     'xl/drawings/_rels/drawing2.xml.rels',
+                     'xl/drawings/_rels/vmlDrawing1.vml.rels'):
+            xml = got_zip.read(rels).decode('utf-8')
+            targets.append(re.findall(r'Target="\.\./media/([^"]+)"', xml))
+
+        got_zip.close()
+
+        self.assertEqual(targets, [['image1.png', 'image1.png', 'image2.png'],
+                                   ['image1.png'],
+                                   ['image1.png']])
@@ -324,3 +324,17 @@ class TestCalculateSpans(unittest.TestCase):
         exp = {1: '2:17', 2: '18:18'}
 
         self.assertEqual(got, exp)
+
+    def test_calculate_spans_sparse(self):
+        """Test Worksheet _calculate_spans() with sparse rows"""
+        self.worksheet.write_number(0, 0, 1)
+        self.worksheet.write_number(20, 16383, 1)
+        self.worksheet.write_number(1000000, 5, 1)
+        self.worksheet.write_comment(33, 7, 'Foo')
+
+        self.worksheet._calculate_spans()
+
+        got = self.worksheet.row_spans
+        exp = {0: '1:1', 1: '16384:16384', 2: '8:8', 62500: '6:6'}
+
+        self.assertEqual(got, exp)
@@ -0,0 +1,125 @@
+###############################################################################
+#
+# Tests for XlsxWriter.
+#
+# Copyright (c), 2013-2015, John McNamara, jmcnamara@cpan.org
+#
+
+import unittest
+from ...compatibility import StringIO
+from ...worksheet import Worksheet
+
+
+class TestCoalesceRules(unittest.TestCase):
+    """
+    Test that identical conditional formats and data validations on adjacent
+    ranges are coalesced.
+
+    """
+
+    def setUp(self):
+        self.fh = StringIO()
+        self.worksheet = Worksheet()
+        self.worksheet._set_filehandle(self.fh)
+
+    def test_coalesce_conditional_formats(self):
+        """Test coalescing conditional formats added row by row."""
+
+        worksheet = self.worksheet
+
+        for row in range(3):
+            worksheet.conditional_format(row, 0, row, 3,
+                                         {'type': 'cell',
+                                          'criteria': '>',
+                                          'value': 5})
+            worksheet.conditional_format(row, 0, row, 3,
+                                         {'type': 'formula',
+                                          'criteria': '=$F$1>0'})
+
+        # Rows with a gap or a new column are added as another range.
+        worksheet.conditional_format('A5:D5', {'type': 'cell',
+                                               'criteria': '>',
+                                               'value': 5})
+        worksheet.conditional_format('E1', {'type': 'formula',
+                                            'criteria': '=$F$1>0'})
+
+        worksheet._write_conditional_formats()
+
+        exp = ("""<conditionalFormatting sqref="A1:D3">"""
+               """<cfRule type="cellIs" priority="1" operator="greaterThan">"""
+               """<formula>5</formula></cfRule>"""
+               """</conditionalFormatting>"""
+               """<conditionalFormatting sqref="A1:D3 E1">"""
+               """<cfRule type="expression" priority="2">"""
+               """<formula>$F$1&gt;0</formula></cfRule>"""
+               """</conditionalFormatting>"""
+               """<conditionalFormatting sqref="A5:D5">"""
+               """<cfRule type="cellIs" priority="3" operator="greaterThan">"""
+               """<formula>5</formula></cfRule>"""
+               """</conditionalFormatting>""")
+        got = self.fh.getvalue()
+
+        self.assertEqual(got, exp)
+
+    def test_conditional_formats_not_coalesced(self):
+        """Test conditional formats that can't be coalesced."""
+
+        worksheet = self.worksheet
+
+        # A later rule on the range would change the order of the rules.
+        worksheet.conditional_format('A1', {'type': 'cell',
+                                            'criteria': '>',
+                                            'value': 5})
+        worksheet.conditional_format('A2', {'type': 'cell',
+                                            'criteria': '<',
+                                            'value': 0})
+        worksheet.conditional_format('A2', {'type': 'cell',
+                                            'criteria': '>',
+                                            'value': 5})
+
+        # Relative references and rules that depend on the whole range.
+        worksheet.conditional_format('B1', {'type': 'formula',
+                                            'criteria': '=$C1>0'})
+        worksheet.conditional_format('B2', {'type': 'formula',
+                                            'criteria': '=$C1>0'})
+        worksheet.conditional_format('C1', {'type': 'top',
+                                            'value': 1})
+        worksheet.conditional_format('C2', {'type': 'top',
+                                            'value': 1})
+
+        self.assertEqual(len(worksheet.cond_formats), 7)
+        self.assertEqual(worksheet.dxf_priority, 8)
+
+    def test_coalesce_data_validations(self):
+        """Test coalescing data validations added row by row."""
+
+        worksheet = self.worksheet
+        options = {'validate': 'list', 'source': ['open', 'closed']}
+
+        for row in range(4):
+            worksheet.data_validation(row, 1, row, 1, options)
+
+        worksheet.data_validation('C1', options)
+        worksheet.data_validation('D1', {'validate': 'custom',
+                                         'value': '=C1>0'})
+        worksheet.data_validation('D2', {'validate': 'custom',
+                                         'value': '=C1>0'})
+
+        worksheet._write_data_validations()
+
+        exp = ("""<dataValidations count="3">"""
+               """<dataValidation type="list" allowBlank="1" """
+               """showInputMessage="1" showErrorMessage="1" """
+               """sqref="B1:B4 C1">"""
+               """<formula1>"open,closed"</formula1></dataValidation>"""
+               """<dataValidation type="custom" allowBlank="1" """
+               """showInputMessage="1" showErrorMessage="1" sqref="D1">"""
+               """<formula1>C1&gt;0</formula1></dataValidation>"""
+               """<dataValidation type="custom" allowBlank="1" """
+               """showInputMessage="1" showErrorMessage="1" sqref="D2">"""
+               """<formula1>C1&gt;0</formula1></dataValidation>"""
+               """</dataValidations>""")
+        got = self.fh.getvalue()
+
+        self.assertEqual(got, exp)
+        self.assertNotIn('cells', options)
@@ -0,0 +1,59 @@
+###############################################################################
+#
+# Tests for XlsxWriter.
+#
+# Copyright (c), 2013-2015, John McNamara, jmcnamara@cpan.org
+#
+
+import unittest
+from ...format import Format
+from ...sharedstrings import SharedStringTable
+from ...worksheet import Worksheet
+
+
+class TestGetRangeData(unittest.TestCase):
+    """
+    Test the Worksheet _get_range_data() method used for chart data.
+
+    """
+
+    def setUp(self):
+        self.worksheet = Worksheet()
+        self.worksheet.str_table = SharedStringTable()
+
+        worksheet = self.worksheet
+
+        worksheet.write_column('A1', [1, 2.5, 'Foo', None, 3])
+        worksheet.write_blank('A4', None, Format())
+        worksheet.write('A8', '=A1', None, 4)
+        worksheet.write_column('B2', [10, 20, True, 30])
+        worksheet.write_row('C1', [7, 8, 9])
+
+        worksheet.str_table._sort_string_data()
+
+    def test_column_range_data(self):
+        """Test _get_range_data() for column ranges."""
+
+        worksheet = self.worksheet
+
+        got = worksheet._get_range_data(0, 0, 8, 0)
+        exp = ['1', '2.5', 'Foo', '', '3', None, None, 4, None]
+
+        self.assertEqual(got, exp)
+
+        got = worksheet._get_range_data(1, 0, 2, 0)
+        self.assertEqual(got, ['2.5', 'Foo'])
+
+        got = worksheet._get_range_data(10, 0, 12, 0)
+        self.assertEqual(got, [None, None, None])
+
+        # Boolean cells aren't included.
+        got = worksheet._get_range_data(0, 1, 4, 1)
+        self.assertEqual(got, [None, '10', '20', '30'])
+
+    def test_row_range_data(self):
+        """Test _get_range_data() for row ranges."""
+
+        got = self.worksheet._get_range_data(0, 2, 0, 5)
+
+        self.assertEqual(got, ['7', '8', '9', None])
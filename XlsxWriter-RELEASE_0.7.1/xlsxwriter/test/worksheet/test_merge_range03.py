@@ -0,0 +1,94 @@
+###############################################################################
+#
+# Tests for XlsxWriter.
+#
+# Copyright (c), 2013-2015, John McNamara, jmcnamara@cpan.org
+#
+
+import unittest
+from ...compatibility import StringIO
+from ...workbook import Workbook
+
+
+class TestMergeRangeBlanks(unittest.TestCase):
+    """
+    Test the blank cells of merged ranges which are added as the rows are
+    written instead of being stored in the worksheet table.
+
+    """
+
+    def create_worksheet(self, options={}):
+        self.fh = StringIO()
+        self.workbook = Workbook(None, options)
+        self.worksheet = self.workbook.add_worksheet()
+        self.format1 = self.workbook.add_format({'bold': 1})
+        self.format2 = self.workbook.add_format({'italic': 1})
+
+    def test_merge_range_blanks(self):
+        """Test merged range blank cells with cells written in the range."""
+
+        self.create_worksheet()
+        worksheet = self.worksheet
+
+        worksheet.write('C2', 'Overwritten')
+        worksheet.merge_range('B1:D2', 3, self.format1)
+        worksheet.write('D1', 4)
+        worksheet.merge_range('C4:C5', None, self.format2)
+
+        # Only the data cells are stored.
+        self.assertEqual(len(worksheet.table[0]), 2)
+        self.assertEqual(len(worksheet.table[1]), 1)
+        self.assertNotIn(4, worksheet.table)
+
+        worksheet._set_filehandle(self.fh)
+        worksheet._write_sheet_data()
+
+        exp = ("""<sheetData>"""
+               """<row r="1" spans="2:4"><c r="B1" s="1"><v>3</v></c>"""
+               """<c r="C1" s="1"/><c r="D1"><v>4</v></c></row>"""
+               """<row r="2" spans="2:4"><c r="B2" s="1"/>"""
+               """<c r="C2" s="1"/><c r="D2" s="1"/></row>"""
+               """<row r="4" spans="2:4"><c r="C4" s="2"/></row>"""
+               """<row r="5" spans="2:4"><c r="C5" s="2"/></row>"""
+               """</sheetData>""")
+        got = self.fh.getvalue()
+
+        self.assertEqual(got, exp)
+        self.assertEqual(worksheet.dim_colmax, 3)
+
+    def test_merge_range_blanks_optimized(self):
+        """Test merged range blank cells in constant_memory mode."""
+
+        self.create_worksheet({'constant_memory': True})
+        worksheet = self.worksheet
+
+        worksheet.set_row(1, 20)
+        worksheet.merge_range('A1:B3', 1, self.format1)
+        worksheet.write('B3', 2)
+
+        # Rows before the last row of the range have been written.
+        self.assertEqual(worksheet.previous_row, 2)
+
+        worksheet.merge_range('A4:A5', 3, self.format2)
+        worksheet._write_single_row()
+
+        self.assertEqual(worksheet.merge_blanks, [])
+
+        worksheet._set_filehandle(self.fh)
+        worksheet._write_optimized_sheet_data()
+
+        exp = ("""<sheetData>"""
+               """<row r="1"><c r="A1" s="1"><v>1</v></c>"""
+               """<c r="B1" s="1"/></row>"""
+               """<row r="2" ht="20" customHeight="1">"""
+               """<c r="A2" s="1"/><c r="B2" s="1"/></row>"""
+               """<row r="3"><c r="A3" s="1"/><c r="B3"><v>2</v></c></row>"""
+               """<row r="4"><c r="A4" s="2"><v>3</v></c></row>"""
+               """<row r="5"><c r="A5" s="2"/></row>"""
+               """</sheetData>""")
+        got = self.fh.getvalue()
+
+        self.assertEqual(got, exp)
+
+    def tearDown(self):
+        self.workbook.fileclosed = 1
@@ -0,0 +1,67 @@
+###############################################################################
+#
+# Tests for XlsxWriter.
+#
+# Copyright (c), 2013-2015, John McNamara, jmcnamara@cpan.org
+#
+
+import unittest
+from ...worksheet import Worksheet
+
+
+class TestPositionObject(unittest.TestCase):
+    """
+    Test the Worksheet _position_object_pixels() offsets with changed row
+    heights and column widths.
+
+    """
+
+    def setUp(self):
+        self.worksheet = Worksheet()
+
+    def get_offsets(self, col, row):
+        # Sum the size of each row and column before the cell.
+        x_abs = sum(self.worksheet._size_col(i) for i in range(col))
+        y_abs = sum(self.worksheet._size_row(i) for i in range(row))
+
+        return x_abs, y_abs
+
+    def test_position_object_pixels(self):
+        """Test the object offsets after changing row and column sizes."""
+
+        worksheet = self.worksheet
+
+        worksheet.set_column(2, 4, 20)
+        worksheet.set_column(6, 6, 0.5)
+        worksheet.set_column(8, 9, None, None, {'hidden': True})
+        worksheet.set_row(1, 30)
+        worksheet.set_row(5, 15)
+        worksheet.set_row(7, None, None, {'hidden': True})
+        worksheet.set_row(100000, 50)
+
+        for col, row in [(0, 0), (3, 1), (5, 6), (10, 8), (12, 200000)]:
+            vertices = worksheet._position_object_pixels(col, row, 10, 5,
+                                                         200, 100)
+            exp = self.get_offsets(col, row)
+            exp = (exp[0] + 10, exp[1] + 5)
+
+            self.assertEqual((vertices[8], vertices[9]), exp)
+
+    def test_position_object_pixels_changed(self):
+        """Test that the offsets are updated after a size change."""
+
+        worksheet = self.worksheet
+
+        worksheet.set_row(2, 30)
+        worksheet._position_object_pixels(1, 4, 0, 0, 10, 10)
+
+        worksheet.set_row(3, 45)
+        worksheet.set_column(0, 0, 30)
+        vertices = worksheet._position_object_pixels(1, 4, 0, 0, 10, 10)
+
+        self.assertEqual((vertices[8], vertices[9]), self.get_offsets(1, 4))
+
+        worksheet.set_default_row(24)
+        vertices = worksheet._position_object_pixels(1, 4, 0, 0, 10, 10)
+
+        self.assertEqual((vertices[8], vertices[9]), self.get_offsets(1, 4))
@@ -0,0 +1,62 @@
+###############################################################################
+#
+# Tests for XlsxWriter.
+#
+# Copyright (c), 2013-2015, John McNamara, jmcnamara@cpan.org
+#
+
+import unittest
+from ...compatibility import StringIO
+from ..helperfunctions import _xml_to_list
+from ...worksheet import Worksheet
+
+
+class TestAssembleWorksheet(unittest.TestCase):
+    """
+    Test assembling a complete Worksheet file.
+
+    """
+    def test_assemble_xml_file(self):
+        """Test writing a worksheet with sparse rows and columns."""
+        self.maxDiff = None
+
+        fh = StringIO()
+        worksheet = Worksheet()
+        worksheet._set_filehandle(fh)
+
+        worksheet.select()
+        worksheet.write_number(0, 0, 1)
+        worksheet.write_number(0, 16383, 2)
+        worksheet.write_number(99999, 16383, 3)
+        worksheet._assemble_xml_file()
+
+        exp = _xml_to_list("""
+                <?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+                <worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">
+                  <dimension ref="A1:XFD100000"/>
+                  <sheetViews>
+                    <sheetView tabSelected="1" workbookViewId="0"/>
+                  </sheetViews>
+                  <sheetFormatPr defaultRowHeight="15"/>
+                  <sheetData>
+                    <row r="1" spans="1:16384">
+                      <c r="A1">
+                        <v>1</v>
+                      </c>
+                      <c r="XFD1">
+                        <v>2</v>
+                      </c>
+                    </row>
+                    <row r="100000" spans="16384:16384">
+                      <c r="XFD100000">
+                        <v>3</v>
+                      </c>
+                    </row>
+                  </sheetData>
+                  <pageMargins left="0.7" right="0.7" top="0.75" bottom="0.75" header="0.3" footer="0.3"/>
+                </worksheet>
+                """)
+
+        got = _xml_to_list(fh.getvalue())
+
+        self.assertEqual(got, exp)
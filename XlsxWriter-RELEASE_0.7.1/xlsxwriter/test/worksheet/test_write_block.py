@@ -0,0 +1,119 @@
+###############################################################################
+#
+# Tests for XlsxWriter.
+#
+# Copyright (c), 2013-2015, John McNamara, jmcnamara@cpan.org
+#
+
+import unittest
+from array import array
+from ...compatibility import StringIO
+from ...format import Format
+from ...worksheet import Worksheet
+
+
+class TestWriteBlock(unittest.TestCase):
+    """
+    Test the Worksheet write_block() method.
+
+    """
+
+    def setUp(self):
+        self.fh = StringIO()
+        self.worksheet = Worksheet()
+        self.worksheet._set_filehandle(self.fh)
+
+    def test_write_block_numbers(self):
+        """Test write_block() with a list of rows."""
+
+        got = self.worksheet.write_block('B2', [[1, 2.5], [3, -4]])
+
+        self.assertEqual(got, 0)
+        self.assertEqual(self.worksheet.table[1][1].number, 1)
+        self.assertEqual(self.worksheet.table[1][2].number, 2.5)
+        self.assertEqual(self.worksheet.table[2][1].number, 3)
+        self.assertEqual(self.worksheet.table[2][2].number, -4)
+
+        self.assertEqual(self.worksheet.dim_rowmin, 1)
+        self.assertEqual(self.worksheet.dim_rowmax, 2)
+        self.assertEqual(self.worksheet.dim_colmin, 1)
+        self.assertEqual(self.worksheet.dim_colmax, 2)
+
+    def test_write_block_formats(self):
+        """Test write_block() with per-column formats and blank cells."""
+
+        bold = Format({'bold': 1})
+        italic = Format({'italic': 1})
+
+        self.worksheet.write_block(0, 0, [[1, None, None, True]],
+                                   [bold, italic])
+
+        row = self.worksheet.table[0]
+
+        self.assertEqual(row[0].format, bold)
+        self.assertEqual(type(row[1]).__name__, 'Blank')
+        self.assertEqual(row[1].format, italic)
+        self.assertNotIn(2, row)
+        self.assertEqual(type(row[3]).__name__, 'Boolean')
+        self.assertEqual(row[3].boolean, 1)
+        self.assertEqual(row[3].format, None)
+
+    def test_write_block_booleans(self):
+        """Test that write_block() writes booleans like write_boolean()."""
+
+        self.worksheet.write_block('A1', [[True, False]])
+        self.worksheet.write_boolean('A2', True)
+        self.worksheet.write_boolean('B2', False)
+
+        self.assertEqual(self.worksheet.table[0][0].boolean, 1)
+        self.assertEqual(self.worksheet.table[0][1].boolean, 0)
+
+        self.worksheet._write_sheet_data()
+
+        exp = ("""<sheetData>"""
+               """<row r="1" spans="1:2"><c r="A1" t="b"><v>1</v></c>"""
+               """<c r="B1" t="b"><v>0</v></c></row>"""
+               """<row r="2" spans="1:2"><c r="A2" t="b"><v>1</v></c>"""
+               """<c r="B2" t="b"><v>0</v></c></row>"""
+               """</sheetData>""")
+        got = self.fh.getvalue()
+
+        self.assertEqual(got, exp)
+
+    def test_write_block_fallback(self):
+        """Test write_block() with types handled by write()."""
+
+        self.worksheet.nan_inf_to_errors = True
+
+        self.worksheet.write_block(0, 0, [[float('nan'), float('inf'), '=1']])
+
+        row = self.worksheet.table[0]
+
+        self.assertEqual(row[0].value, '#NUM!')
+        self.assertEqual(row[1].value, '#DIV/0!')
+        self.assertEqual(row[2].formula, '1')
+
+    def test_write_block_buffer(self):
+        """Test write_block() with a 1-D buffer written as a single row."""
+
+        self.worksheet.write_block(0, 0, array('d', [1.5, 2.5, 3.5]))
+
+        self.assertEqual(self.worksheet.table[0][2].number, 3.5)
+        self.assertEqual(self.worksheet.dim_colmax, 2)
+
+    def test_write_block_out_of_bounds(self):
+        """Test write_block() with a block that is out of bounds."""
+
+        got = self.worksheet.write_block(1048575, 0, [[1], [2]])
+
+        self.assertEqual(got, -1)
+        self.assertEqual(self.worksheet.dim_rowmax, None)
+        self.assertFalse(self.worksheet.table)
+
+    def test_write_block_empty(self):
+        """Test write_block() with an empty block."""
+
+        got = self.worksheet.write_block(0, 0, [])
+
+        self.assertEqual(got, 0)
+        self.assertEqual(self.worksheet.dim_rowmax, None)
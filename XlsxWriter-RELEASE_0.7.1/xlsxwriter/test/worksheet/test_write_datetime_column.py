@@ -0,0 +1,112 @@
+###############################################################################
+#
+# Tests for XlsxWriter.
+#
+# Copyright (c), 2013-2015, John McNamara, jmcnamara@cpan.org
+#
+
+import unittest
+from datetime import date, datetime, time, timedelta
+from ...format import Format
+from ...utility import datetime_to_excel_datetime
+from ...utility import datetimes_to_excel_datetimes
+from ...worksheet import Worksheet
+
+
+class TestWriteDatetimeColumn(unittest.TestCase):
+    """
+    Test the Worksheet write_datetime_column() method.
+
+    """
+
+    def setUp(self):
+        self.worksheet = Worksheet()
+
+        self.dates = [
+            datetime(1899, 12, 31),
+            datetime(1900, 1, 1, 12, 30),
+            datetime(1900, 2, 28, 23, 59, 59),
+            datetime(1900, 3, 1),
+            datetime(1904, 1, 1, 0, 0, 1),
+            datetime(1982, 8, 25, 0, 15, 20, 213000),
+            datetime(2015, 6, 30, 23, 59, 59, 999999),
+            datetime(9999, 12, 31, 23, 59, 59),
+        ]
+
+    def test_convert_datetimes(self):
+        """Test datetimes_to_excel_datetimes() with datetime objects."""
+
+        dates = self.dates + [date(2015, 1, 2), time(12, 0),
+                              timedelta(days=70, hours=6)]
+
+        for date_1904 in (False, True):
+            exp = [datetime_to_excel_datetime(dt, date_1904) for dt in dates]
+            got = datetimes_to_excel_datetimes(dates, date_1904)
+
+            self.assertEqual(got, exp)
+
+    def test_convert_timestamps(self):
+        """Test datetimes_to_excel_datetimes() with POSIX timestamps."""
+
+        epoch = datetime(1970, 1, 1)
+        dates = self.dates[3:]
+        timestamps = [(dt - epoch).total_seconds() for dt in dates]
+
+        for date_1904 in (False, True):
+            exp = [datetime_to_excel_datetime(dt, date_1904) for dt in dates]
+            got = datetimes_to_excel_datetimes(timestamps, date_1904)
+
+            for got_time, exp_time in zip(got, exp):
+                self.assertAlmostEqual(got_time, exp_time, places=9)
+
+        got = datetimes_to_excel_datetimes([0, 1435708800], False)
+
+        self.assertEqual(got, [25569, 42186])
+
+    def test_write_datetime_column(self):
+        """Test write_datetime_column() against write_datetime()."""
+
+        worksheet = Worksheet()
+        date_format = Format({'num_format': 'yyyy-mm-dd'})
+
+        got = self.worksheet.write_datetime_column('B2', self.dates + [None],
+                                                   date_format)
+
+        self.assertEqual(got, 0)
+
+        for row, dt in enumerate(self.dates, 1):
+            worksheet.write_datetime(row, 1, dt, date_format)
+
+            self.assertEqual(self.worksheet.table[row][1],
+                             worksheet.table[row][1])
+
+        # None is written as a formatted blank cell.
+        last_row = len(self.dates) + 1
+        self.assertEqual(type(self.worksheet.table[last_row][1]).__name__,
+                         'Blank')
+
+        self.assertEqual(self.worksheet.dim_rowmin, 1)
+        self.assertEqual(self.worksheet.dim_rowmax, last_row)
+
+    def test_write_datetime_column_bounds(self):
+        """Test write_datetime_column() outside the worksheet bounds."""
+
+        got = self.worksheet.write_datetime_column(1048575, 0, self.dates)
+
+        self.assertEqual(got, -1)
+        self.assertEqual(self.worksheet.dim_rowmin, None)
+
+    def test_write_datetime_column_numpy(self):
+        """Test write_datetime_column() with a NumPy datetime64 array."""
+
+        try:
+            import numpy
+        except ImportError:
+            raise unittest.SkipTest("NumPy is not installed")
+
+        dates = [dt.isoformat() for dt in self.dates] + ['NaT']
+        got = datetimes_to_excel_datetimes(
+            numpy.array(dates, dtype='datetime64[us]'), False)
+        exp = [datetime_to_excel_datetime(dt, False) for dt in self.dates]
+
+        self.assertEqual(got, exp + [None])
@@ -0,0 +1,92 @@
+###############################################################################
+#
+# Tests for XlsxWriter.
+#
+# Copyright (c), 2013-2015, John McNamara, jmcnamara@cpan.org
+#
+
+import unittest
+from datetime import date
+from decimal import Decimal
+from ...sharedstrings import SharedStringTable
+from ...worksheet import Worksheet
+
+
+class Celsius(object):
+    # A type that isn't supported directly by write().
+    def __init__(self, degrees):
+        self.degrees = degrees
+
+    def __float__(self):
+        return float(self.degrees)
+
+
+class TestWriteHandlers(unittest.TestCase):
+    """
+    Test the Worksheet write() type dispatch.
+
+    """
+
+    def setUp(self):
+        self.worksheet = Worksheet()
+        self.worksheet.str_table = SharedStringTable()
+
+    def test_write_handlers(self):
+        """Test the write() methods cached for each token type."""
+
+        worksheet = self.worksheet
+
+        worksheet.write(0, 0, 1)
+        worksheet.write(0, 1, 2.5)
+        worksheet.write(0, 2, Decimal('3.5'))
+        worksheet.write(0, 3, True)
+        worksheet.write(0, 4, 'Foo')
+        worksheet.write(0, 5, date(2015, 1, 1))
+        worksheet.write(0, 6, None)
+
+        handlers = worksheet.write_handlers
+
+        self.assertEqual(handlers[int], worksheet._write_number)
+        self.assertEqual(handlers[float], worksheet._write_number)
+        self.assertEqual(handlers[Decimal], worksheet._write_number)
+        self.assertEqual(handlers[bool], worksheet._write_boolean)
+        self.assertEqual(handlers[str], worksheet._write_token_as_string)
+        self.assertEqual(handlers[date], worksheet._write_datetime)
+        self.assertEqual(handlers[type(None)], worksheet._write_blank)
+
+        row = worksheet.table[0]
+
+        self.assertEqual(type(row[3]).__name__, 'Boolean')
+        self.assertEqual(type(row[4]).__name__, 'String')
+        self.assertEqual(row[5].number, 42005)
+        self.assertNotIn(6, row)
+
+    def test_write_other_type(self):
+        """Test write() with a type that is converted per token."""
+
+        worksheet = self.worksheet
+
+        worksheet.write('A1', Celsius(21.5))
+
+        self.assertEqual(worksheet.table[0][0].number, 21.5)
+        self.assertNotIn(Celsius, worksheet.write_handlers)
+
+    def test_write_string_options(self):
+        """Test write() with the string conversion options."""
+
+        worksheet = self.worksheet
+        worksheet.strings_to_numbers = True
+
+        worksheet.write(0, 0, 'Foo')
+        worksheet.write(0, 1, '1.5')
+        worksheet.write(0, 2, '=A1')
+        worksheet.write(0, 3, 'http://www.python.org/')
+
+        row = worksheet.table[0]
+
+        self.assertEqual(type(row[0]).__name__, 'String')
+        self.assertEqual(row[1].number, 1.5)
+        self.assertEqual(row[2].formula, 'A1')
+        self.assertEqual(worksheet.hyperlinks[0][3]['url'],
+                         'http://www.python.org/')
+
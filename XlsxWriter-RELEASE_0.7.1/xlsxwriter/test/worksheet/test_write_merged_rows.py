@@ -0,0 +1,107 @@
+###############################################################################
+#
+# Tests for XlsxWriter.
+#
+# Copyright (c), 2013-2015, John McNamara, jmcnamara@cpan.org
+#
+
+import unittest
+from ...compatibility import StringIO
+from ...workbook import Workbook
+
+
+class TestWriteMergedRows(unittest.TestCase):
+    """
+    Test the Worksheet _write_optimized_sheet_data() method with rows that
+    are written out of order in unordered_rows mode.
+
+    """
+
+    def setUp(self):
+        self.fh = StringIO()
+        self.workbook = Workbook(None, {'constant_memory': True,
+                                        'unordered_rows': True})
+        self.worksheet = self.workbook.add_worksheet()
+
+    def test_write_merged_rows(self):
+        """Test writing rows out of order from the buffered rows."""
+
+        self.worksheet.write_column('B1', [3, 4])
+        self.worksheet.write_column('A1', [1, 2])
+
+        self.worksheet._set_filehandle(self.fh)
+        self.worksheet._write_optimized_sheet_data()
+
+        exp = ("""<sheetData>"""
+               """<row r="1"><c r="A1"><v>1</v></c><c r="B1"><v>3</v></c></row>"""
+               """<row r="2"><c r="A2"><v>2</v></c><c r="B2"><v>4</v></c></row>"""
+               """</sheetData>""")
+        got = self.fh.getvalue()
+
+        self.assertEqual(got, exp)
+
+    def test_write_merged_rows_spilled(self):
+        """Test merging rows that are spilled to disk in several runs."""
+
+        # Spill the rows after every other write.
+        self.worksheet.spill_cell_limit = 2
+
+        self.worksheet.set_row(1, 20)
+        self.worksheet.set_row(3, 30)
+        self.worksheet.write_column('C1', [5, 6, 7])
+        self.worksheet.write_column('A1', [1, 2, 3])
+        self.worksheet.write('B2', 'Foo <c r="')
+        self.worksheet.write('C1', 8)
+        self.worksheet.write('A5', 9)
+
+        self.assertEqual(len(self.worksheet.spill_filenames), 4)
+
+        self.worksheet._set_filehandle(self.fh)
+        self.worksheet._write_optimized_sheet_data()
+
+        exp = ("""<sheetData>"""
+               """<row r="1"><c r="A1"><v>1</v></c><c r="C1"><v>8</v></c></row>"""
+               """<row r="2" ht="20" customHeight="1"><c r="A2"><v>2</v></c>"""
+               """<c r="B2" t="inlineStr"><is><t>Foo &lt;c r="</t></is></c>"""
+               """<c r="C2"><v>6</v></c></row>"""
+               """<row r="3"><c r="A3"><v>3</v></c><c r="C3"><v>7</v></c></row>"""
+               """<row r="4" ht="30" customHeight="1"/>"""
+               """<row r="5"><c r="A5"><v>9</v></c></row>"""
+               """</sheetData>""")
+        got = self.fh.getvalue()
+
+        self.assertEqual(got, exp)
+        self.assertEqual(self.worksheet.spill_filenames, [])
+
+    def test_write_merged_rows_block(self):
+        """Test that the spill limit counts every cell of a block row."""
+
+        self.worksheet.spill_cell_limit = 6
+
+        self.worksheet.write_block('A1', [[1, 2, 3], [4, 5, 6],
+                                          [7, 8, 9], [10, 11, 12]])
+
+        # The third row would take the buffered cells over the limit.
+        self.assertEqual(len(self.worksheet.spill_filenames), 1)
+        self.assertEqual(self.worksheet.spill_cell_count, 6)
+        self.assertEqual(sorted(self.worksheet.table.keys()), [2, 3])
+
+        self.worksheet._set_filehandle(self.fh)
+        self.worksheet._write_optimized_sheet_data()
+
+        exp = ("""<sheetData>"""
+               """<row r="1"><c r="A1"><v>1</v></c><c r="B1"><v>2</v></c>"""
+               """<c r="C1"><v>3</v></c></row>"""
+               """<row r="2"><c r="A2"><v>4</v></c><c r="B2"><v>5</v></c>"""
+               """<c r="C2"><v>6</v></c></row>"""
+               """<row r="3"><c r="A3"><v>7</v></c><c r="B3"><v>8</v></c>"""
+               """<c r="C3"><v>9</v></c></row>"""
+               """<row r="4"><c r="A4"><v>10</v></c><c r="B4"><v>11</v></c>"""
+               """<c r="C4"><v>12</v></c></row>"""
+               """</sheetData>""")
+        got = self.fh.getvalue()
+
+        self.assertEqual(got, exp)
+
+    def tearDown(self):
+        self.workbook.fileclosed = 1
@@ -0,0 +1,63 @@
+###############################################################################
+#
+# Tests for XlsxWriter.
+#
+# Copyright (c), 2013-2015, John McNamara, jmcnamara@cpan.org
+#
+
+import unittest
+from ...compatibility import StringIO
+from ...format import Format
+from ...worksheet import Worksheet
+
+
+class TestWriteRowCells(unittest.TestCase):
+    """
+    Test the Worksheet _write_row_cells() method.
+
+    """
+
+    def setUp(self):
+        self.fh = StringIO()
+        self.worksheet = Worksheet()
+        self.worksheet._set_filehandle(self.fh)
+
+    def test_write_row_cells(self):
+        """Test _write_row_cells() with mixed cell types and formats."""
+
+        cell_format = Format()
+        cell_format.xf_index = 1
+        col_format = Format()
+        col_format.xf_index = 2
+
+        self.worksheet.set_column('D:D', None, col_format)
+        self.worksheet.write_number(0, 0, 1.25)
+        self.worksheet.write_number(0, 1, 7, cell_format)
+        self.worksheet.write_formula(0, 2, '=A1+B1', None, 8.25)
+        self.worksheet.write_number(0, 3, 3)
+
+        self.worksheet._write_row_cells(0, self.worksheet.table[0])
+
+        exp = ("""<c r="A1"><v>1.25</v></c>"""
+               """<c r="B1" s="1"><v>7</v></c>"""
+               """<c r="C1"><f>A1+B1</f><v>8.25</v></c>"""
+               """<c r="D1" s="2"><v>3</v></c>""")
+        got = self.fh.getvalue()
+
+        self.assertEqual(got, exp)
+
+    def test_write_row_cells_row_format(self):
+        """Test _write_row_cells() with a row format."""
+
+        row_format = Format()
+        row_format.xf_index = 3
+
+        self.worksheet.set_row(0, None, row_format)
+        self.worksheet.write_number(0, 5, 2)
+
+        self.worksheet._write_row_cells(0, self.worksheet.table[0])
+
+        exp = """<c r="F1" s="3"><v>2</v></c>"""
+        got = self.fh.getvalue()
+
+        self.assertEqual(got, exp)
@@ -181,6 +181,29 @@ class TestXMLwriter(unittest.TestCase):
 
         self.assertEqual(got, exp)
 
+    def test_xml_cell_number(self):
+        """Test _xml_cell() for numbers"""
+
+        self.writer._xml_cell('n', 'B3', 1.5)
+        self.writer._xml_cell('n', 'C3', 99, 0)
+
+        exp = """<c r="B3"><v>1.5</v></c><c r="C3" s="0"><v>99</v></c>"""
+        got = self.fh.getvalue()
+
+        self.assertEqual(got, exp)
+
+    def test_xml_cell_string(self):
+        """Test _xml_cell() for shared strings"""
+
+        self.writer._xml_cell('s', 'A1', 7)
+        self.writer._xml_cell('s', 'A2', 8.0, 2)
+
+        exp = ("""<c r="A1" t="s"><v>7</v></c>"""
+               """<c r="A2" s="2" t="s"><v>8</v></c>""")
+        got = self.fh.getvalue()
+
+        self.assertEqual(got, exp)
+
     def test_xml_formula_element(self):
         """Test _xml_formula_element()"""
 
@@ -190,3 +213,18 @@ class TestXMLwriter(unittest.TestCase):
         got = self.fh.getvalue()
 
         self.assertEqual(got, exp)
+
+    def test_escape_string(self):
+        """Test _escape_string()"""
+
+        got = self.writer._escape_string('Foo')
+        exp = ('Foo', False, False)
+        self.assertEqual(got, exp)
+
+        got = self.writer._escape_string(' <a & b>\x01_x0041_')
+        exp = (' &lt;a &amp; b&gt;_x0001__x005F_x0041_', False, True)
+        self.assertEqual(got, exp)
+
+        got = self.writer._escape_string('<r><t>a\x1fb</t></r>')
+        exp = ('<r><t>a_x001F_b</t></r>', True, False)
+        self.assertEqual(got, exp)
@@ -51,6 +51,11 @@ class Theme(object):
         if isinstance(filename, StringIO):
             self.internal_fh = False
             self.fh = filename
+        elif hasattr(filename, 'write'):
+            # A stream for a part of the zip container. It is closed, to
+            # complete the part, once the XML has been written.
+            self.internal_fh = True
+            self.fh = filename
         else:
             self.internal_fh = True
             self.fh = codecs.open(filename, 'w', 'utf-8')
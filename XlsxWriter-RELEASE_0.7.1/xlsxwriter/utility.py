@@ -643,3 +643,104 @@ def datetime_to_excel_datetime(dt_obj, date_1904):
         excel_time += 1
 
     return excel_time
+
+
+def datetimes_to_excel_datetimes(data, date_1904):
+    # Convert a sequence of datetime objects or POSIX timestamps, or a NumPy
+    # datetime64 array, to a list of Excel serial dates and times in a single
+    # pass. The result is the same as datetime_to_excel_datetime() for each
+    # value. None, and NaT in a datetime64 array, are returned as None.
+
+    if date_1904:
+        epoch = datetime.datetime(1904, 1, 1)
+    else:
+        epoch = datetime.datetime(1899, 12, 31)
+
+    # Days from the epoch to the POSIX epoch and to 1900-01-01.
+    posix_days = (datetime.datetime(1970, 1, 1) - epoch).days
+    jan1_days = (datetime.datetime(1900, 1, 1) - epoch).days
+
+    # NumPy arrays are converted using the array methods so that NumPy isn't
+    # required by the module.
+    dtype = getattr(data, 'dtype', None)
+    if dtype is not None and getattr(dtype, 'kind', None) == 'M':
+        return _datetime64_to_excel_datetimes(data, date_1904,
+                                              posix_days, jan1_days)
+
+    if dtype is not None and hasattr(data, 'tolist'):
+        data = data.tolist()
+
+    datetime_type = datetime.datetime
+    excel_times = []
+    append = excel_times.append
+
+    for dt_obj in data:
+        dt_type = type(dt_obj)
+
+        if dt_type is datetime_type:
+            delta = dt_obj - epoch
+            days = delta.days
+            excel_time = (days
+                          + (float(delta.seconds)
+                             + float(delta.microseconds) / 1E6)
+                          / (60 * 60 * 24))
+
+            if days == jan1_days:
+                excel_time -= 1
+
+        elif dt_type is float or dt_type is int:
+            # A POSIX timestamp, in UTC.
+            days, seconds = divmod(dt_obj, 60 * 60 * 24)
+            days = int(days)
+            excel_time = days + posix_days + float(seconds) / (60 * 60 * 24)
+
+            if days + posix_days == jan1_days:
+                excel_time -= 1
+
+        elif dt_obj is None:
+            append(None)
+            continue
+
+        else:
+            append(datetime_to_excel_datetime(dt_obj, date_1904))
+            continue
+
+        # Account for Excel erroneously treating 1900 as a leap year.
+        if not date_1904 and excel_time > 59:
+            excel_time += 1
+
+        append(excel_time)
+
+    return excel_times
+
+
+def _datetime64_to_excel_datetimes(data, date_1904, posix_days, jan1_days):
+    # Convert a NumPy datetime64 array to Excel serial dates and times using
+    # array arithmetic on the microseconds since the POSIX epoch.
+    day_us = 60 * 60 * 24 * 1000000
+
+    data = data.ravel()
+    is_nat = data != data
+    microseconds = data.astype('datetime64[us]').astype('int64')
+    microseconds[is_nat] = 0
+
+    days = microseconds // day_us + posix_days
+    day_us_part = microseconds % day_us
+    excel_times = (days
+                   + ((day_us_part // 1000000).astype('float64')
+                      + (day_us_part % 1000000) / 1E6)
+                   / (60 * 60 * 24))
+
+    excel_times[days == jan1_days] -= 1
+
+    # Account for Excel erroneously treating 1900 as a leap year.
+    if not date_1904:
+        excel_times[excel_times > 59] += 1
+
+    excel_times = excel_times.tolist()
+
+    if is_nat.any():
+        for index in is_nat.nonzero()[0].tolist():
+            excel_times[index] = None
+
+    return excel_times
@@ -10,9 +10,10 @@ import sys
 import re
 import os
 import operator
+import hashlib
 from warnings import warn
 from datetime import datetime
-from zipfile import ZipFile, ZIP_DEFLATED
+from zipfile import ZipFile, ZIP_DEFLATED, ZIP_STORED
 from struct import unpack
 
 from .compatibility import str_types
@@ -22,6 +23,7 @@ from . import xmlwriter
 from xlsxwriter.worksheet import Worksheet
 from xlsxwriter.chartsheet import Chartsheet
 from xlsxwriter.sharedstrings import SharedStringTable
+from xlsxwriter.sharedstrings import DiskSharedStringTable
 from xlsxwriter.format import Format
 from xlsxwriter.packager import Packager
 from .utility import xl_cell_to_rowcol
@@ -35,6 +37,10 @@ from xlsxwriter.chart_radar import ChartRadar
 from xlsxwriter.chart_scatter import ChartScatter
 from xlsxwriter.chart_stock import ChartStock
 
+# The comma separated ranges in a non-contiguous chart range. Commas in
+# quoted sheet names are ignored.
+chart_range_parts = re.compile(r"(?:'(?:[^']|'')*'|[^,'])+")
+
 
 class Workbook(xmlwriter.XMLwriter):
     """
@@ -68,7 +74,13 @@ class Workbook(xmlwriter.XMLwriter):
         self.default_date_format = options.get('default_date_format', None)
         self.optimization = options.get('constant_memory', False)
         self.in_memory = options.get('in_memory', False)
+        self.shared_strings = options.get('shared_strings', False)
+        self.unordered_rows = options.get('unordered_rows', False)
         self.excel2003_style = options.get('excel2003_style', False)
+        self.workers = options.get('workers', 0)
+        self.compression = options.get('compression', 'deflate')
+        self.compression_level = options.get('compression_level', None)
+        self.store_images = options.get('store_images', False)
         self.default_format_properties = \
             options.get('default_format_properties', {})
 
@@ -86,6 +98,7 @@ class Workbook(xmlwriter.XMLwriter):
         self.drawings = []
         self.sheetnames = []
         self.formats = []
+        self.format_cache = {}
         self.xf_formats = []
         self.xf_format_indices = {}
         self.dxf_formats = []
@@ -111,6 +124,9 @@ class Workbook(xmlwriter.XMLwriter):
         self.vba_codename = None
         self.image_types = {}
         self.images = []
+        self.image_ref_ids = {}
+        self.image_properties = {}
+        self.image_file_digests = {}
         self.border_count = 0
         self.fill_count = 0
         self.drawing_count = 0
@@ -123,20 +139,25 @@ class Workbook(xmlwriter.XMLwriter):
         if self.in_memory:
             self.optimization = False
 
+        # In 'constant_memory' mode strings are written in-line unless the
+        # 'shared_strings' option is on. Then the table is kept on disk.
+        if self.optimization and self.shared_strings:
+            self.str_table = DiskSharedStringTable(self.tmpdir)
+
         # Add the default cell format.
         if self.excel2003_style:
-            self.add_format({'xf_index': 0, 'font_family': 0})
+            self._add_format({'xf_index': 0, 'font_family': 0})
         else:
-            self.add_format({'xf_index': 0})
+            self._add_format({'xf_index': 0})
 
         # Add a default URL format.
-        self.default_url_format = self.add_format({'color': 'blue',
-                                                   'underline': 1})
+        self.default_url_format = self._add_format({'color': 'blue',
+                                                    'underline': 1})
 
         # Add the default date format.
         if self.default_date_format is not None:
             self.default_date_format = \
-                self.add_format({'num_format': self.default_date_format})
+                self._add_format({'num_format': self.default_date_format})
 
     def __del__(self):
         """Close file in destructor if it hasn't been closed explicitly."""
@@ -184,19 +205,22 @@ class Workbook(xmlwriter.XMLwriter):
             Reference to a Format object.
 
         """
-        format_properties = self.default_format_properties.copy()
+        # Formats created with identical properties share them until one of
+        # the Formats is changed. The cached Format isn't returned to the
+        # user so that its properties stay the same.
+        try:
+            cache_key = tuple(sorted(properties.items()))
+            hash(cache_key)
+        except TypeError:
+            return self._add_format(properties)
 
-        if self.excel2003_style:
-            format_properties = {'font_name': 'Arial', 'font_size': 10,
-                                 'theme': 1 * -1}
+        cached_format = self.format_cache.get(cache_key)
 
-        format_properties.update(properties)
+        if cached_format is None:
+            cached_format = self._add_format(properties)
+            self.format_cache[cache_key] = cached_format
 
-        xf_format = Format(format_properties,
-                           self.xf_format_indices,
-                           self.dxf_format_indices)
-
-        # Store the format reference.
+        xf_format = cached_format._get_shared_format()
         self.formats.append(xf_format)
 
         return xf_format
@@ -503,33 +527,90 @@ class Workbook(xmlwriter.XMLwriter):
         # Prepare the worksheet tables.
         self._prepare_tables()
 
-        # Package the workbook.
-        packager._add_workbook(self)
-        packager._set_tmpdir(self.tmpdir)
-        packager._set_in_memory(self.in_memory)
-        xml_files = packager._create_package()
+        xlsx_file = ZipFile(self.filename, "w", **self._get_zip_options())
+        stored = False
 
-        # Free up the Packager object.
-        packager = None
+        try:
+            # Package the workbook. Where supported the parts are streamed
+            # straight into the zip file without temp files.
+            packager._add_workbook(self)
+            packager._set_tmpdir(self.tmpdir)
+            packager._set_in_memory(self.in_memory)
+            if sys.version_info >= (3, 6):
+                packager._set_zip_file(xlsx_file, self.allow_zip64)
+            packager._set_workers(self.workers)
+            packager._set_store_images(self.store_images)
+            xml_files = packager._create_package()
+
+            # Add XML sub-files to the Zip file with their Excel filename.
+            for os_filename, xml_filename, is_binary in xml_files:
+                compress_type = packager._get_compress_type(xml_filename)
+
+                if self.in_memory:
+                    # The files are in-memory StringIOs.
+                    if is_binary:
+                        data = os_filename.getvalue()
+                    else:
+                        data = os_filename.getvalue().encode('utf-8')
+
+                    xlsx_file.writestr(xml_filename, data, compress_type)
+                else:
+                    # The files are tempfiles.
+                    xlsx_file.write(os_filename, xml_filename, compress_type)
+                    os.remove(os_filename)
 
-        xlsx_file = ZipFile(self.filename, "w", compression=ZIP_DEFLATED,
-                            allowZip64=self.allow_zip64)
+            xlsx_file.close()
+            stored = True
 
-        # Add XML sub-files to the Zip file with their Excel filename.
-        for os_filename, xml_filename, is_binary in xml_files:
-            if self.in_memory:
-                # The files are in-memory StringIOs.
-                if is_binary:
-                    xlsx_file.writestr(xml_filename, os_filename.getvalue())
-                else:
-                    xlsx_file.writestr(xml_filename,
-                                       os_filename.getvalue().encode('utf-8'))
-            else:
-                # The files are tempfiles.
-                xlsx_file.write(os_filename, xml_filename)
-                os.remove(os_filename)
+        finally:
+            if not stored:
+                self._discard_workbook_file(packager, xlsx_file)
 
-        xlsx_file.close()
+            # Remove any temp file used by the shared string table.
+            self.str_table._close()
+
+    def _discard_workbook_file(self, packager, xlsx_file):
+        # Close and remove a partly written xlsx file after an error so
+        # that a truncated file and its handle aren't left behind. Errors
+        # here are ignored in favour of the original error.
+        try:
+            packager._close_zip_part()
+        except Exception:
+            pass
+
+        try:
+            xlsx_file.close()
+        except Exception:
+            pass
+
+        if isinstance(self.filename, str_types):
+            try:
+                os.remove(self.filename)
+            except OSError:
+                pass
+
+    def _get_zip_options(self):
+        # Get the ZipFile() options for the compression method and level.
+        zip_options = {'compression': ZIP_DEFLATED,
+                       'allowZip64': self.allow_zip64}
+
+        if self.compression == 'store':
+            zip_options['compression'] = ZIP_STORED
+        elif self.compression != 'deflate':
+            warn("Unknown compression '%s' in Workbook() options. "
+                 "Using 'deflate'." % self.compression)
+
+        level = self.compression_level
+
+        if level is not None:
+            if (not isinstance(level, int) or isinstance(level, bool)
+                    or not 0 <= level <= 9):
+                warn("Compression level '%s' must be in the range 0-9 in "
+                     "Workbook() options." % level)
+            elif sys.version_info >= (3, 7):
+                zip_options['compresslevel'] = level
+
+        return zip_options
 
     def _add_sheet(self, name, is_chartsheet):
         # Utility for shared code in add_worksheet() and add_chartsheet().
@@ -544,6 +625,8 @@ class Workbook(xmlwriter.XMLwriter):
             'str_table': self.str_table,
             'worksheet_meta': self.worksheet_meta,
             'optimization': self.optimization,
+            'shared_strings': self.shared_strings,
+            'unordered_rows': self.unordered_rows,
             'tmpdir': self.tmpdir,
             'date_1904': self.date_1904,
             'strings_to_numbers': self.strings_to_numbers,
@@ -606,6 +689,26 @@ class Workbook(xmlwriter.XMLwriter):
 
         return sheetname
 
+    def _add_format(self, properties):
+        # Create a new Format with the default properties. This is also used
+        # for the internal formats which shouldn't be shared with the user.
+        format_properties = self.default_format_properties.copy()
+
+        if self.excel2003_style:
+            format_properties = {'font_name': 'Arial', 'font_size': 10,
+                                 'theme': 1 * -1}
+
+        format_properties.update(properties)
+
+        xf_format = Format(format_properties,
+                           self.xf_format_indices,
+                           self.dxf_format_indices)
+
+        # Store the format reference.
+        self.formats.append(xf_format)
+
+        return xf_format
+
     def _prepare_format_properties(self):
         # Prepare all Format properties prior to passing them to styles.py.
 
@@ -628,30 +731,35 @@ class Workbook(xmlwriter.XMLwriter):
         # Iterate through the XF Format objects and separate them into
         # XF and DXF formats. The XF and DF formats then need to be sorted
         # back into index order rather than creation order.
-        xf_formats = []
-        dxf_formats = []
+        xf_formats = {}
+        dxf_formats = {}
 
-        # Sort into XF and DXF formats.
+        # Sort into XF and DXF formats. Formats that share their properties
+        # also share their indices so only one of them is kept.
         for xf_format in self.formats:
             if xf_format.xf_index is not None:
-                xf_formats.append(xf_format)
+                xf_formats[xf_format.xf_index] = xf_format
 
             if xf_format.dxf_index is not None:
-                dxf_formats.append(xf_format)
+                dxf_formats[xf_format.dxf_index] = xf_format
 
         # Pre-extend the format lists.
         self.xf_formats = [None] * len(xf_formats)
         self.dxf_formats = [None] * len(dxf_formats)
 
         # Rearrange formats into index order.
-        for xf_format in xf_formats:
-            index = xf_format.xf_index
+        for index, xf_format in xf_formats.items():
             self.xf_formats[index] = xf_format
 
-        for dxf_format in dxf_formats:
-            index = dxf_format.dxf_index
+        for index, dxf_format in dxf_formats.items():
             self.dxf_formats[index] = dxf_format
 
+        # The formats are changed in place when the styles are prepared so
+        # they need their own copy of any properties shared with other
+        # Formats. The others still share the indices.
+        for xf_format in self.xf_formats + self.dxf_formats:
+            xf_format._unshare_properties()
+
     def _set_default_xf_indices(self):
         # Set the default index for each format. Only used for testing.
 
@@ -887,7 +995,6 @@ class Workbook(xmlwriter.XMLwriter):
     def _prepare_drawings(self):
         # Iterate through the worksheets and set up chart and image drawings.
         chart_ref_id = 0
-        image_ref_id = 0
         drawing_id = 0
         x_dpi = 96
         y_dpi = 96
@@ -919,9 +1026,10 @@ class Workbook(xmlwriter.XMLwriter):
             for index in range(image_count):
                 filename = sheet.images[index][2]
                 image_data = sheet.images[index][10]
-                (image_type, width, height, name, x_dpi, y_dpi) = \
+                (image_type, width, height, name, x_dpi, y_dpi, digest) = \
                     self._get_image_properties(filename, image_data)
-                image_ref_id += 1
+                image_ref_id = self._get_image_ref_id(filename, image_type,
+                                                      image_data, digest)
 
                 sheet._prepare_image(index, image_ref_id, drawing_id, width,
                                      height, name, image_type, x_dpi, y_dpi)
@@ -933,10 +1041,11 @@ class Workbook(xmlwriter.XMLwriter):
                 image_data = sheet.header_images[index][1]
                 position = sheet.header_images[index][2]
 
-                (image_type, width, height, name, x_dpi, y_dpi) = \
+                (image_type, width, height, name, x_dpi, y_dpi, digest) = \
                     self._get_image_properties(filename, image_data)
 
-                image_ref_id += 1
+                image_ref_id = self._get_image_ref_id(filename, image_type,
+                                                      image_data, digest)
 
                 sheet._prepare_header_image(image_ref_id, width, height,
                                             name, image_type, position,
@@ -949,10 +1058,11 @@ class Workbook(xmlwriter.XMLwriter):
                 image_data = sheet.footer_images[index][1]
                 position = sheet.footer_images[index][2]
 
-                (image_type, width, height, name, x_dpi, y_dpi) = \
+                (image_type, width, height, name, x_dpi, y_dpi, digest) = \
                     self._get_image_properties(filename, image_data)
 
-                image_ref_id += 1
+                image_ref_id = self._get_image_ref_id(filename, image_type,
+                                                      image_data, digest)
 
                 sheet._prepare_header_image(image_ref_id, width, height,
                                             name, image_type, position,
@@ -974,23 +1084,47 @@ class Workbook(xmlwriter.XMLwriter):
         self.drawing_count = drawing_id
 
     def _get_image_properties(self, filename, image_data):
-        # Extract dimension information from the image file.
-        height = 0
-        width = 0
-        x_dpi = 96
-        y_dpi = 96
+        # Extract dimension information from the image file. The image is
+        # identified by a digest of its data so that an image inserted more
+        # than once is only read, per file, and parsed once.
+        digest = None
+        data = None
 
         if not image_data:
-            # Open the image file and read in the data.
-            fh = open(filename, "rb")
-            data = fh.read()
+            digest = self.image_file_digests.get(filename)
+
+            if digest is None:
+                # Open the image file and read in the data.
+                fh = open(filename, "rb")
+                data = fh.read()
+                fh.close()
+
+                digest = hashlib.sha256(data).hexdigest()
+                self.image_file_digests[filename] = digest
         else:
             # Read the image data from the user supplied byte stream.
             data = image_data.getvalue()
+            digest = hashlib.sha256(data).hexdigest()
 
         # Get the image filename without the path.
         image_name = os.path.basename(filename)
 
+        if digest not in self.image_properties:
+            self.image_properties[digest] = \
+                self._process_image(filename, data)
+
+        (image_type, width, height, x_dpi, y_dpi) = \
+            self.image_properties[digest]
+
+        return image_type, width, height, image_name, x_dpi, y_dpi, digest
+
+    def _process_image(self, filename, data):
+        # Get the type, dimensions and resolution of the image data.
+        height = 0
+        width = 0
+        x_dpi = 96
+        y_dpi = 96
+
         # Look for some common image file markers.
         marker1 = (unpack('3s', data[1:4]))[0]
         marker2 = (unpack('>H', data[:2]))[0]
@@ -1025,13 +1159,17 @@ class Workbook(xmlwriter.XMLwriter):
         if not height or not width:
             raise Exception("%s: no size data found in image file." % filename)
 
-        # Store image data to copy it into file container.
-        self.images.append([filename, image_type, image_data])
+        return image_type, width, height, x_dpi, y_dpi
 
-        if not image_data:
-            fh.close()
+    def _get_image_ref_id(self, filename, image_type, image_data, digest):
+        # Get the number of the media file for an image. Images with the same
+        # data share a single media file.
+        if digest not in self.image_ref_ids:
+            # Store image data to copy it into file container.
+            self.images.append([filename, image_type, image_data])
+            self.image_ref_ids[digest] = len(self.images)
 
-        return image_type, width, height, image_name, x_dpi, y_dpi
+        return self.image_ref_ids[digest]
 
     def _process_png(self, data):
         # Extract width and height information from a PNG file.
@@ -1219,8 +1357,8 @@ class Workbook(xmlwriter.XMLwriter):
 
         # Add a font format for cell comments.
         if comment_files > 0:
-            xf = self.add_format({'font_name': 'Tahoma', 'font_size': 8,
-                                  'color_indexed': 81, 'font_only': True})
+            xf = self._add_format({'font_name': 'Tahoma', 'font_size': 8,
+                                   'color_indexed': 81, 'font_only': True})
             xf._get_xf_index()
 
         # Set the workbook vba_codename if one of the sheets has a button and
@@ -1276,43 +1414,62 @@ class Workbook(xmlwriter.XMLwriter):
                     chart.formula_data[r_id] = seen_ranges[c_range]
                     continue
 
-                # Convert the range formula to a sheet name and cell range.
-                (sheetname, cells) = self._get_chart_range(c_range)
+                # Get the data from the worksheet tables.
+                data = self._get_chart_range_data(c_range, worksheets)
 
                 # Skip if we couldn't parse the formula.
-                if sheetname is None:
+                if data is None:
                     continue
 
-                # Handle non-contiguous ranges like:
-                #     (Sheet1!$A$1:$A$2,Sheet1!$A$4:$A$5).
-                # We don't try to parse them. We just return an empty list.
-                if sheetname.startswith('('):
-                    chart.formula_data[r_id] = []
-                    seen_ranges[c_range] = []
-                    continue
+                # Add the data to the chart.
+                chart.formula_data[r_id] = data
 
-                # Warn if the name is unknown since it indicates a user error
-                # in a chart series formula.
-                if sheetname not in worksheets:
-                    warn("Unknown worksheet reference '%s' in range "
-                         "'%s' passed to add_series()" % (sheetname, c_range))
-                    chart.formula_data[r_id] = []
-                    seen_ranges[c_range] = []
-                    continue
+                # Store range data locally to avoid lookup if seen again.
+                seen_ranges[c_range] = data
 
-                # Find the worksheet object based on the sheet name.
-                worksheet = worksheets[sheetname]
+        # Release the column data cached by the worksheets for the charts.
+        for worksheet in worksheets.values():
+            worksheet.chart_column_data = {}
 
-                # Get the data from the worksheet table.
-                data = worksheet._get_range_data(*cells)
+    def _get_chart_range_data(self, c_range, worksheets):
+        # Get the data for a chart range formula from the worksheet table.
+        # Returns None if the formula can't be parsed.
 
-                # TODO. Handle SST string ids if required.
+        # Handle non-contiguous ranges like:
+        #     (Sheet1!$A$1:$A$2,Sheet1!$A$4:$A$5).
+        # The data for each range is joined together, as in Excel.
+        if c_range.startswith('(') and c_range.endswith(')'):
+            data = []
 
-                # Add the data to the chart.
-                chart.formula_data[r_id] = data
+            for part in chart_range_parts.findall(c_range[1:-1]):
+                part_data = self._get_chart_range_data(part, worksheets)
 
-                # Store range data locally to avoid lookup if seen again.
-                seen_ranges[c_range] = data
+                if part_data is None:
+                    return None
+
+                data.extend(part_data)
+
+            return data
+
+        # Convert the range formula to a sheet name and cell range.
+        (sheetname, cells) = self._get_chart_range(c_range)
+
+        # Skip if we couldn't parse the formula.
+        if sheetname is None:
+            return None
+
+        # Warn if the name is unknown since it indicates a user error
+        # in a chart series formula.
+        if sheetname not in worksheets:
+            warn("Unknown worksheet reference '%s' in range "
+                 "'%s' passed to add_series()" % (sheetname, c_range))
+            return []
+
+        # Find the worksheet object based on the sheet name.
+        worksheet = worksheets[sheetname]
+
+        # Get the data from the worksheet table.
+        return worksheet._get_range_data(*cells)
 
     def _get_chart_range(self, c_range):
         # Convert a range formula such as Sheet1!$B$1:$B$5 into a sheet name
@@ -9,14 +9,18 @@
 import re
 import tempfile
 import codecs
+import heapq
+import marshal
 import os
 
+from array import array
+from bisect import bisect_left, bisect_right
+from itertools import groupby
 from warnings import warn
 
 # Standard packages in Python 2/3 compatibility mode.
 from .compatibility import StringIO
 from .compatibility import defaultdict
-from .compatibility import namedtuple
 from .compatibility import num_types, str_types
 
 # Package imports.
@@ -24,6 +28,17 @@ from . import xmlwriter
 from .format import Format
 from .drawing import Drawing
 from .xmlwriter import XMLwriter
+from .xmlwriter import cell_templates
+from .celltable import CellTable
+from .celltable import CELL_NUMBER, CELL_STRING, CELL_BLANK, CELL_BOOLEAN
+from .celltable import CELL_OTHER
+from .celltable import cell_string_tuple
+from .celltable import cell_number_tuple
+from .celltable import cell_blank_tuple
+from .celltable import cell_boolean_tuple
+from .celltable import cell_formula_tuple
+from .celltable import cell_arformula_tuple
+from .rangeindex import RangeIndex
 from .utility import xl_rowcol_to_cell
 from .utility import xl_rowcol_to_cell_fast
 from .utility import xl_cell_to_rowcol
@@ -33,8 +48,29 @@ from .utility import xl_color
 from .utility import get_sparkline_style
 from .utility import supported_datetime
 from .utility import datetime_to_excel_datetime
+from .utility import datetimes_to_excel_datetimes
 from .utility import quote_sheetname
 
+# The URL prefixes that are written as links by the strings_to_urls option.
+url_prefix = re.compile(r'(ftp|http)s?://|mailto:|(in|ex)ternal:')
+
+# Marks the cells, such as booleans, that aren't included in chart data.
+chart_value_skipped = object()
+
+# Used to find the relative cell references in rule formulas. Quoted strings
+# and absolute references are removed before the check for references.
+rule_quoted_string = re.compile(r'"[^"]*"')
+rule_absolute_ref = re.compile(r'\$[A-Za-z]{1,3}\$\d+')
+rule_relative_ref = re.compile(r'[A-Za-z]\$?\d|\$[A-Za-z]|:')
+
+# Conditional format types that apply to each cell in their range
+# independently. Other types, such as top 10 or color scales, depend on all
+# of the cells in the range.
+cell_rule_types = ('cellIs', 'expression')
+
+# A single cell or a cell range in a conditional format 'multi_range'.
+multi_range_part = re.compile(r'^[A-Z]{1,3}\d+(:[A-Z]{1,3}\d+)?$')
+
 
 ###############################################################################
 #
@@ -121,20 +157,6 @@ def convert_column_args(method):
     return column_wrapper
 
 
-###############################################################################
-#
-# Named tuples used for cell types.
-#
-###############################################################################
-cell_string_tuple = namedtuple('String', 'string, format')
-cell_number_tuple = namedtuple('Number', 'number, format')
-cell_blank_tuple = namedtuple('Blank', 'format')
-cell_boolean_tuple = namedtuple('Boolean', 'boolean, format')
-cell_formula_tuple = namedtuple('Formula', 'formula, format, value')
-cell_arformula_tuple = namedtuple('ArrayFormula',
-                                  'formula, format, value, range')
-
-
 ###############################################################################
 #
 # Worksheet Class definition.
@@ -165,6 +187,7 @@ class Worksheet(xmlwriter.XMLwriter):
         self.str_table = None
         self.palette = None
         self.optimization = 0
+        self.inline_strings = 0
         self.tmpdir = None
         self.is_chartsheet = False
 
@@ -262,8 +285,11 @@ class Worksheet(xmlwriter.XMLwriter):
 
         self.names = {}
         self.write_match = []
-        self.table = defaultdict(dict)
+        self.table = CellTable()
+        self.col_names = {}
         self.merge = []
+        self.merge_blanks = []
+        self.merge_rows = None
         self.row_spans = {}
 
         self.has_vml = False
@@ -290,6 +316,8 @@ class Worksheet(xmlwriter.XMLwriter):
         self.col_formats = {}
         self.col_size_changed = False
         self.row_size_changed = False
+        self.col_offsets = None
+        self.row_offsets = None
 
         self.last_shape_id = 1
         self.rel_count = 0
@@ -314,8 +342,16 @@ class Worksheet(xmlwriter.XMLwriter):
         self.previous_row = 0
 
         self.validations = []
-        self.cond_formats = {}
+        self.cond_formats = []
         self.dxf_priority = 1
+
+        # Rules keyed by their options, and the index of their ranges, used
+        # to coalesce identical rules on adjacent ranges.
+        self.validation_rules = {}
+        self.validation_index = RangeIndex()
+        self.cond_format_rules = {}
+        self.cond_format_index = RangeIndex()
+
         self.is_chartsheet = 0
         self.page_view = 0
 
@@ -342,6 +378,21 @@ class Worksheet(xmlwriter.XMLwriter):
         self.row_data_fh = None
         self.row_data_fh_closed = False
 
+        # Escaped text of recent in-line strings in optimization mode.
+        self.inline_string_cache = {}
+
+        # Cache of the write() method for each token type.
+        self.write_handlers = {}
+
+        # Column data read from the table for the chart cached data.
+        self.chart_column_data = {}
+
+        # Buffered rows and spill files for unordered_rows mode.
+        self.unordered_rows = False
+        self.spill_filenames = []
+        self.spill_cell_limit = 100000
+        self.spill_cell_count = 0
+
         self.vertical_dpi = 0
         self.horizontal_dpi = 0
 
@@ -362,78 +413,24 @@ class Worksheet(xmlwriter.XMLwriter):
             other: Return value of called method.
 
         """
+        return self._write(row, col, *args)
+
+    # Undecorated version of write().
+    def _write(self, row, col, *args):
         # Check the number of args passed.
-        if not len(args):
+        if not args:
             raise TypeError("write() takes at least 4 arguments (3 given)")
 
         # The first arg should be the token for all write calls.
         token = args[0]
 
-        # Write None as a blank cell.
-        if token is None:
-            return self.write_blank(row, col, *args)
-
-        # Write boolean types.
-        if isinstance(token, bool):
-            return self.write_boolean(row, col, *args)
-
-        # Write datetime objects.
-        if supported_datetime(token):
-            return self.write_datetime(row, col, *args)
-
-        # Write number types.
-        if isinstance(token, num_types):
-            return self.write_number(row, col, *args)
-
-        # Write string types.
-        if isinstance(token, str_types):
-            # Map the data to the appropriate write_*() method.
-            if token == '':
-                return self.write_blank(row, col, *args)
-
-            elif self.strings_to_formulas and token.startswith('='):
-                return self.write_formula(row, col, *args)
-
-            elif self.strings_to_urls and re.match('(ftp|http)s?://', token):
-                return self.write_url(row, col, *args)
-
-            elif self.strings_to_urls and re.match('mailto:', token):
-                return self.write_url(row, col, *args)
-
-            elif self.strings_to_urls and re.match('(in|ex)ternal:', token):
-                return self.write_url(row, col, *args)
+        # Map the token type to the appropriate _write_*() method.
+        handler = self.write_handlers.get(type(token))
 
-            elif self.strings_to_numbers:
-                try:
-                    f = float(token)
-                    if (self.nan_inf_to_errors or
-                            (not self._isnan(f) and not self._isinf(f))):
-                        return self.write_number(row, col, f, *args[1:])
-                except ValueError:
-                    # Not a number, write as a string.
-                    pass
-
-                return self.write_string(row, col, *args)
-
-            else:
-                # We have a plain string.
-                return self.write_string(row, col, *args)
+        if handler is None:
+            handler = self._get_write_handler(token)
 
-        # We haven't matched a supported type. Try float.
-        try:
-            f = float(token)
-            return self.write_number(row, col, f, *args[1:])
-        except ValueError:
-            pass
-        except TypeError:
-            raise TypeError("Unsupported type %s in write()" % type(token))
-
-        # Finally try string.
-        try:
-            str(token)
-            return self.write_string(row, col, *args)
-        except ValueError:
-            raise TypeError("Unsupported type %s in write()" % type(token))
+        return handler(row, col, *args)
 
     @convert_cell_args
     def write_string(self, row, col, string, cell_format=None):
@@ -452,6 +449,10 @@ class Worksheet(xmlwriter.XMLwriter):
             -2: String truncated to 32k characters.
 
         """
+        return self._write_string(row, col, string, cell_format)
+
+    # Undecorated version of write_string().
+    def _write_string(self, row, col, string, cell_format=None):
         str_error = 0
 
         # Check that row and col are valid and store max and min values.
@@ -464,7 +465,7 @@ class Worksheet(xmlwriter.XMLwriter):
             str_error = -2
 
         # Write a shared string or an in-line string in optimisation mode.
-        if self.optimization == 0:
+        if not self.inline_strings:
             string_index = self.str_table._get_shared_string_index(string)
         else:
             string_index = string
@@ -494,14 +495,19 @@ class Worksheet(xmlwriter.XMLwriter):
             -1: Row or column is out of worksheet bounds.
 
         """
-        if self._isnan(number) or self._isinf(number):
+        return self._write_number(row, col, number, cell_format)
+
+    # Undecorated version of write_number().
+    def _write_number(self, row, col, number, cell_format=None):
+        # Check for NaN and Inf in a single test since NaN - NaN is also NaN.
+        if number - number != 0:
             if self.nan_inf_to_errors:
                 if self._isnan(number):
-                    return self.write_formula(row, col, '#NUM!', cell_format,
-                                              '#NUM!')
+                    return self._write_cell_formula(row, col, '#NUM!',
+                                                    cell_format, '#NUM!')
                 elif self._isinf(number):
-                    return self.write_formula(row, col, '1/0', cell_format,
-                                              '#DIV/0!')
+                    return self._write_cell_formula(row, col, '1/0',
+                                                    cell_format, '#DIV/0!')
             else:
                 raise TypeError(
                     "NAN/INF not supported in write_number() "
@@ -537,6 +543,10 @@ class Worksheet(xmlwriter.XMLwriter):
             -1: Row or column is out of worksheet bounds.
 
         """
+        return self._write_blank(row, col, blank, cell_format)
+
+    # Undecorated version of write_blank().
+    def _write_blank(self, row, col, blank, cell_format=None):
         # Don't write a blank cell unless it has a format.
         if cell_format is None:
             return 0
@@ -571,6 +581,12 @@ class Worksheet(xmlwriter.XMLwriter):
             -1: Row or column is out of worksheet bounds.
 
         """
+        return self._write_cell_formula(row, col, formula, cell_format,
+                                        value)
+
+    # Undecorated version of write_formula().
+    def _write_cell_formula(self, row, col, formula, cell_format=None,
+                            value=0):
         # Check that row and col are valid and store max and min values.
         if self._check_dimensions(row, col):
             return -1
@@ -654,7 +670,7 @@ class Worksheet(xmlwriter.XMLwriter):
             for row in range(first_row, last_row + 1):
                 for col in range(first_col, last_col + 1):
                     if row != first_row or col != first_col:
-                        self.write_number(row, col, 0, cell_format)
+                        self._write_number(row, col, 0, cell_format)
 
         return 0
 
@@ -674,6 +690,10 @@ class Worksheet(xmlwriter.XMLwriter):
             -1: Row or column is out of worksheet bounds.
 
         """
+        return self._write_datetime(row, col, date, cell_format)
+
+    # Undecorated version of write_datetime().
+    def _write_datetime(self, row, col, date, cell_format=None):
         # Check that row and col are valid and store max and min values.
         if self._check_dimensions(row, col):
             return -1
@@ -710,6 +730,10 @@ class Worksheet(xmlwriter.XMLwriter):
             -1: Row or column is out of worksheet bounds.
 
         """
+        return self._write_boolean(row, col, boolean, cell_format)
+
+    # Undecorated version of write_boolean().
+    def _write_boolean(self, row, col, boolean, cell_format=None):
         # Check that row and col are valid and store max and min values.
         if self._check_dimensions(row, col):
             return -1
@@ -756,6 +780,11 @@ class Worksheet(xmlwriter.XMLwriter):
             -3: URL longer than Excel limit of 255 characters
             -4: Exceeds Excel limit of 65,530 urls per worksheet
         """
+        return self._write_url(row, col, url, cell_format, string, tip)
+
+    # Undecorated version of write_url().
+    def _write_url(self, row, col, url, cell_format=None,
+                   string=None, tip=None):
         # Default link type such as http://.
         link_type = 1
 
@@ -861,7 +890,7 @@ class Worksheet(xmlwriter.XMLwriter):
             cell_format = self.default_url_format
 
         # Write the hyperlink string.
-        self.write_string(row, col, string, cell_format)
+        self._write_string(row, col, string, cell_format)
 
         # Store the hyperlink data in a separate structure.
         self.hyperlinks[row][col] = {
@@ -972,7 +1001,7 @@ class Worksheet(xmlwriter.XMLwriter):
             return -2
 
         # Write a shared string or an in-line string in optimisation mode.
-        if self.optimization == 0:
+        if not self.inline_strings:
             string_index = self.str_table._get_shared_string_index(string)
         else:
             string_index = string
@@ -1002,7 +1031,7 @@ class Worksheet(xmlwriter.XMLwriter):
 
         """
         for token in data:
-            error = self.write(row, col, token, cell_format)
+            error = self._write(row, col, token, cell_format)
             if error:
                 return error
             col += 1
@@ -1025,13 +1054,183 @@ class Worksheet(xmlwriter.XMLwriter):
 
         """
         for token in data:
-            error = self.write(row, col, token, cell_format)
+            error = self._write(row, col, token, cell_format)
             if error:
                 return error
             row += 1
 
         return 0
 
+    @convert_cell_args
+    def write_block(self, row, col, data, cell_format=None):
+        """
+        Write a 2-D block of data starting from (row, col).
+
+        Args:
+            row:         The first cell row (zero indexed).
+            col:         The first cell column (zero indexed).
+            data:        A sequence of rows, or a buffer object such as an
+                         array.array or a 2-D numeric matrix.
+            cell_format: An optional cell Format object or a list of
+                         per-column Format objects.
+        Returns:
+            0:  Success.
+            -1: Block is out of worksheet bounds.
+            other: Return value of write() method.
+
+        """
+        rows = self._get_block_rows(data)
+        if not rows:
+            return 0
+
+        num_cols = max([len(row_data) for row_data in rows])
+        if not num_cols:
+            return 0
+
+        # Check the block corners once instead of checking every cell.
+        last_row = row + len(rows) - 1
+        last_col = col + num_cols - 1
+        if (self._check_dimensions(row, col, True, True)
+                or self._check_dimensions(last_row, last_col, True, True)):
+            return -1
+        if self.optimization and row < self.previous_row:
+            return -1
+        self._check_dimensions(row, col)
+        self._check_dimensions(last_row, last_col)
+
+        # Expand a single format, or a short format list, to one per column.
+        if isinstance(cell_format, (list, tuple)):
+            formats = list(cell_format[:num_cols])
+            formats.extend([None] * (num_cols - len(formats)))
+        else:
+            formats = [cell_format] * num_cols
+
+        # Cells are stored directly in the compact row arrays.
+        table = self.table
+        format_ids = [table._get_format_id(f) for f in formats]
+
+        # Strings that may be converted to formulas, urls or numbers need
+        # the full write() handling.
+        plain_strings = not (self.strings_to_formulas or
+                             self.strings_to_urls or
+                             self.strings_to_numbers)
+
+        optimization = self.optimization
+        inline_strings = self.inline_strings
+        str_table = self.str_table
+        str_max = self.xls_strmax
+        str_error = 0
+
+        for row_num, row_data in enumerate(rows, row):
+            # Write previous row if in in-line string optimization mode.
+            if optimization and row_num > self.previous_row:
+                self._write_single_row(row_num, len(row_data))
+
+            set_value = table[row_num]._set_value
+            col_num = col
+
+            for token, token_format, format_id in zip(row_data, formats,
+                                                      format_ids):
+                token_type = type(token)
+
+                error = 0
+
+                if token_type is float or token_type is int:
+                    # NaN and Inf don't pass the subtraction test and are
+                    # handled, or rejected, by write_number().
+                    if token - token == 0:
+                        set_value(col_num, CELL_NUMBER, token, format_id)
+                    else:
+                        error = self._write_number(row_num, col_num, token,
+                                                   token_format)
+
+                elif plain_strings and isinstance(token, str_types):
+                    if token == '':
+                        if format_id:
+                            set_value(col_num, CELL_BLANK, 0, format_id)
+                    else:
+                        if len(token) > str_max:
+                            token = token[:str_max]
+                            str_error = -2
+
+                        if not inline_strings:
+                            index = str_table._get_shared_string_index(token)
+                            set_value(col_num, CELL_STRING, index, format_id)
+                        else:
+                            table[row_num][col_num] = cell_string_tuple(
+                                token, token_format)
+
+                elif token is None:
+                    if format_id:
+                        set_value(col_num, CELL_BLANK, 0, format_id)
+
+                elif token_type is bool:
+                    set_value(col_num, CELL_BOOLEAN, int(token), format_id)
+
+                else:
+                    error = self._write(row_num, col_num, token,
+                                        token_format)
+
+                if error == -2:
+                    str_error = error
+                elif error:
+                    return error
+
+                col_num += 1
+
+        return str_error
+
+    @convert_cell_args
+    def write_datetime_column(self, row, col, data, cell_format=None):
+        """
+        Write a column of dates and times starting from (row, col).
+
+        Args:
+            row:         The first cell row (zero indexed).
+            col:         The cell column (zero indexed).
+            data:        A sequence of datetime objects or POSIX timestamps,
+                         or a NumPy datetime64 array.
+            cell_format: An optional cell Format object.
+        Returns:
+            0:  Success.
+            -1: Column is out of worksheet bounds.
+
+        """
+        excel_times = datetimes_to_excel_datetimes(data, self.date_1904)
+        if not excel_times:
+            return 0
+
+        # Check the column ends once instead of checking every cell.
+        last_row = row + len(excel_times) - 1
+        if (self._check_dimensions(row, col, True, True)
+                or self._check_dimensions(last_row, col, True, True)):
+            return -1
+        if self.optimization and row < self.previous_row:
+            return -1
+        self._check_dimensions(row, col)
+        self._check_dimensions(last_row, col)
+
+        # Add the default date format.
+        if cell_format is None:
+            cell_format = self.default_date_format
+
+        table = self.table
+        format_id = table._get_format_id(cell_format)
+        optimization = self.optimization
+
+        for row_num, excel_time in enumerate(excel_times, row):
+            # Write previous row if in in-line string optimization mode.
+            if optimization and row_num > self.previous_row:
+                self._write_single_row(row_num)
+
+            if excel_time is not None:
+                table[row_num]._set_value(col, CELL_NUMBER, excel_time,
+                                          format_id)
+            elif format_id:
+                table[row_num]._set_value(col, CELL_BLANK, 0, format_id)
+
+        return 0
+
     @convert_cell_args
     def insert_image(self, row, col, filename, options={}):
         """
@@ -1310,6 +1509,7 @@ class Worksheet(xmlwriter.XMLwriter):
 
         # Store the column change to allow optimisations.
         self.col_size_changed = True
+        self.col_offsets = None
 
         # Store the col sizes for use when calculating image vertices taking
         # hidden columns into account. Also store the column formats.
@@ -1377,6 +1577,7 @@ class Worksheet(xmlwriter.XMLwriter):
 
         # Store the row change to allow optimisations.
         self.row_size_changed = True
+        self.row_offsets = None
 
         if hidden:
             height = 0
@@ -1402,6 +1603,7 @@ class Worksheet(xmlwriter.XMLwriter):
         if height != self.original_row_height:
             # Store the row change to allow optimisations.
             self.row_size_changed = True
+            self.row_offsets = None
             self.default_row_height = height
 
         if hide_unused_rows:
@@ -1449,14 +1651,46 @@ class Worksheet(xmlwriter.XMLwriter):
         self.merge.append([first_row, first_col, last_row, last_col])
 
         # Write the first cell
-        self.write(first_row, first_col, data, cell_format)
+        self._write(first_row, first_col, data, cell_format)
+
+        # Blank cells don't need to be written without a format.
+        if cell_format is None:
+            return
+
+        if self.unordered_rows:
+            # Buffered rows are written in the order that the cells were
+            # added so the area is padded out with formatted blank cells.
+            for row in range(first_row, last_row + 1):
+                for col in range(first_col, last_col + 1):
+                    if row == first_row and col == first_col:
+                        continue
+                    self._write_blank(row, col, '', cell_format)
+            return
 
-        # Pad out the rest of the area with formatted blank cells.
+        # The rest of the area is stored as a range and padded out with
+        # formatted blank cells as the rows are written.
+        self._check_dimensions(first_row, last_col)
+        self._check_dimensions(last_row, last_col)
+
+        format_id = self.table._get_format_id(cell_format)
+        self.merge_blanks.append((first_row, first_col, last_row, last_col,
+                                  format_id))
+        self.merge_rows = None
+
+        # Cells that already exist in the area are overwritten with blanks.
         for row in range(first_row, last_row + 1):
-            for col in range(first_col, last_col + 1):
-                if row == first_row and col == first_col:
-                    continue
-                self.write_blank(row, col, '', cell_format)
+            # Write previous rows if in in-line string optimization mode.
+            if self.optimization and row > self.previous_row:
+                self._write_single_row(row)
+
+            row_data = self.table.get(row)
+            if not row_data:
+                continue
+
+            for col in row_data.keys():
+                if (first_col <= col <= last_col
+                        and (row, col) != (first_row, first_col)):
+                    self._write_blank(row, col, '', cell_format)
 
     @convert_range_args
     def autofilter(self, first_row, first_col, last_row, last_col):
@@ -1611,6 +1845,9 @@ class Worksheet(xmlwriter.XMLwriter):
         if self._check_dimensions(last_row, last_col, True, True):
             return -1
 
+        # Copy the user defined options so they aren't modified.
+        options = options.copy()
+
         # List of valid input parameters.
         valid_parameters = {
             'validate': 1,
@@ -1808,16 +2045,39 @@ class Worksheet(xmlwriter.XMLwriter):
         if 'show_error' not in options:
             options['show_error'] = 1
 
+        # Swap last row/col for first row/col as necessary
+        if first_row > last_row:
+            first_row, last_row = last_row, first_row
+
+        if first_col > last_col:
+            first_col, last_col = last_col, first_col
+
+        cell_range = [first_row, first_col, last_row, last_col]
+
+        # Add the range to an identical validation on an adjacent range.
+        if 'other_cells' in options:
+            rule_key = None
+        else:
+            rule_key = self._get_rule_key(options, ('value', 'maximum'))
+
+        if self._coalesce_rule(self.validation_rules, self.validation_index,
+                               rule_key, cell_range) is not None:
+            return
+
         # These are the cells to which the validation is applied.
-        options['cells'] = [[first_row, first_col, last_row, last_col]]
+        options['cells'] = [cell_range]
 
         # A (for now) undocumented parameter to pass additional cell ranges.
         if 'other_cells' in options:
             options['cells'].extend(options['other_cells'])
 
         # Store the validation information until we close the worksheet.
+        order = len(self.validations)
         self.validations.append(options)
 
+        self._add_rule(self.validation_rules, self.validation_index,
+                       rule_key, options, order)
+
     @convert_range_args
     def conditional_format(self, first_row, first_col, last_row, last_col,
                            options=None):
@@ -1986,6 +2246,29 @@ class Worksheet(xmlwriter.XMLwriter):
         if first_col > last_col:
             first_col, last_col = last_col, first_col
 
+        # Get the dxf format index.
+        if 'format' in options and options['format']:
+            options['format'] = options['format']._get_dxf_index()
+
+        # Add the range to an identical rule on an adjacent range. Rules with
+        # a user defined range or that depend on all the cells in the range
+        # aren't coalesced.
+        if 'multi_range' in options or options['type'] not in cell_rule_types:
+            rule_key = None
+        else:
+            rule_key = self._get_rule_key(options, ('value', 'minimum',
+                                                    'maximum', 'criteria'))
+
+        cells = [first_row, first_col, last_row, last_col]
+
+        rule = self._coalesce_rule(self.cond_format_rules,
+                                   self.cond_format_index, rule_key, cells)
+
+        if rule is not None:
+            # The range of the rule has changed.
+            rule['sqref'] = None
+            return
+
         # Set the formatting range.
         # If the first and last cell are the same write a single cell.
         if first_row == last_row and first_col == last_col:
@@ -2000,14 +2283,6 @@ class Worksheet(xmlwriter.XMLwriter):
             cell_range = options['multi_range']
             cell_range = cell_range.replace('$', '')
 
-        # Get the dxf format index.
-        if 'format' in options and options['format']:
-            options['format'] = options['format']._get_dxf_index()
-
-        # Set the priority based on the order of adding.
-        options['priority'] = self.dxf_priority
-        self.dxf_priority += 1
-
         # Special handling of text criteria.
         if options['type'] == 'text':
 
@@ -2163,11 +2438,23 @@ class Worksheet(xmlwriter.XMLwriter):
 
             options['bar_color'] = xl_color(options['bar_color'])
 
-        # Store the validation information until we close the worksheet.
-        if cell_range in self.cond_formats:
-            self.cond_formats[cell_range].append(options)
+        # Set the priority based on the order of adding.
+        options['priority'] = self.dxf_priority
+        self.dxf_priority += 1
+
+        # Store the range of the rule and its cell ranges.
+        options['sqref'] = cell_range
+
+        if 'multi_range' in options:
+            options['cells'] = self._get_multi_range_cells(cell_range)
         else:
-            self.cond_formats[cell_range] = [options]
+            options['cells'] = [cells]
+
+        # Store the conditional format until we close the worksheet.
+        self.cond_formats.append(options)
+
+        self._add_rule(self.cond_format_rules, self.cond_format_index,
+                       rule_key, options, options['priority'])
 
     @convert_range_args
     def add_table(self, first_row, first_col, last_row, last_col,
@@ -2387,9 +2674,9 @@ class Worksheet(xmlwriter.XMLwriter):
                     if i < len(data) and j < len(data[i]):
                         token = data[i][j]
                         if j in col_formats:
-                            self.write(row, col, token, col_formats[j])
+                            self._write(row, col, token, col_formats[j])
                         else:
-                            self.write(row, col, token, None)
+                            self._write(row, col, token, None)
                     j += 1
                 i += 1
 
@@ -3308,6 +3595,10 @@ class Worksheet(xmlwriter.XMLwriter):
         self.str_table = init_data['str_table']
         self.worksheet_meta = init_data['worksheet_meta']
         self.optimization = init_data['optimization']
+        self.inline_strings = (self.optimization
+                               and not init_data['shared_strings'])
+        self.unordered_rows = (self.optimization
+                               and init_data['unordered_rows'])
         self.tmpdir = init_data['tmpdir']
         self.date_1904 = init_data['date_1904']
         self.strings_to_numbers = init_data['strings_to_numbers']
@@ -3330,6 +3621,12 @@ class Worksheet(xmlwriter.XMLwriter):
             self.margin_footer = 0.5
             self.header_footer_aligns = False
 
+        # Rows aren't flushed in order with unordered_rows so every write,
+        # including those to the first row, is passed to _write_single_row
+        # to count the buffered cells.
+        if self.unordered_rows:
+            self.previous_row = -1
+
         # Open a temp filehandle to store row data in optimization mode.
         if self.optimization == 1:
             # This is sub-optimal but we need to create a temp file
@@ -3433,6 +3730,73 @@ class Worksheet(xmlwriter.XMLwriter):
         # Close the file.
         self._xml_close()
 
+    def _get_write_handler(self, token):
+        # Get the _write_*() method used by write() for a token. The method
+        # only depends on the token type so it is cached for the type.
+        if token is None:
+            # Write None as a blank cell.
+            handler = self._write_blank
+        elif isinstance(token, bool):
+            handler = self._write_boolean
+        elif supported_datetime(token):
+            handler = self._write_datetime
+        elif isinstance(token, num_types):
+            handler = self._write_number
+        elif isinstance(token, str_types):
+            handler = self._write_token_as_string
+        else:
+            # Other types are converted per token so they aren't cached.
+            return self._write_token_as_other
+
+        self.write_handlers[type(token)] = handler
+
+        return handler
+
+    def _write_token_as_string(self, row, col, *args):
+        # Map a string token to the appropriate _write_*() method.
+        token = args[0]
+
+        if token == '':
+            return self._write_blank(row, col, *args)
+
+        if self.strings_to_formulas and token.startswith('='):
+            return self._write_cell_formula(row, col, *args)
+
+        if self.strings_to_urls and url_prefix.match(token):
+            return self._write_url(row, col, *args)
+
+        if self.strings_to_numbers:
+            try:
+                f = float(token)
+                if (self.nan_inf_to_errors or
+                        (not self._isnan(f) and not self._isinf(f))):
+                    return self._write_number(row, col, f, *args[1:])
+            except ValueError:
+                # Not a number, write as a string.
+                pass
+
+        return self._write_string(row, col, *args)
+
+    def _write_token_as_other(self, row, col, *args):
+        # Write a token of an unsupported type as a number or string.
+        token = args[0]
+
+        # We haven't matched a supported type. Try float.
+        try:
+            f = float(token)
+            return self._write_number(row, col, f, *args[1:])
+        except ValueError:
+            pass
+        except TypeError:
+            raise TypeError("Unsupported type %s in write()" % type(token))
+
+        # Finally try string.
+        try:
+            str(token)
+            return self._write_string(row, col, *args)
+        except ValueError:
+            raise TypeError("Unsupported type %s in write()" % type(token))
+
     def _check_dimensions(self, row, col, ignore_row=False, ignore_col=False):
         # Check that row and col are valid and store the max and min
         # values for use in other methods/elements. The ignore_row /
@@ -3466,6 +3830,27 @@ class Worksheet(xmlwriter.XMLwriter):
 
         return 0
 
+    def _get_block_rows(self, data):
+        # Convert the data passed to write_block() into a sequence of rows.
+        # Lists and tuples are used as is. Buffer objects such as array.array
+        # or numeric matrices are converted to lists in a single call.
+        if isinstance(data, (list, tuple)):
+            return data
+
+        try:
+            view = memoryview(data)
+        except TypeError:
+            return list(data)
+
+        try:
+            if view.ndim == 1:
+                # A 1-D buffer is a single row.
+                return [view.tolist()]
+            return view.tolist()
+        except NotImplementedError:
+            # Buffer formats that memoryview can't convert.
+            return list(data)
+
     def _convert_date_time(self, dt_obj):
         # Convert a datetime object to an Excel serial date and time.
         return datetime_to_excel_datetime(dt_obj, self.date_1904)
@@ -3955,8 +4340,11 @@ class Worksheet(xmlwriter.XMLwriter):
 
         # Calculate the absolute x offset of the top-left vertex.
         if self.col_size_changed:
-            for col_id in range(col_start):
-                x_abs += self._size_col(col_id)
+            if self.col_offsets is None:
+                self.col_offsets = self._get_size_offsets(
+                    self.col_sizes, self._size_col, self.default_col_pixels)
+
+            x_abs += self._get_offset(self.col_offsets, col_start)
         else:
             # Optimisation for when the column widths haven't changed.
             x_abs += self.default_col_pixels * col_start
@@ -3966,8 +4354,12 @@ class Worksheet(xmlwriter.XMLwriter):
         # Calculate the absolute y offset of the top-left vertex.
         # Store the column change to allow optimisations.
         if self.row_size_changed:
-            for row_id in range(row_start):
-                y_abs += self._size_row(row_id)
+            if self.row_offsets is None:
+                self.row_offsets = self._get_size_offsets(
+                    self.row_sizes, self._size_row,
+                    int(4.0 / 3.0 * self.default_row_height))
+
+            y_abs += self._get_offset(self.row_offsets, row_start)
         else:
             # Optimisation for when the row heights haven't changed.
             y_abs += self.default_row_pixels * row_start
@@ -4009,6 +4401,31 @@ class Worksheet(xmlwriter.XMLwriter):
         return ([col_start, row_start, x1, y1, col_end, row_end, x2, y2,
                 x_abs, y_abs])
 
+    def _get_size_offsets(self, sizes, size_func, default_pixels):
+        # Index the rows or columns whose size differs from the default. The
+        # index is their sorted positions and the running total of the pixel
+        # differences so that an offset can be found with a binary search.
+        positions = []
+        totals = [0]
+        total = 0
+
+        for position in sorted(sizes):
+            pixels = size_func(position)
+
+            if pixels != default_pixels:
+                total += pixels - default_pixels
+                positions.append(position)
+                totals.append(total)
+
+        return positions, totals, default_pixels
+
+    def _get_offset(self, offsets, position):
+        # Get the pixel offset of a row or column from a size offset index.
+        positions, totals, default_pixels = offsets
+
+        return (position * default_pixels
+                + totals[bisect_left(positions, position)])
+
     def _size_col(self, col):
         # Convert the width of a cell from user's units to pixels. Excel rounds
         # the column width to the nearest pixel. If the width hasn't been set
@@ -4344,51 +4761,275 @@ class Worksheet(xmlwriter.XMLwriter):
         if self.optimization:
             return ()
 
+        # Column ranges are sliced from the cached data for the column.
+        if col_start == col_end:
+            return self._get_column_range_data(col_start, row_start, row_end)
+
         data = []
 
         # Iterate through the table data.
         for row_num in range(row_start, row_end + 1):
+            row_data = self._get_row_data(row_num)
+
             # Store None if row doesn't exist.
-            if row_num not in self.table:
+            if row_data is None:
                 data.append(None)
                 continue
 
             for col_num in range(col_start, col_end + 1):
 
-                if col_num in self.table[row_num]:
-                    cell = self.table[row_num][col_num]
+                if col_num in row_data:
+                    cell = row_data[col_num]
+                    value = self._get_chart_value(cell)
 
-                    if type(cell).__name__ == 'Number':
-                        # Return a number with Excel's precision.
-                        data.append("%.15g" % cell.number)
+                    if value is not chart_value_skipped:
+                        data.append(value)
+                else:
 
-                    elif type(cell).__name__ == 'String':
-                        # Return a string from it's shared string index.
-                        index = cell.string
-                        string = self.str_table._get_shared_string(index)
+                    # Store None if column doesn't exist.
+                    data.append(None)
 
-                        data.append(string)
+        return data
 
-                    elif (type(cell).__name__ == 'Formula'
-                            or type(cell).__name__ == 'ArrayFormula'):
-                        # Return the formula value.
-                        value = cell.value
+    def _get_column_range_data(self, col, row_start, row_end):
+        # Returns the chart data for a range of rows in a column. This is the
+        # same as _get_range_data() but uses the cached column data.
+        if row_end < row_start:
+            return []
 
-                        if value is None:
-                            value = 0
+        rows, values, has_skipped = self._get_column_data(col)
 
-                        data.append(value)
+        first = bisect_left(rows, row_start)
+        last = bisect_right(rows, row_end)
 
-                    elif type(cell).__name__ == 'Blank':
-                        # Return a empty cell.
-                        data.append('')
-                else:
+        if first == last:
+            return [None] * (row_end - row_start + 1)
 
-                    # Store None if column doesn't exist.
-                    data.append(None)
+        if rows[last - 1] - rows[first] == last - first - 1:
+            # The rows with data are contiguous so the values can be sliced.
+            data = ([None] * (rows[first] - row_start)
+                    + values[first:last]
+                    + [None] * (row_end - rows[last - 1]))
+        else:
+            data = [None] * (row_end - row_start + 1)
+
+            for index in range(first, last):
+                data[rows[index] - row_start] = values[index]
+
+        if has_skipped:
+            data = [value for value in data
+                    if value is not chart_value_skipped]
 
         return data
 
+    def _get_column_data(self, col):
+        # Get the chart data values of a column. The column is read from the
+        # table once as the sorted rows that have a cell in the column and
+        # their values. It is then sliced for each chart range in the column.
+        column_data = self.chart_column_data.get(col)
+
+        if column_data is None:
+            rows = array('L')
+            values = []
+            has_skipped = False
+
+            row_nums = set(self.table)
+            row_nums.update(self._get_merge_rows())
+
+            for row_num in sorted(row_nums):
+                cell = self._get_row_data(row_num).get(col)
+
+                if cell is None:
+                    continue
+
+                value = self._get_chart_value(cell)
+
+                if value is chart_value_skipped:
+                    has_skipped = True
+
+                rows.append(row_num)
+                values.append(value)
+
+            column_data = (rows, values, has_skipped)
+            self.chart_column_data[col] = column_data
+
+        return column_data
+
+    def _get_chart_value(self, cell):
+        # Get the value of a cell for chart cached data.
+        cell_type = type(cell)
+
+        if cell_type is cell_number_tuple:
+            # Return a number with Excel's precision.
+            return "%.15g" % cell.number
+
+        elif cell_type is cell_string_tuple:
+            # Return a string from it's shared string index.
+            return self.str_table._get_shared_string(cell.string)
+
+        elif (cell_type is cell_formula_tuple
+                or cell_type is cell_arformula_tuple):
+            # Return the formula value.
+            value = cell.value
+
+            if value is None:
+                value = 0
+
+            return value
+
+        elif cell_type is cell_blank_tuple:
+            # Return a empty cell.
+            return ''
+
+        # Other cell types aren't included in the chart data.
+        return chart_value_skipped
+
+    def _get_rule_key(self, options, formula_keys):
+        # Get a key for the options of a conditional format or data
+        # validation that is the same for identical rules. Formulas with
+        # relative cell references depend on the position of the range of
+        # the rule so rules with them, or with unhashable options, return
+        # None and aren't coalesced.
+        for formula_key in formula_keys:
+            formula = options.get(formula_key)
+
+            if (isinstance(formula, str_types)
+                    and rule_relative_ref.search(formula)):
+                formula = rule_quoted_string.sub('', formula)
+                formula = rule_absolute_ref.sub('', formula)
+
+                if rule_relative_ref.search(formula):
+                    return None
+
+        rule_key = tuple(sorted(options.items()))
+
+        try:
+            hash(rule_key)
+        except TypeError:
+            # Use tuples for list values such as validation list sources.
+            rule_key = tuple([(key, tuple(value))
+                              if isinstance(value, list) else (key, value)
+                              for key, value in rule_key])
+            try:
+                hash(rule_key)
+            except TypeError:
+                return None
+
+        return rule_key
+
+    def _add_rule(self, rules, rule_index, rule_key, options, order):
+        # Add the ranges of a new conditional format or data validation to
+        # the range index. Rules with a key are stored so that identical
+        # rules can be coalesced with them. The index is only checked for
+        # rules added after a stored rule so until there is one the ranges
+        # don't need to be indexed.
+        if rules:
+            for row_first, col_first, row_last, col_last in options['cells']:
+                rule_index._add((min(row_first, row_last),
+                                 min(col_first, col_last),
+                                 max(row_first, row_last),
+                                 max(col_first, col_last)), order)
+
+        if rule_key is not None:
+            rules[rule_key] = (options, order)
+
+    def _coalesce_rule(self, rules, rule_index, rule_key, cell_range):
+        # Add a cell range to the last rule with the same key if the range
+        # overlaps or is adjacent to the ranges of the rule. The range isn't
+        # added if it intersects any rule added after that rule since that
+        # would change the order that the rules apply to the cells. Returns
+        # the options of the rule or None if the range wasn't added.
+        if rule_key not in rules:
+            return None
+
+        options, order = rules[rule_key]
+
+        if rule_index._intersects(cell_range, order):
+            return None
+
+        if not self._add_rule_range(options['cells'], cell_range):
+            return None
+
+        rule_index._add(cell_range, order)
+
+        return options
+
+    def _add_rule_range(self, ranges, cell_range):
+        # Add a cell range to a list of ranges if it overlaps or is adjacent
+        # to the last range in the list. Ranges with the same rows or columns
+        # are joined into a single range. Other adjacent ranges are added to
+        # the list but overlapping ranges aren't since the ranges of a rule
+        # shouldn't overlap.
+        first_row, first_col, last_row, last_col = cell_range
+        row_min, col_min, row_max, col_max = ranges[-1]
+
+        rows_overlap = first_row <= row_max and last_row >= row_min
+        cols_overlap = first_col <= col_max and last_col >= col_min
+        rows_touch = first_row <= row_max + 1 and last_row >= row_min - 1
+        cols_touch = first_col <= col_max + 1 and last_col >= col_min - 1
+
+        if not (rows_overlap and cols_touch or cols_overlap and rows_touch):
+            return False
+
+        if first_col == col_min and last_col == col_max:
+            ranges[-1] = [min(first_row, row_min), col_min,
+                          max(last_row, row_max), col_max]
+        elif first_row == row_min and last_row == row_max:
+            ranges[-1] = [row_min, min(first_col, col_min),
+                          row_max, max(last_col, col_max)]
+        elif not (rows_overlap and cols_overlap):
+            ranges.append([first_row, first_col, last_row, last_col])
+        elif not (first_row >= row_min and last_row <= row_max and
+                  first_col >= col_min and last_col <= col_max):
+            return False
+
+        return True
+
+    def _get_multi_range_cells(self, multi_range):
+        # Get the cell ranges of a conditional format 'multi_range'. If the
+        # ranges can't be read then the rule is treated as covering the
+        # whole worksheet.
+        cells = []
+
+        for part in multi_range.split():
+            if not multi_range_part.match(part):
+                return [[0, 0, self.xls_rowmax - 1, self.xls_colmax - 1]]
+
+            first_cell, _, last_cell = part.partition(':')
+            first_row, first_col = xl_cell_to_rowcol(first_cell)
+            last_row, last_col = xl_cell_to_rowcol(last_cell or first_cell)
+
+            cells.append([min(first_row, last_row), min(first_col, last_col),
+                          max(first_row, last_row), max(first_col, last_col)])
+
+        return cells
+
+    def _get_sqref(self, cells):
+        # Get the space separated cell ranges of a conditional format or
+        # data validation.
+        sqref = ''
+
+        for (row_first, col_first, row_last, col_last) in cells:
+
+            # Add a space between multiple cell ranges.
+            if sqref != '':
+                sqref += ' '
+
+            # Swap last row/col for first row/col as necessary
+            if row_first > row_last:
+                (row_first, row_last) = (row_last, row_first)
+
+            if col_first > col_last:
+                (col_first, col_last) = (col_last, col_first)
+
+            # If the first and last cell are the same write a single cell.
+            if (row_first == row_last) and (col_first == col_last):
+                sqref += xl_rowcol_to_cell(row_first, col_first)
+            else:
+                sqref += xl_range(row_first, col_first, row_last, col_last)
+
+        return sqref
+
     def _csv_join(self, *items):
         # Create a csv string for use with data validation formulas and lists.
 
@@ -4743,15 +5384,19 @@ class Worksheet(xmlwriter.XMLwriter):
         else:
             self._xml_start_tag('sheetData')
 
-            # Rewind the filehandle that was used for temp row data.
-            buff_size = 65536
-            self.row_data_fh.seek(0)
-            data = self.row_data_fh.read(buff_size)
-
-            while data:
-                self.fh.write(data)
+            if self.unordered_rows:
+                # Merge the spilled and buffered rows in row order.
+                self._write_merged_rows()
+            else:
+                # Rewind the filehandle that was used for temp row data.
+                buff_size = 65536
+                self.row_data_fh.seek(0)
                 data = self.row_data_fh.read(buff_size)
 
+                while data:
+                    self.fh.write(data)
+                    data = self.row_data_fh.read(buff_size)
+
             self.row_data_fh.close()
             os.unlink(self.row_data_filename)
 
@@ -4893,71 +5538,81 @@ class Worksheet(xmlwriter.XMLwriter):
         # Write out the worksheet data as a series of rows and cells.
         self._calculate_spans()
 
-        for row_num in range(self.dim_rowmin, self.dim_rowmax + 1):
+        # Only process rows with formatting, cell data and/or comments.
+        for row_num in self._get_used_rows():
 
-            if (row_num in self.set_rows or row_num in self.comments
-                    or self.table[row_num]):
-                # Only process rows with formatting, cell data and/or comments.
+            span_index = int(row_num / 16)
 
-                span_index = int(row_num / 16)
+            if span_index in self.row_spans:
+                span = self.row_spans[span_index]
+            else:
+                span = None
 
-                if span_index in self.row_spans:
-                    span = self.row_spans[span_index]
-                else:
-                    span = None
+            row_data = self._get_row_data(row_num)
 
-                if self.table[row_num]:
-                    # Write the cells if the row contains data.
-                    if row_num not in self.set_rows:
-                        self._write_row(row_num, span)
-                    else:
-                        self._write_row(row_num, span, self.set_rows[row_num])
+            if row_data:
+                # Write the cells if the row contains data.
+                if row_num not in self.set_rows:
+                    self._write_row(row_num, span)
+                else:
+                    self._write_row(row_num, span, self.set_rows[row_num])
 
-                    for col_num in range(self.dim_colmin, self.dim_colmax + 1):
-                        if col_num in self.table[row_num]:
-                            col_ref = self.table[row_num][col_num]
-                            self._write_cell(row_num, col_num, col_ref)
+                self._write_row_cells(row_num, row_data)
 
-                    self._xml_end_tag('row')
+                self._xml_end_tag('row')
 
-                elif row_num in self.comments:
-                    # Row with comments in cells.
-                    self._write_empty_row(row_num, span,
-                                          self.set_rows[row_num])
-                else:
-                    # Blank row with attributes only.
-                    self._write_empty_row(row_num, span,
-                                          self.set_rows[row_num])
+            elif row_num in self.comments:
+                # Row with comments in cells.
+                self._write_empty_row(row_num, span,
+                                      self.set_rows[row_num])
+            else:
+                # Blank row with attributes only.
+                self._write_empty_row(row_num, span,
+                                      self.set_rows[row_num])
 
-    def _write_single_row(self, current_row_num=0):
+    def _write_single_row(self, current_row_num=0, num_cells=1):
         # Write out the worksheet data as a single row with cells.
         # This method is used when memory optimisation is on. A single
         # row is written and the data table is reset. That way only
         # one row of data is kept in memory at any one time. We don't
         # write span data in the optimised case since it is optional.
 
+        # With unordered rows the rows are buffered and spilled to disk
+        # instead, and merged when the file is assembled. The number of
+        # cells about to be written is used to bound the buffered cells.
+        if self.unordered_rows:
+            self._check_spill_rows(num_cells)
+            return
+
         # Set the new previous row as the current row.
         row_num = self.previous_row
         self.previous_row = current_row_num
 
-        if (row_num in self.set_rows or row_num in self.comments
-                or self.table[row_num]):
+        if self.merge_blanks:
+            # Pad out the row with the blank cells of the merged ranges in
+            # it and drop the ranges that end at the row.
+            merges = [merge for merge in self.merge_blanks
+                      if merge[0] <= row_num <= merge[2]]
+            row_data = self._get_row_data(row_num, merges)
+            self.merge_blanks = [merge for merge in self.merge_blanks
+                                 if merge[2] > row_num]
+        else:
+            row_data = self.table.get(row_num)
+
+        if row_num in self.set_rows or row_num in self.comments or row_data:
             # Only process rows with formatting, cell data and/or comments.
 
             # No span data in optimised mode.
             span = None
 
-            if self.table[row_num]:
+            if row_data:
                 # Write the cells if the row contains data.
                 if row_num not in self.set_rows:
                     self._write_row(row_num, span)
                 else:
                     self._write_row(row_num, span, self.set_rows[row_num])
 
-                for col_num in range(self.dim_colmin, self.dim_colmax + 1):
-                    if col_num in self.table[row_num]:
-                        col_ref = self.table[row_num][col_num]
-                        self._write_cell(row_num, col_num, col_ref)
+                self._write_row_cells(row_num, row_data)
 
                 self._xml_end_tag('row')
             else:
@@ -4967,52 +5622,278 @@ class Worksheet(xmlwriter.XMLwriter):
         # Reset table.
         self.table.clear()
 
+    def _check_spill_rows(self, num_cells=1):
+        # Spill the buffered rows to disk, in unordered_rows mode, if adding
+        # the cells would take the number of buffered cells over the limit.
+        # Overwritten cells are counted again so the count is an upper bound.
+        if (self.spill_cell_count
+                and self.spill_cell_count + num_cells > self.spill_cell_limit):
+            self._spill_rows()
+
+        self.spill_cell_count += num_cells
+
+    def _spill_rows(self):
+        # Write the buffered rows, in row order, to a temp file as a sorted
+        # run of row records and reset the table. The runs are merged by
+        # _write_merged_rows().
+        (fd, filename) = tempfile.mkstemp(dir=self.tmpdir)
+        spill_fh = os.fdopen(fd, 'wb')
+
+        for row_record in self._get_row_records():
+            marshal.dump(row_record, spill_fh)
+
+        spill_fh.close()
+
+        self.spill_filenames.append(filename)
+        self.spill_cell_count = 0
+        self.table.clear()
+
+    def _get_row_records(self):
+        # Generate (row, cols, xml) records, in row order, with the column
+        # numbers and the <c> elements of the cells of each buffered row.
+        fh = self.fh
+        self.fh = StringIO()
+
+        try:
+            for row_num in sorted(self.table.keys()):
+                row_data = self.table[row_num]
+                if not row_data:
+                    continue
+
+                self._write_row_cells(row_num, row_data)
+                cells_xml = self.fh.getvalue()
+                self.fh.seek(0)
+                self.fh.truncate()
+
+                yield row_num, row_data.cols.tolist(), cells_xml
+        finally:
+            self.fh = fh
+
+    def _read_spill_file(self, filename):
+        # Read back the row records from a spill file.
+        spill_fh = open(filename, 'rb')
+
+        try:
+            while True:
+                try:
+                    yield marshal.load(spill_fh)
+                except EOFError:
+                    break
+        finally:
+            spill_fh.close()
+            os.unlink(filename)
+
+    def _tag_spill_run(self, run, run_num):
+        # Add the run number to the row records of a spill run.
+        for row_num, cols, cells_xml in run:
+            yield row_num, run_num, cols, cells_xml
+
+    def _write_merged_rows(self):
+        # Write the rows in unordered_rows mode by merging the spilled runs
+        # and the rows still in memory in row order. A row may be split
+        # across several runs in which case the cells are combined and later
+        # writes to the same cell take precedence.
+        runs = [self._read_spill_file(filename)
+                for filename in self.spill_filenames]
+        runs.append(list(self._get_row_records()))
+
+        self.spill_filenames = []
+
+        # Rows with formatting or comments but no cell data.
+        attribute_rows = set(self.set_rows)
+        attribute_rows.update(self.comments)
+        runs.append([(row_num, [], '')
+                     for row_num in sorted(attribute_rows)
+                     if self.dim_rowmin <= row_num <= self.dim_rowmax])
+
+        # Tag the records with the run number to order the runs for each row.
+        tagged_runs = [self._tag_spill_run(run, run_num)
+                       for run_num, run in enumerate(runs)]
+
+        for row_num, records in groupby(heapq.merge(*tagged_runs),
+                                        key=lambda record: record[0]):
+            records = [record for record in records if record[2]]
+
+            if not records:
+                # Row attributes or comments only.
+                self._write_empty_row(row_num, None, self.set_rows[row_num])
+                continue
+
+            self._write_row(row_num, None, self.set_rows.get(row_num))
+
+            if len(records) == 1:
+                self.fh.write(records[0][3])
+            else:
+                # Split the rows into cells. The "<c r=" text can't occur in
+                # the escaped cell data so the split is safe.
+                cells = {}
+
+                for _, _, cols, cells_xml in records:
+                    fragments = cells_xml.split('<c r="')[1:]
+                    cells.update(zip(cols, fragments))
+
+                for col in sorted(cells):
+                    self.fh.write('<c r="' + cells[col])
+
+            self._xml_end_tag('row')
+
+        self.table.clear()
+
+    def _get_used_rows(self):
+        # Get the row numbers, in order, of the rows within the worksheet
+        # dimensions that have cell data, formatting or comments. Only the
+        # used rows are visited so sparse worksheets are written quickly.
+        row_nums = set(self.set_rows)
+        row_nums.update(self.comments)
+        row_nums.update([row_num for row_num, row_data in self.table.items()
+                         if row_data])
+        row_nums.update(self._get_merge_rows())
+
+        return sorted([row_num for row_num in row_nums
+                       if self.dim_rowmin <= row_num <= self.dim_rowmax])
+
+    def _get_merge_rows(self):
+        # Get a dict of the merged ranges, with formatted blank cells, in
+        # each row. The dict is reset when a range is merged.
+        if self.merge_rows is None:
+            merge_rows = {}
+
+            for merge in self.merge_blanks:
+                first_row, first_col, last_row, last_col, _ = merge
+
+                # A single column range has no blank cells in the first row.
+                if first_col == last_col:
+                    first_row += 1
+
+                for row_num in range(first_row, last_row + 1):
+                    if row_num in merge_rows:
+                        merge_rows[row_num].append(merge)
+                    else:
+                        merge_rows[row_num] = [merge]
+
+            self.merge_rows = merge_rows
+
+        return self.merge_rows
+
+    def _get_row_data(self, row_num, merges=None):
+        # Get the cells of a row. Merged ranges are stored as a range and
+        # not as cells so the row is padded out with their blank cells. Later
+        # ranges take precedence where the ranges overlap.
+        if merges is None and self.merge_blanks:
+            merges = self._get_merge_rows().get(row_num)
+
+        if not merges:
+            return self.table.get(row_num)
+
+        blanks = {}
+
+        for first_row, first_col, _, last_col, format_id in merges:
+            # The first cell of the range holds the data.
+            if row_num == first_row:
+                first_col += 1
+
+            for col in range(first_col, last_col + 1):
+                blanks[col] = format_id
+
+        return self.table._get_filled_row(row_num, blanks)
+
+    def _prepare_xf_indices(self):
+        # Assign the XF indices of the formats used in the worksheet in the
+        # same order as _assemble_xml_file() would. Format indices are
+        # normally assigned as the XML is written so this allows the
+        # worksheet XML to be written in another process.
+        for col in sorted(self.colinfo.keys()):
+            cell_format = self.colinfo[col][3]
+            if cell_format:
+                cell_format._get_xf_index()
+
+        if self.dim_rowmin is None:
+            return
+
+        col_formats = self.col_formats
+        table_formats = self.table.formats
+
+        for row_num in self._get_used_rows():
+            row_xf = None
+            properties = self.set_rows.get(row_num)
+            if properties and properties[1]:
+                row_xf = properties[1]._get_xf_index()
+
+            row_data = self._get_row_data(row_num)
+            if not row_data:
+                continue
+
+            # Skip rows without any cell, row or column formats.
+            if (not col_formats and not row_data.others
+                    and not max(row_data.formats)):
+                continue
+
+            for index, col in enumerate(row_data.cols):
+                format_id = row_data.formats[index]
+
+                if row_data.types[index] == CELL_OTHER:
+                    cell_format = row_data.others[col].format
+                else:
+                    cell_format = table_formats[format_id]
+
+                if cell_format:
+                    cell_format._get_xf_index()
+                elif row_xf is None and col in col_formats:
+                    col_formats[col]._get_xf_index()
+
     def _calculate_spans(self):
         # Calculate the "spans" attribute of the <row> tag. This is an
         # XLSX optimisation and isn't strictly required. However, it
         # makes comparing files easier. The span is the same for each
         # block of 16 rows.
-        spans = {}
-        span_min = None
-        span_max = None
-
-        for row_num in range(self.dim_rowmin, self.dim_rowmax + 1):
-
-            if row_num in self.table:
-                # Calculate spans for cell data.
-                for col_num in range(self.dim_colmin, self.dim_colmax + 1):
-                    if col_num in self.table[row_num]:
-                        if span_min is None:
-                            span_min = col_num
-                            span_max = col_num
-                        else:
-                            if col_num < span_min:
-                                span_min = col_num
-                            if col_num > span_max:
-                                span_max = col_num
-
-            if row_num in self.comments:
-                # Calculate spans for comments.
-                for col_num in range(self.dim_colmin, self.dim_colmax + 1):
-                    if (row_num in self.comments
-                            and col_num in self.comments[row_num]):
-                        if span_min is None:
-                            span_min = col_num
-                            span_max = col_num
-                        else:
-                            if col_num < span_min:
-                                span_min = col_num
-                            if col_num > span_max:
-                                span_max = col_num
+        #
+        # The cells in each row are stored in column order so the first
+        # and last cells give the row span without scanning the columns.
+        span_cols = {}
+
+        def update_span(row_num, col_min, col_max):
+            span_index = int(row_num / 16)
+
+            if span_index not in span_cols:
+                span_cols[span_index] = [col_min, col_max]
+            else:
+                span = span_cols[span_index]
+                if col_min < span[0]:
+                    span[0] = col_min
+                if col_max > span[1]:
+                    span[1] = col_max
+
+        for row_num, row_data in self.table.items():
+            # Calculate spans for cell data.
+            if row_data and self.dim_rowmin <= row_num <= self.dim_rowmax:
+                update_span(row_num, row_data.cols[0], row_data.cols[-1])
+
+        for row_num, merges in self._get_merge_rows().items():
+            # Calculate spans for the blank cells of merged ranges.
+            if not self.dim_rowmin <= row_num <= self.dim_rowmax:
+                continue
+
+            for first_row, first_col, _, last_col, _ in merges:
+                if row_num == first_row:
+                    first_col += 1
 
-            if ((row_num + 1) % 16 == 0) or row_num == self.dim_rowmax:
-                span_index = int(row_num / 16)
+                if first_col <= last_col:
+                    update_span(row_num, first_col, last_col)
+
+        for row_num, comments in self.comments.items():
+            # Calculate spans for comments.
+            if not self.dim_rowmin <= row_num <= self.dim_rowmax:
+                continue
 
-                if span_min is not None:
-                    span_min += 1
-                    span_max += 1
-                    spans[span_index] = "%s:%s" % (span_min, span_max)
-                    span_min = None
+            col_nums = [col_num for col_num in comments
+                        if self.dim_colmin <= col_num <= self.dim_colmax]
+
+            if col_nums:
+                update_span(row_num, min(col_nums), max(col_nums))
+
+        spans = {}
+        for span_index, span in span_cols.items():
+            spans[span_index] = "%s:%s" % (span[0] + 1, span[1] + 1)
 
         self.row_spans = spans
 
@@ -5063,63 +5944,150 @@ class Worksheet(xmlwriter.XMLwriter):
         # Write and empty <row> element.
         self._write_row(row, spans, properties, empty_row=True)
 
+    def _write_row_cells(self, row, row_data):
+        # Write the <cell> elements of a row. Number, shared string and blank
+        # cells are formatted straight from the compact row arrays using the
+        # precompiled templates and written in a single block. Other cell
+        # types are written by _write_cell().
+        row_str = str(row + 1)
+        col_names = self.col_names
+        col_formats = self.col_formats
+        table_formats = self.table.formats
+        types = row_data.types
+        values = row_data.values
+        format_ids = row_data.formats
+        inline_strings = self.inline_strings
+
+        # A row format applies to any cell without a format of its own.
+        row_xf = None
+        properties = self.set_rows.get(row)
+        if properties and properties[1]:
+            row_xf = properties[1]._get_xf_index()
+
+        number_template = cell_templates['n', False]
+        number_style_template = cell_templates['n', True]
+        string_template = cell_templates['s', False]
+        string_style_template = cell_templates['s', True]
+        blank_template = cell_templates['b', False]
+        blank_style_template = cell_templates['b', True]
+
+        fragments = []
+
+        for index, col in enumerate(row_data.cols):
+            type_code = types[index]
+
+            if not (type_code == CELL_NUMBER or type_code == CELL_BLANK or
+                    (type_code == CELL_STRING and not inline_strings)):
+                if fragments:
+                    self.fh.write(''.join(fragments))
+                    fragments = []
+                self._write_cell(row, col, row_data._get_cell(index))
+                continue
+
+            col_name = col_names.get(col)
+            if col_name is None:
+                col_name = xl_col_to_name(col)
+                col_names[col] = col_name
+
+            format_id = format_ids[index]
+            if format_id:
+                xf_index = table_formats[format_id]._get_xf_index()
+            elif row_xf is not None:
+                xf_index = row_xf
+            elif col in col_formats:
+                xf_index = col_formats[col]._get_xf_index()
+            else:
+                xf_index = None
+
+            if type_code == CELL_NUMBER:
+                if xf_index is None:
+                    fragments.append(number_template %
+                                     (col_name + row_str, values[index]))
+                else:
+                    fragments.append(number_style_template %
+                                     (col_name + row_str, xf_index,
+                                      values[index]))
+            elif type_code == CELL_BLANK:
+                if xf_index is None:
+                    fragments.append(blank_template % (col_name + row_str))
+                else:
+                    fragments.append(blank_style_template %
+                                     (col_name + row_str, xf_index))
+            else:
+                if xf_index is None:
+                    fragments.append(string_template %
+                                     (col_name + row_str, values[index]))
+                else:
+                    fragments.append(string_style_template %
+                                     (col_name + row_str, xf_index,
+                                      values[index]))
+
+        if fragments:
+            self.fh.write(''.join(fragments))
+
     def _write_cell(self, row, col, cell):
         # Write the <cell> element.
         # Note. This is the innermost loop so efficiency is important.
-
-        error_codes = ['#DIV/0!', '#N/A', '#NAME?', '#NULL!',
-                       '#NUM!', '#REF!', '#VALUE!']
-
         cell_range = xl_rowcol_to_cell_fast(row, col)
-
-        attributes = [('r', cell_range)]
+        cell_type = type(cell).__name__
+        xf_index = None
 
         if cell.format:
             # Add the cell format index.
             xf_index = cell.format._get_xf_index()
-            attributes.append(('s', xf_index))
         elif row in self.set_rows and self.set_rows[row][1]:
             # Add the row format.
             row_xf = self.set_rows[row][1]
-            attributes.append(('s', row_xf._get_xf_index()))
+            xf_index = row_xf._get_xf_index()
         elif col in self.col_formats:
             # Add the column format.
             col_xf = self.col_formats[col]
-            attributes.append(('s', col_xf._get_xf_index()))
+            xf_index = col_xf._get_xf_index()
 
-        # Write the various cell types.
-        if type(cell).__name__ == 'Number':
-            # Write a number.
-            self._xml_number_element(cell.number, attributes)
+        # Write numbers and shared strings with the precompiled templates.
+        if cell_type == 'Number':
+            self._xml_cell('n', cell_range, cell.number, xf_index)
+            return
 
-        elif type(cell).__name__ == 'String':
-            # Write a string.
-            string = cell.string
+        if cell_type == 'String' and not self.inline_strings:
+            self._xml_cell('s', cell_range, cell.string, xf_index)
+            return
 
-            if not self.optimization:
-                # Write a shared string.
-                self._xml_string_element(string, attributes)
-            else:
-                # Write an optimised in-line string.
+        attributes = [('r', cell_range)]
+
+        if xf_index is not None:
+            attributes.append(('s', xf_index))
 
+        # Write the various cell types.
+        if cell_type == 'String':
+            # Write an optimised in-line string. The <is> element text is
+            # cached since labels are often repeated.
+            string = cell.string
+            inline_xml = self.inline_string_cache.get(string)
+
+            if inline_xml is None:
                 # Escape control characters. See SharedString.pm for details.
-                string = re.sub('(_x[0-9a-fA-F]{4}_)', r'_x005F\1', string)
-                string = re.sub(r'([\x00-\x08\x0B-\x1F])',
-                                lambda match: "_x%04X_" %
-                                ord(match.group(1)), string)
-
-                # Write any rich strings without further tags.
-                if re.search('^<r>', string) and re.search('</r>$', string):
-                    self._xml_rich_inline_string(string, attributes)
-                else:
-                    # Add attribute to preserve leading or trailing whitespace.
-                    preserve = 0
-                    if re.search('^\s', string) or re.search('\s$', string):
-                        preserve = 1
+                inline_xml, is_rich, preserve = self._escape_string(string)
+
+                # Rich strings are written without further tags. Otherwise
+                # add an attribute to preserve leading or trailing whitespace.
+                if not is_rich:
+                    if preserve:
+                        inline_xml = ('<t xml:space="preserve">%s</t>'
+                                      % inline_xml)
+                    else:
+                        inline_xml = '<t>%s</t>' % inline_xml
+
+                if len(self.inline_string_cache) >= 10000:
+                    self.inline_string_cache.clear()
+                self.inline_string_cache[string] = inline_xml
 
-                    self._xml_inline_string(string, preserve, attributes)
+            self._xml_rich_inline_string(inline_xml, attributes)
+
+        elif cell_type == 'Formula':
+            error_codes = ['#DIV/0!', '#N/A', '#NAME?', '#NULL!',
+                           '#NUM!', '#REF!', '#VALUE!']
 
-        elif type(cell).__name__ == 'Formula':
             # Write a formula. First check the formula value type.
             value = cell.value
             if type(cell.value) == bool:
@@ -5137,7 +6105,7 @@ class Worksheet(xmlwriter.XMLwriter):
 
             self._xml_formula_element(cell.formula, value, attributes)
 
-        elif type(cell).__name__ == 'ArrayFormula':
+        elif cell_type == 'ArrayFormula':
             # Write a array formula.
 
             # First check if the formula value is a string.
@@ -5152,11 +6120,11 @@ class Worksheet(xmlwriter.XMLwriter):
             self._write_cell_value(cell.value)
             self._xml_end_tag('c')
 
-        elif type(cell).__name__ == 'Blank':
+        elif cell_type == 'Blank':
             # Write a empty cell.
             self._xml_empty_tag('c', attributes)
 
-        elif type(cell).__name__ == 'Boolean':
+        elif cell_type == 'Boolean':
             # Write a boolean cell.
             attributes.append(('t', 'b'))
             self._xml_start_tag('c', attributes)
@@ -5663,30 +6631,10 @@ class Worksheet(xmlwriter.XMLwriter):
 
     def _write_data_validation(self, options):
         # Write the <dataValidation> element.
-        sqref = ''
         attributes = []
 
         # Set the cell range(s) for the data validation.
-        for cells in options['cells']:
-
-            # Add a space between multiple cell ranges.
-            if sqref != '':
-                sqref += ' '
-
-            (row_first, col_first, row_last, col_last) = cells
-
-            # Swap last row/col for first row/col as necessary
-            if row_first > row_last:
-                (row_first, row_last) = (row_last, row_first)
-
-            if col_first > col_last:
-                (col_first, col_last) = (col_last, col_first)
-
-            # If the first and last cell are the same write a single cell.
-            if (row_first == row_last) and (col_first == col_last):
-                sqref += xl_rowcol_to_cell(row_first, col_first)
-            else:
-                sqref += xl_range(row_first, col_first, row_last, col_last)
+        sqref = self._get_sqref(options['cells'])
 
         attributes.append(('type', options['validate']))
 
@@ -5768,14 +6716,27 @@ class Worksheet(xmlwriter.XMLwriter):
 
     def _write_conditional_formats(self):
         # Write the Worksheet conditional formats.
-        ranges = sorted(self.cond_formats.keys())
-
-        if not ranges:
+        if not self.cond_formats:
             return
 
-        for cond_range in ranges:
+        # Group the rules, in priority order, by their range.
+        cond_formats = {}
+
+        for options in self.cond_formats:
+            cond_range = options['sqref']
+
+            # Get the range of a rule that has been coalesced.
+            if cond_range is None:
+                cond_range = self._get_sqref(options['cells'])
+
+            if cond_range in cond_formats:
+                cond_formats[cond_range].append(options)
+            else:
+                cond_formats[cond_range] = [options]
+
+        for cond_range in sorted(cond_formats.keys()):
             self._write_conditional_formatting(cond_range,
-                                               self.cond_formats[cond_range])
+                                               cond_formats[cond_range])
 
     def _write_conditional_formatting(self, cond_range, params):
         # Write the <conditionalFormatting> element.
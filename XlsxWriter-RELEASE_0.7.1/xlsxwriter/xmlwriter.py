@@ -9,10 +9,57 @@
 
 # Standard packages.
 import re
+import io
+import sys
 import codecs
 
 # Standard packages in Python 2/3 compatibility mode.
 from .compatibility import StringIO
+from .compatibility import str_types
+
+# Buffer size for the XML files written to disk.
+XML_BUFFER_SIZE = 1024 * 1024
+
+# Precompiled templates for the common <c> cell elements in the worksheet
+# inner loop. They are keyed by the cell type, 'n' for numbers, 's' for
+# shared strings and 'b' for blanks, and by whether the cell has a style
+# index.
+cell_templates = {
+    ('n', False): '<c r="%s"><v>%.15g</v></c>',
+    ('n', True): '<c r="%s" s="%s"><v>%.15g</v></c>',
+    ('s', False): '<c r="%s" t="s"><v>%d</v></c>',
+    ('s', True): '<c r="%s" s="%s" t="s"><v>%d</v></c>',
+    ('b', False): '<c r="%s"/>',
+    ('b', True): '<c r="%s" s="%s"/>',
+}
+
+
+# Characters in shared and in-line string data that need escaping. Excel
+# writes control characters as _xHHHH_ and escapes any literal text of that
+# form by encoding the leading underscore, so "_" also needs a check.
+string_escapes = re.compile(r'[&<>_\x00-\x08\x0B-\x1F]')
+
+# The parts of a string that are escaped, matched in a single scan: literal
+# _xHHHH_ text, control characters and XML special characters. The <r> runs
+# of rich strings are already XML so only the first two are escaped.
+string_escape_parts = re.compile(r'_x[0-9a-fA-F]{4}_|'
+                                 r'[\x00-\x08\x0B-\x1F&<>]')
+rich_string_escape_parts = re.compile(r'_x[0-9a-fA-F]{4}_|'
+                                      r'[\x00-\x08\x0B-\x1F]')
+
+xml_entities = {'&': '&amp;', '<': '&lt;', '>': '&gt;'}
+
+
+def _escape_string_part(match):
+    # Escape a part of a string matched by string_escape_parts.
+    text = match.group(0)
+
+    if len(text) == 7:
+        return '_x005F' + text
+    elif text in xml_entities:
+        return xml_entities[text]
+    else:
+        return '_x%04X_' % ord(text)
 
 
 class XMLwriter(object):
@@ -36,9 +83,20 @@ class XMLwriter(object):
         if isinstance(filename, StringIO):
             self.internal_fh = False
             self.fh = filename
-        else:
+        elif hasattr(filename, 'write'):
+            # A stream for a part of the zip container. It is closed, to
+            # complete the part, once the XML has been written.
+            self.internal_fh = True
+            self.fh = filename
+        elif sys.version_info[0] == 2:
             self.internal_fh = True
             self.fh = codecs.open(filename, 'w', 'utf-8')
+        else:
+            # The text fragments are collected in a large buffer and
+            # encoded to UTF-8 in chunks rather than one write at a time.
+            self.internal_fh = True
+            self.fh = io.open(filename, 'w', encoding='utf-8', newline='',
+                              buffering=XML_BUFFER_SIZE)
 
     def _xml_close(self):
         # Close the XML filehandle if we created it.
@@ -109,6 +167,17 @@ class XMLwriter(object):
 
         self.fh.write("""<c%s t="s"><v>%d</v></c>""" % (attr, index))
 
+    def _xml_cell(self, cell_type, cell_range, value, xf_index=None):
+        # Optimised tag writer for <c> number and shared string cells using
+        # the precompiled templates. The cell range and style index can't
+        # contain XML characters so they aren't escaped.
+        if xf_index is None:
+            self.fh.write(cell_templates[cell_type, False]
+                          % (cell_range, value))
+        else:
+            self.fh.write(cell_templates[cell_type, True]
+                          % (cell_range, xf_index, value))
+
     def _xml_si_element(self, string, attributes=[]):
         # Optimised tag writer for shared strings <si> elements.
         attr = ''
@@ -178,11 +247,12 @@ class XMLwriter(object):
                       (attr, string))
 
     def _escape_attributes(self, attribute):
-        # Escape XML characters in attributes.
-        try:
-            if not self.escapes.search(attribute):
-                return attribute
-        except TypeError:
+        # Escape XML characters in attributes. Numbers and other non-string
+        # values never need escaping.
+        if not isinstance(attribute, str_types):
+            return attribute
+
+        if not self.escapes.search(attribute):
             return attribute
 
         attribute = attribute.replace('&', '&amp;')
@@ -192,6 +262,24 @@ class XMLwriter(object):
 
         return attribute
 
+    def _escape_string(self, string):
+        # Escape the text of a shared or in-line string for the <t> element
+        # in a single scan. Returns the escaped string and flags to indicate
+        # a rich string, whose <r> runs are already XML, and leading or
+        # trailing whitespace that must be preserved.
+        # As with the regex '$' a trailing newline is allowed after </r>.
+        if (string.startswith('<r>')
+                and string.endswith(('</r>', '</r>\n'))):
+            string = rich_string_escape_parts.sub(_escape_string_part, string)
+            return string, True, False
+
+        if string_escapes.search(string):
+            string = string_escape_parts.sub(_escape_string_part, string)
+
+        preserve = string[:1].isspace() or string[-1:].isspace()
+
+        return string, False, preserve
+
     def _escape_data(self, data):
         # Escape XML characters in data sections of tags.  Note, this
         # is different from _escape_attributes() in that double quotes
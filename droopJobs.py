@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+""" Process pool helpers for the '--jobs N' option of the droop tools
+Shared by droopCharTool.py (parsing sweep files) and droop_convertXLS_to_HEX.py
+(reading equalizer workbooks).
+"""
+
+import os							# for the number of CPUs
+import multiprocessing				# for running the jobs in parallel
+
+#---------- INPUT: Job Options ---------#
+jobsOption  = '--jobs'
+defaultJobs = os.cpu_count() or 1	# pool size when '--jobs N' isn't given
+
+
+############## Helper FUNCTIONS ################
+def Init_Jobs( argList, usage ):
+	# Call first in the main block. Enables the process pool in the frozen
+	# (PyInstaller) executable, then removes the optional '--jobs N' pair from
+	# the argument list and returns the pool size; usage() is called if N is bad.
+	multiprocessing.freeze_support()
+	jobs = defaultJobs
+	if (jobsOption in argList):
+		idx = argList.index(jobsOption)
+		if (idx + 1 >= len(argList) or not argList[idx+1].isdigit() or int(argList[idx+1]) < 1):
+			usage()
+		jobs = int(argList[idx+1])
+		del argList[idx:idx+2]
+	return jobs
+# END def Init_Jobs( argList, usage ):
+
+def Map_Jobs( worker, jobList, numJobs ):
+	# Yield worker(job) for every job, in job order. The jobs are spread across
+	# a process pool when there is more than one job and more than one process.
+	if (numJobs <= 1 or len(jobList) <= 1):
+		for job in jobList:
+			yield worker(job)
+		return
+	pool = multiprocessing.Pool( min(numJobs, len(jobList)) )
+	try:
+		for result in pool.imap( worker, jobList ):
+			yield result
+		pool.close()
+	finally:
+		pool.terminate()
+		pool.join()
+# END def Map_Jobs( worker, jobList, numJobs ):
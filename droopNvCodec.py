@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+""" Little endian hex codec for the FBRX droop NV byte streams
+Shared by droopCharTool.py (reading a QCN) and droop_convertXLS_to_HEX.py (writing NVs).
+
+NV text form:  space-separated hex bytes, e.g. '00 00 06 00 7b 00 0a 00 02 0a ...'
+NV layout:     uint16 version, uint16 numTables, then numTables data tables of
+               uint16 dataType (123), uint16 bw, uint8 groupDelay, uint8 numTaps,
+               int32 coefficients zero-padded to 128 bytes
+"""
+
+import struct						# for packing the int32/uint16 tables in bulk
+
+#---------- INPUT: NV Layout ---------#
+droopDataType   = 123				# The FBRX_LTE_bw_Droop_cal_Type ID
+droopTableBytes = 128				# each coefficient table is 128 bytes long
+nvHeader        = struct.Struct('<HH')		# version, numTables
+tableHeader     = struct.Struct('<HHBB')	# dataType, bw, groupDelay, numTaps
+
+# 'xx ' text of every byte value, so a whole stream is formatted in one join
+hexByteTable = [ format(byteVal, '02x') + ' ' for byteVal in range(256) ]
+
+
+############## Helper FUNCTIONS ################
+def Hex_To_Bytes( nvString ):
+	# '7b 00 0a 00' -> b'\x7b\x00\x0a\x00'
+	return bytes.fromhex( nvString )
+# END def Hex_To_Bytes( nvString ):
+
+def Bytes_To_Hex( nvBytes ):
+	# b'\x7b\x00' -> '7b 00 ' (every byte is followed by a space, as in the NV files)
+	return ''.join( map(hexByteTable.__getitem__, bytearray(nvBytes)) )
+# END def Bytes_To_Hex( nvBytes ):
+
+def Pack_Uint16( uint16List ):
+	return struct.pack( '<%dH' % len(uint16List), *[int(val) for val in uint16List] )
+# END def Pack_Uint16( uint16List ):
+
+def Unpack_Int32( nvBytes, offset, count ):
+	return list( struct.unpack_from('<%di' % count, nvBytes, offset) )
+# END def Unpack_Int32( nvBytes, offset, count ):
+
+def Encode_Droop_Table( coefList, groupDelay, numFiltTaps, bw ):
+	# one data table: header, the int32 coefficients, then zero padding to 128 bytes
+	coefList = [ int(val) for val in coefList ]
+	numBytes = 4 * len(coefList)
+	return tableHeader.pack( droopDataType, int(bw), int(groupDelay), int(numFiltTaps) ) + \
+		   struct.pack( '<%di' % len(coefList), *coefList ) + \
+		   bytes( max(droopTableBytes - numBytes, 0) )
+# END def Encode_Droop_Table( coefList, groupDelay, numFiltTaps, bw ):
+
+def Encode_Droop_NV( tableList, version=0 ):
+	# tableList: [ (bw, groupDelay, numFiltTaps, coefList), ... ] -> NV hex text
+	nvBytes = [ nvHeader.pack(version, len(tableList)) ]
+	for bw, groupDelay, numFiltTaps, coefList in tableList:
+		nvBytes.append( Encode_Droop_Table(coefList, groupDelay, numFiltTaps, bw) )
+	return Bytes_To_Hex( b''.join(nvBytes) )
+# END def Encode_Droop_NV( tableList, version=0 ):
+
+def Decode_Droop_NV( nvString ):
+	# NV hex text -> (version, [ (bw, groupDelay, numFiltTaps, coefList), ... ])
+	nvBytes = Hex_To_Bytes( nvString )
+	version, numTables = nvHeader.unpack_from( nvBytes, 0 )
+	tableList = []
+	offset = nvHeader.size
+	while (len(tableList) < numTables and offset + tableHeader.size <= len(nvBytes)):
+		curType, bw, groupDelay, numFiltTaps = tableHeader.unpack_from( nvBytes, offset )
+		offset += tableHeader.size
+		if (curType != droopDataType or offset + droopTableBytes > len(nvBytes)):
+			break
+		numCoef = min( numFiltTaps, droopTableBytes // 4 )
+		tableList.append( (bw, groupDelay, numFiltTaps, Unpack_Int32(nvBytes, offset, numCoef)) )
+		offset += droopTableBytes
+	return version, tableList
+# END def Decode_Droop_NV( nvString ):